@@ -0,0 +1,56 @@
+"""Benchmark of the direct codemeta.json mapping of sd.SourceCode.from_codemeta
+against parsing the document as RDF (SoftwareSourceCode.from_jsonld).
+
+Run with:
+
+    python benchmarks/bench_codemeta.py [codemeta context file]
+
+Without a context file, the codemeta context is taken from the pivmetalib
+context cache (and downloaded once if it is not cached yet).
+"""
+import json
+import pathlib
+import sys
+import time
+import warnings
+
+from pivmetalib import context
+from pivmetalib.sd import SourceCode
+from pivmetalib.sd.software import CODEMETA_CONTEXT_URL, SoftwareSourceCode, _from_codemeta
+
+CODEMETA_FILENAME = pathlib.Path(__file__).parents[1] / 'codemeta.json'
+
+
+def _time(func, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - t0) / repeat
+
+
+def main():
+    if len(sys.argv) > 1:
+        context.register_context(CODEMETA_CONTEXT_URL, sys.argv[1])
+    codemeta_context = context.load_context(CODEMETA_CONTEXT_URL)
+    data = json.loads(CODEMETA_FILENAME.read_text(encoding='utf-8'))
+
+    def rdf_path():
+        doc = dict(data, **{'@context': codemeta_context})
+        return SoftwareSourceCode.from_jsonld(data=json.dumps(doc), limit=1)
+
+    def direct_path():
+        return _from_codemeta(SoftwareSourceCode, dict(data), codemeta_context)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        direct, rdf = direct_path(), rdf_path()
+        assert (direct.name, direct.author[0].givenName) == (rdf.name, rdf.author[0].givenName)
+        t_rdf = _time(rdf_path, 20)
+        t_direct = _time(direct_path, 200)
+        t_file = _time(lambda: SourceCode.from_codemeta(CODEMETA_FILENAME), 200)
+    print(f'{CODEMETA_FILENAME.name}  rdf: {t_rdf * 1e3:7.2f} ms  direct: {t_direct * 1e3:7.3f} ms '
+          f'({t_rdf / t_direct:.0f}x)  from_codemeta (incl. file and cached context): {t_file * 1e3:7.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
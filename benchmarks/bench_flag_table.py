@@ -0,0 +1,68 @@
+"""Benchmark of utils.get_flag_table (triple indices) against the SPARQL implementation
+and of utils.get_flag_tables against one get_flag_table call per scheme.
+
+Run with:
+
+    python benchmarks/bench_flag_table.py
+"""
+import time
+
+from rdflib import Graph, Literal, RDF, URIRef
+
+from pivmetalib.utils import PIV, SKOS, get_flag_table, get_flag_tables, _get_flag_table_sparql
+
+
+def build_graph(n_schemes: int, n_flags: int) -> Graph:
+    """Build a graph with `n_schemes` flag schemes with `n_flags` flags each"""
+    g = Graph()
+    for i in range(n_schemes):
+        scheme = URIRef(f'https://example.org/scheme/{i}')
+        g.add((scheme, RDF.type, PIV.FlagScheme))
+        for j in range(n_flags):
+            flag = URIRef(f'https://example.org/scheme/{i}/flag/{j}')
+            g.add((flag, RDF.type, PIV.Flag))
+            g.add((flag, PIV.mask, Literal(2 ** j)))
+            g.add((flag, SKOS.prefLabel, Literal(f'flag {j}')))
+            g.add((scheme, PIV.allowedFlag, flag))
+    return g
+
+
+def _canonical(table):
+    """Flags with equal masks are in graph order, which differs between the implementations"""
+    return sorted(table, key=lambda r: (r['mask'], r['uri']))
+
+
+def _time(func, *args, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    for n_schemes, n_flags in ((10, 8), (200, 16), (1000, 16)):
+        g = build_graph(n_schemes, n_flags)
+        scheme = 'https://example.org/scheme/0'
+        assert _canonical(get_flag_table(g)) == _canonical(_get_flag_table_sparql(g))
+        assert get_flag_table(g, scheme) == _get_flag_table_sparql(g, scheme)
+        print(f'{len(g)} triples ({n_schemes} schemes x {n_flags} flags)')
+        for label, args in (('all flags', (g,)), ('one scheme', (g, scheme))):
+            t_sparql = _time(_get_flag_table_sparql, *args)
+            t_direct = _time(get_flag_table, *args)
+            print(f'  {label:10s} sparql: {t_sparql * 1e3:9.2f} ms  direct: {t_direct * 1e3:9.2f} ms '
+                  f'({t_sparql / t_direct:.1f}x)')
+        schemes = [f'https://example.org/scheme/{i}' for i in range(n_schemes)]
+        assert get_flag_tables(g) == {s: get_flag_table(g, s) for s in schemes}
+        # extrapolated from the first (up to) 50 schemes
+        n_sparql = min(n_schemes, 50)
+        t_sparql = _time(lambda: [_get_flag_table_sparql(g, s) for s in schemes[:n_sparql]]) * n_schemes / n_sparql
+        t_single = _time(lambda: [get_flag_table(g, s) for s in schemes])
+        t_batch = _time(get_flag_tables, g)
+        print(f'  per scheme sparql: {t_sparql * 1e3:9.2f} ms  direct: {t_single * 1e3:9.2f} ms  '
+              f'batch: {t_batch * 1e3:9.2f} ms ({t_sparql / t_batch:.1f}x / {t_single / t_batch:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Import time of pivmetalib, measured with ``python -X importtime`` in fresh processes.
+
+Run with:
+
+    python benchmarks/bench_import.py
+
+Baseline before the lazy imports (subpackages, ontolutils and prov imported
+and the cache directory created by ``import pivmetalib``):
+
+    import pivmetalib                              1.039 s
+    from pivmetalib import PIV                     1.037 s
+    import pivmetalib.pivmeta                      5.866 s
+    from pivmetalib.pivmeta import PIVSoftware     6.306 s
+    from pivmetalib.pivmeta import FlagScheme      7.053 s
+
+With the lazy imports:
+
+    import pivmetalib                              0.205 s
+    from pivmetalib import PIV                     0.208 s
+    import pivmetalib.pivmeta                      0.196 s
+    from pivmetalib.pivmeta import PIVSoftware     3.887 s
+    from pivmetalib.pivmeta import FlagScheme      3.766 s
+"""
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = (
+    'import pivmetalib',
+    'from pivmetalib import PIV',
+    'import pivmetalib.pivmeta',
+    'from pivmetalib.pivmeta import PIVSoftware',
+    'from pivmetalib.pivmeta import FlagScheme',
+)
+
+
+def import_time(statement: str) -> float:
+    """Return the total import time (seconds) of the modules imported by `statement`"""
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            capture_output=True, text=True, check=True).stderr
+    total_us = 0
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if len(name) - len(name.lstrip(' ')) == 1:  # top-level imports only
+            total_us += int(cumulative)
+    return total_us / 1e6
+
+
+def main(repeat: int = 3):
+    for statement in STATEMENTS:
+        times = [import_time(statement) for _ in range(repeat)]
+        print(f'{statement:45s} {statistics.median(times):6.3f} s')
+
+
+if __name__ == '__main__':
+    main()
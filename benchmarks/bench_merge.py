@@ -0,0 +1,64 @@
+"""Benchmark of jsonld.merge_parallel against the serial jsonld.merge_to.
+
+Run with:
+
+    python benchmarks/bench_merge.py [n_files] [max_workers]
+"""
+import json
+import pathlib
+import sys
+import tempfile
+import time
+
+from pivmetalib import jsonld
+
+CONTEXT = {
+    "pivmeta": "https://matthiasprobst.github.io/pivmeta#",
+    "m4i": "http://w3id.org/nfdi4ing/metadata4ing#",
+    "schema": "https://schema.org/",
+    "prov": "http://www.w3.org/ns/prov#",
+}
+
+
+def write_shards(folder: pathlib.Path, n_files: int):
+    """Write one json-ld sidecar file per (fake) PIV evaluation run"""
+    filenames = []
+    for i in range(n_files):
+        doc = {
+            "@context": CONTEXT,
+            "@id": f"https://example.org/run/{i}",
+            "@type": "pivmeta:PIVEvaluation",
+            "prov:wasAssociatedWith": {"@id": "https://orcid.org/0000-0001-8729-0482",
+                                       "@type": "prov:Person", "schema:name": "John Doe"},
+            "m4i:realizesMethod": [
+                {"@id": f"_:step{j}", "@type": "m4i:Method", "schema:name": f"step {j}",
+                 "m4i:hasParameter": [{"@type": "m4i:NumericalVariable", "m4i:hasNumericalValue": i * 0.5 + k,
+                                       "schema:name": f"parameter {k}"} for k in range(10)]}
+                for j in range(5)],
+        }
+        filename = folder / f'run_{i:06d}.jsonld'
+        filename.write_text(json.dumps(doc, indent=2), encoding='utf-8')
+        filenames.append(filename)
+    return filenames
+
+
+def main():
+    n_files = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_dir = pathlib.Path(tmp_dir)
+        filenames = write_shards(tmp_dir, n_files)
+        for flatten in (False, True):
+            t0 = time.perf_counter()
+            jsonld.merge_to(filenames, tmp_dir / 'serial.jsonld', flatten=flatten)
+            t_serial = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            jsonld.merge_parallel(filenames, tmp_dir / 'parallel.jsonld', flatten=flatten, max_workers=max_workers)
+            t_parallel = time.perf_counter() - t0
+            assert (tmp_dir / 'serial.jsonld').read_bytes() == (tmp_dir / 'parallel.jsonld').read_bytes()
+            print(f'{n_files} files, flatten={flatten!s:5s}  serial: {t_serial:6.2f} s  '
+                  f'parallel: {t_parallel:6.2f} s ({t_serial / t_parallel:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Benchmark of patterns.scan_pattern against checking every frame with os.path.exists.
+
+Run with:
+
+    python benchmarks/bench_patterns.py [n_frames]
+"""
+import os
+import pathlib
+import sys
+import tempfile
+import time
+
+from pivmetalib import patterns
+
+PATTERN = 'image_{:06d}.tif'
+
+
+def stat_loop(directory: pathlib.Path, n_frames: int):
+    return [i for i in range(n_frames) if not os.path.exists(directory / PATTERN.format(i))]
+
+
+def main():
+    n_frames = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_dir = pathlib.Path(tmp_dir)
+        for name in patterns.expand_pattern(PATTERN, 0, n_frames):
+            (tmp_dir / name).touch()
+        for i in range(0, n_frames, 997):
+            (tmp_dir / PATTERN.format(i)).unlink()
+
+        t0 = time.perf_counter()
+        missing = stat_loop(tmp_dir, n_frames)
+        t_stat = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        scan = patterns.scan_pattern(PATTERN, tmp_dir, start=0, stop=n_frames)
+        t_scan = time.perf_counter() - t0
+        assert scan.missing.tolist() == missing
+        print(f'{n_frames} frames, {len(missing)} missing  stat loop: {t_stat * 1e3:7.1f} ms  '
+              f'scan_pattern: {t_scan * 1e3:7.1f} ms ({t_stat / t_scan:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark of pivview.read_dat against a line-by-line Python parser of docs/vp1a.dat
+and of the header-only metadata harvesting (pivview.harvest).
+
+Run with:
+
+    python benchmarks/bench_pivview.py [n_files] [max_workers]
+"""
+import pathlib
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from pivmetalib import pivview
+
+VP1A = pathlib.Path(__file__).parents[1] / 'docs' / 'vp1a.dat'
+
+
+def read_line_by_line(filename: pathlib.Path) -> np.ndarray:
+    rows = []
+    with open(filename) as f:
+        for line in f:
+            if line.startswith(('#', 'TITLE', 'VARIABLES', 'ZONE')):
+                continue
+            if line.strip():
+                rows.append([float(v) for v in line.split()])
+    return np.array(rows)
+
+
+def _time(func, repeat: int = 50) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - t0) / repeat
+
+
+def main():
+    np.testing.assert_array_equal(pivview.read_dat(VP1A).data, read_line_by_line(VP1A))
+    t_lines = _time(lambda: read_line_by_line(VP1A))
+    t_read = _time(lambda: pivview.read_dat(VP1A))
+    t_header = _time(lambda: pivview.read_header(VP1A))
+    size = VP1A.stat().st_size / 1024 ** 2
+    print(f'{VP1A.name}  line by line: {t_lines * 1e3:6.2f} ms  read_dat: {t_read * 1e3:6.2f} ms '
+          f'({size / t_read:.0f} MB/s, {t_lines / t_read:.1f}x)  read_header: {t_header * 1e3:6.3f} ms')
+
+    t_full = _time(lambda: pivview.read_dat(VP1A).to_distribution())
+    t_harvest = _time(lambda: pivview.harvest_file(VP1A))
+    print(f'metadata of {VP1A.name}  read_dat + to_distribution: {t_full * 1e3:6.2f} ms  '
+          f'harvest_file: {t_harvest * 1e3:6.2f} ms ({t_full / t_harvest:.1f}x)')
+
+    n_files = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for i in range(n_files):
+            filename = pathlib.Path(tmp_dir) / f'run_{i // 100:03d}' / f'vp{i:06d}.dat'
+            filename.parent.mkdir(exist_ok=True)
+            shutil.copyfile(VP1A, filename)
+        t0 = time.perf_counter()
+        serial = pivview.harvest(tmp_dir, max_workers=1)
+        t_serial = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        parallel = pivview.harvest(tmp_dir, max_workers=max_workers)
+        t_parallel = time.perf_counter() - t0
+        assert [r.filename for r in serial] == [r.filename for r in parallel] and all(r.ok for r in parallel)
+        print(f'harvest {n_files} files  serial: {t_serial:6.2f} s  parallel: {t_parallel:6.2f} s '
+              f'({t_serial / t_parallel:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""Micro-benchmark of utils.split_URIRef against the previous (uncached) implementation.
+
+Run with:
+
+    python benchmarks/bench_split_uriref.py
+"""
+import timeit
+
+from rdflib import URIRef
+
+from pivmetalib.namespace import PIV
+from pivmetalib.utils import split_URIRef, split_URIRefs
+
+
+def split_URIRef_uncached(uri):
+    """The implementation before caching was introduced"""
+    _uri = str(uri)
+    if _uri.startswith('http'):
+        if '#' in _uri:
+            return _uri.rsplit('#', 1)
+        _split = _uri.rsplit('/', 1)
+        return [f'{_split[0]}/', _split[1]]
+    if ':' in _uri:
+        return _uri.rsplit(':', 1)
+    return [None, uri]
+
+
+def main(n_walks: int = 200):
+    iris = [URIRef(str(v)) for v in PIV.__dict__.values() if isinstance(v, URIRef)]
+    iris += [URIRef(f'http://www.w3.org/ns/dcat#{name}') for name in ('Dataset', 'Distribution', 'downloadURL')]
+    iris += ['piv:mask', 'm4i:hasParameter', 'dcat:distribution']
+    walk = iris * 50  # the same IRIs are split over and over during graph walks
+    print(f'{len(walk) * n_walks} splits of {len(iris)} distinct IRIs')
+
+    t_old = timeit.timeit(lambda: [split_URIRef_uncached(i) for i in walk], number=n_walks)
+    t_new = timeit.timeit(lambda: [split_URIRef(i) for i in walk], number=n_walks)
+    t_batch = timeit.timeit(lambda: split_URIRefs(walk), number=n_walks)
+    print(f'uncached:        {t_old:.3f} s')
+    print(f'split_URIRef:    {t_new:.3f} s ({t_old / t_new:.1f}x)')
+    print(f'split_URIRefs:   {t_batch:.3f} s ({t_old / t_batch:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,27 +1,26 @@
+import argparse
+import hashlib
 import json
+import os
 import pathlib
+import re
+from typing import Dict, Optional, Tuple, Union
 
-from pivmetalib import CACHE_DIR
-from pivmetalib.utils import download_file
+from pivmetalib.context import load_context
 
 __this_dir__ = pathlib.Path(__file__).parent
 
+CONTEXT_URL = "https://raw.githubusercontent.com/matthiasprobst/pivmeta/refs/heads/main/pivmeta_context.jsonld"
+NAMESPACE_FILE = __this_dir__ / 'pivmetalib' / 'namespace.py'
+GENERATOR_VERSION = 2  # increase when the generated code changes
 
-def generate_namespace_file():
-    """Generate namespace.py file from pivmeta_context.jsonld"""
+_HASH_PATTERN = re.compile(r'^# terms sha256: ([0-9a-f]{64})$', re.MULTILINE)
 
-    namespace = 'piv'
-
-    context_file = CACHE_DIR / 'pivmeta_context.jsonld'
-    context_file.unlink(missing_ok=True)  # force download
-    if not context_file.exists():
-        context_url = "https://raw.githubusercontent.com/matthiasprobst/pivmeta/refs/heads/main/pivmeta_context.jsonld"
-        context_file = download_file(context_url, context_file)
-
-    # read context file:
-    with open(context_file) as f:
-        context = json.load(f)
 
+def collect_iris(context: Dict, namespace: str = 'piv') -> Tuple[str, Dict]:
+    """Return the namespace URL and the terms {name: {'url': ..., 'keys': [...]}}
+    of a namespace defined in a json-ld context. Terms and keys are sorted,
+    so that the result does not depend on the order within the context."""
     url = context['@context'][namespace]
 
     iris = {}
@@ -33,27 +32,117 @@ def generate_namespace_file():
                     iris[name] = {'url': f'{url}{name}', 'keys': [k, ]}
                 else:
                     iris[name]['keys'].append(k)
+    return url, {name: {'url': iris[name]['url'], 'keys': sorted(iris[name]['keys'])} for name in sorted(iris)}
+
+
+def get_terms_hash(url: str, iris: Dict) -> str:
+    """Hash of everything the generated module depends on"""
+    data = json.dumps({'generator': GENERATOR_VERSION, 'url': url, 'iris': iris}, sort_keys=True)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def render_namespace_module(url: str, iris: Dict, namespace: str = 'piv') -> str:
+    """Return the source code of the namespace module.
+
+    Besides the DefinedNamespace class, a frozen table of pre-built URIRefs
+    of all terms and the reverse lookup IRI -> term are generated. The terms
+    are set as class attributes, so that accessing them does not go through
+    the metaclass of DefinedNamespace.
+    """
+    ns = namespace.upper()
+    lines = ['# Generated by deploy.py from the pivmeta context. Do not edit.',
+             f'# terms sha256: {get_terms_hash(url, iris)}',
+             'from types import MappingProxyType',
+             '',
+             'from rdflib.namespace import DefinedNamespace, Namespace',
+             'from rdflib.term import URIRef',
+             '',
+             '',
+             f'class {ns}(DefinedNamespace):',
+             '    # uri = "https://matthiasprobst.github.io/pivmeta#"',
+             '    # Generated with pivmetalib']
+    for k, v in iris.items():
+        lines.append(f'    {k.replace("-", "_")}: URIRef  # {v["keys"]}')
+    lines += ['', f'    _NS = Namespace("{url}")', '', '']
+    for k, v in iris.items():
+        for kk in v["keys"]:
+            key = kk.replace(' ', '_')
+            lines.append(f'setattr({ns}, "{key}", {ns}.{k.replace("-", "_")})')
 
-    with open(__this_dir__ / 'pivmetalib' / 'namespace.py', 'w', encoding='UTF8') as f:
-        f.write('from rdflib.namespace import DefinedNamespace, Namespace\n')
-        f.write('from rdflib.term import URIRef\n')
-        f.write(f'\n\nclass {namespace.upper()}(DefinedNamespace):')
-        f.write('\n    # uri = "https://matthiasprobst.github.io/pivmeta#"')
-        f.write('\n    # Generated with pivmetalib')
-        for k, v in iris.items():
-            f.write(f'\n    {k.replace("-", "_")}: URIRef  # {v["keys"]}')
+    lines += ['',
+              '# Pre-built URIRefs of all terms and the reverse lookup IRI -> term (keys are URIRefs)',
+              f'{ns}_TERMS = MappingProxyType({{']
+    for k, v in iris.items():
+        lines.append(f'    "{k.replace("-", "_")}": URIRef("{v["url"]}"),')
+    lines += ['})',
+              f'{ns}_TERM_OF_IRI = MappingProxyType({{iri: term for term, iri in {ns}_TERMS.items()}})',
+              '',
+              f'for _term, _iri in {ns}_TERMS.items():',
+              f'    setattr({ns}, _term, _iri)',
+              'del _term, _iri',
+              '']
+    return '\n'.join(lines)
+
+
+def _read_terms_hash(filename: pathlib.Path) -> Optional[str]:
+    try:
+        with open(filename, encoding='UTF8') as f:
+            match = _HASH_PATTERN.search(f.read(1024))
+    except OSError:
+        return None
+    return match.group(1) if match else None
+
+
+def generate_namespace_file(context_source: Union[str, pathlib.Path] = None,
+                            target: Union[str, pathlib.Path] = NAMESPACE_FILE,
+                            offline: Optional[bool] = None,
+                            force: bool = False) -> bool:
+    """Generate namespace.py file from pivmeta_context.jsonld
+
+    Parameters
+    ----------
+    context_source: str or pathlib.Path=None
+        A local context file. If None, the context is taken from the
+        pivmetalib context cache and only downloaded if the cached
+        version is outdated (see `pivmetalib.context.load_context`).
+    target: str or pathlib.Path
+        The namespace module to write
+    offline: bool=None
+        Never access the network (defaults to the PIVMETALIB_OFFLINE
+        environment variable)
+    force: bool
+        Write the file even if the terms did not change
+
+    Returns
+    -------
+    bool
+        True if the file was written, False if it was up to date
+    """
+    namespace = 'piv'
+    target = pathlib.Path(target)
 
-        f.write(f'\n\n    _NS = Namespace("{url}")')
+    if context_source is not None:
+        with open(context_source, encoding='UTF8') as f:
+            context = json.load(f)
+    else:
+        context = {'@context': load_context(CONTEXT_URL, offline=offline)}
 
-        f.write('\n\n')
+    url, iris = collect_iris(context, namespace)
+    if not force and _read_terms_hash(target) == get_terms_hash(url, iris):
+        return False
 
-        for k, v in iris.items():
-            print(k)
-            for kk in v["keys"]:
-                key = kk.replace(' ', '_')
-                print(kk)
-                f.write(f'\nsetattr({namespace.upper()}, "{key}", {namespace.upper()}.{k.replace("-", "_")})')
+    tmp_filename = target.with_name(f'{target.name}.{os.getpid()}.tmp')
+    with open(tmp_filename, 'w', encoding='UTF8', newline='\n') as f:
+        f.write(render_namespace_module(url, iris, namespace))
+    os.replace(tmp_filename, target)
+    return True
 
 
 if __name__ == '__main__':
-    generate_namespace_file()
+    parser = argparse.ArgumentParser(description='Generate pivmetalib/namespace.py from the pivmeta context')
+    parser.add_argument('--context', help='local pivmeta context file (default: cached or downloaded context)')
+    parser.add_argument('--offline', action='store_true', default=None, help='never access the network')
+    parser.add_argument('--force', action='store_true', help='regenerate even if the terms did not change')
+    args = parser.parse_args()
+    written = generate_namespace_file(args.context, offline=args.offline, force=args.force)
+    print(f'{NAMESPACE_FILE} {"written" if written else "is up to date"}')
@@ -1,13 +1,21 @@
-import logging
+"""pivmetalib
 
-from ontolutils import Thing
-from ontolutils.classes import decorator
+Subpackages (e.g. `pivmetalib.pivmeta`), `prov` and `CACHE_DIR` are loaded
+on first access, so that importing the package (e.g. only to use `PIV`) does
+not import ontolutils and creates no cache directory.
+"""
+import functools
+import importlib
+import logging
+from typing import TYPE_CHECKING, Dict, Iterable, List
 
-from . import utils
 from ._version import __version__
 from .namespace import PIV
 
-from ontolutils.ex import prov
+if TYPE_CHECKING:
+    from ontolutils import Thing
+    from ontolutils.ex import prov
+    from . import cache, context, dcat, download, hdf5, jsonld, m4i, patterns, pivmeta, pivview, sd, utils
 
 
 DEFAULT_LOGGING_LEVEL = logging.WARNING
@@ -23,12 +31,49 @@ logger = logging.getLogger(__package__)
 logger.addHandler(_stream_handler)
 
 CONTEXT = "https://raw.githubusercontent.com/matthiasprobst/pivmeta/main/pivmeta_context.jsonld"
-CACHE_DIR = utils.get_cache_dir()
+_SUBMODULES = ('cache', 'context', 'dcat', 'download', 'hdf5', 'jsonld', 'm4i', 'patterns', 'pivmeta',
+               'pivview', 'sd', 'utils')
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    if name == 'prov':
+        value = importlib.import_module('ontolutils.ex.prov')
+    elif name == 'CACHE_DIR':
+        from .utils import get_cache_dir
+        value = get_cache_dir()
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_SUBMODULES, 'prov', 'CACHE_DIR'})
+
+
+@functools.lru_cache(maxsize=None)
+def _get_class_iri_fields(cls) -> Dict[str, str]:
+    from ontolutils.classes import decorator
+    from .utils import split_URIRef
+    namespaces = decorator.NamespaceManager[cls]
+    iri_fields = {}
+    for k, v in decorator.URIRefManager[cls].items():
+        ns, key = split_URIRef(v)
+        full_ns = namespaces.get(ns, None)
+        if full_ns is None:
+            iri_fields[k] = v
+        else:
+            iri_fields[k] = f'{full_ns}{key}'
+    return iri_fields
 
 
-def get_iri_fields(obj: Thing):
+def get_iri_fields(obj: 'Thing'):
     """Get field names and their corresponding IRIs from the context file.
 
+    The result only depends on the class of `obj` and is computed once per class.
+
     Example:
     --------
     @namespaces(name="http://example.com/name", age="http://example.com/age")
@@ -40,16 +85,16 @@ def get_iri_fields(obj: Thing):
     print(pivmetalib.get_iri_fields(em))
     # {'name': 'http://example.com/name', 'age': 'http://example.com/age'}
     """
-    namespaces = decorator.NamespaceManager[obj.__class__]
-    iri_fields = {}
-    for k, v in decorator.URIRefManager[obj.__class__].items():
-        ns, key = utils.split_URIRef(v)
-        full_ns = namespaces.get(ns, None)
-        if full_ns is None:
-            iri_fields[k] = v
-        else:
-            iri_fields[k] = f'{full_ns}{key}'
-    return iri_fields
+    return dict(_get_class_iri_fields(obj.__class__))
+
+
+def get_iri_fields_many(objs: Iterable['Thing']) -> List[Dict[str, str]]:
+    """Get the IRI fields (see `get_iri_fields`) of many objects.
+
+    The fields are computed once per class, every object gets its own copy.
+    """
+    return [dict(_get_class_iri_fields(obj.__class__)) for obj in objs]
+
 
 PIVMETA = PIV
 __all__ = (
@@ -0,0 +1,31 @@
+"""Lookup tables of compiled flag schemes (see `pivmetalib.pivmeta.FlagScheme.compile`)"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping, Tuple
+
+
+@dataclass(frozen=True)
+class FlagLookupTable:
+    """Lookup tables of a flag scheme (see `FlagScheme.compile()`)
+
+    For enumerated schemes `table` maps every known value to its flags. For
+    bitwise schemes `key_masks` holds the mask of each flag and `table` is
+    a memo of the decoded combinations, which `lookup` fills on first use.
+    The memo is bounded by the bits used in the scheme (`union_mask`).
+    """
+    bitwise: bool
+    key_masks: Tuple[Tuple[str, int], ...]
+    key_values: Mapping[str, Tuple[int, ...]]
+    union_mask: int
+    bit_flags: Tuple[Tuple[int, Any], ...]
+    table: Dict[int, Tuple[Any, ...]] = field(default_factory=dict)
+
+    def lookup(self, value: int) -> Tuple[Any, ...]:
+        """Return the flags of a single integer value"""
+        if not self.bitwise:
+            return self.table.get(value, ())
+        value &= self.union_mask
+        flags = self.table.get(value)
+        if flags is None:
+            flags = tuple(flag for flag_mask, flag in self.bit_flags if flag_mask & value)
+            self.table[value] = flags
+        return flags
@@ -0,0 +1,389 @@
+"""Caches for downloaded files and parsed graphs.
+
+Files are stored once per content under ``<directory>/objects/<hash[:2]>/<hash>/<filename>``.
+A small JSON index maps URLs to content hashes and records size and last access
+of every object, so that a cache hit is answered without any HTTP request and
+the cache can be shrunk in least-recently-used order. The index is only
+changed while holding a lock file, so several processes can share a cache.
+The access times of cache hits are collected in memory and written in batches.
+
+Parsed rdflib graphs are kept in an in-memory LRU cache (`graph_cache`) and can
+optionally be persisted as N-Triples in the file cache. The memory cache is
+bounded by the number of graphs and their total number of triples. It is
+emptied with ``graph_cache.clear()`` and disabled with ``graph_cache.maxsize = 0``.
+"""
+import atexit
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import shutil
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Dict, Optional, Union
+
+import rdflib
+
+from . import utils
+
+logger = logging.getLogger(__package__)
+
+INDEX_VERSION = 1
+DEFAULT_MAX_SIZE = 10 * 1024 ** 3  # bytes
+MAX_SIZE_ENV_VARIABLE = 'PIVMETALIB_CACHE_MAX_SIZE'
+FLUSH_INTERVAL = 60  # seconds, after which the access times of cache hits are written to the index
+GRAPH_CACHE_MAX_TRIPLES = 1_000_000  # total number of triples of the graphs kept in memory
+
+
+def _get_default_max_size() -> int:
+    """Return the maximum cache size set by PIVMETALIB_CACHE_MAX_SIZE or DEFAULT_MAX_SIZE"""
+    value = os.environ.get(MAX_SIZE_ENV_VARIABLE)
+    if not value:
+        return DEFAULT_MAX_SIZE
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f'Invalid {MAX_SIZE_ENV_VARIABLE}="{value}" (expected a number of bytes). '
+                       f'Using {DEFAULT_MAX_SIZE} bytes.')
+        return DEFAULT_MAX_SIZE
+
+
+@contextlib.contextmanager
+def _file_lock(filename: pathlib.Path):
+    """Hold an exclusive lock on `filename`, which is shared by all processes"""
+    filename.parent.mkdir(parents=True, exist_ok=True)
+    with open(filename, 'a+b') as f:
+        if os.name == 'nt':
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after 10 seconds
+                    pass
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _flush_at_exit(ref: weakref.ref):
+    file_cache = ref()
+    if file_cache is not None:
+        file_cache.flush()
+
+
+class FileCache:
+    """Content-addressed file cache with an on-disk index and LRU eviction.
+
+    Parameters
+    ----------
+    directory: str or pathlib.Path
+        Root directory of the cache
+    max_size: int
+        Maximum total size of the cached files in bytes. Least recently
+        used files are removed when it is exceeded. Defaults to the
+        environment variable PIVMETALIB_CACHE_MAX_SIZE or DEFAULT_MAX_SIZE.
+    """
+
+    def __init__(self, directory: Union[str, pathlib.Path], max_size: Optional[int] = None):
+        self.directory = pathlib.Path(directory)
+        self.max_size = _get_default_max_size() if max_size is None else max_size
+        self._lock = threading.Lock()
+        self._index = None  # last read (or written) index
+        self._index_stat = None  # identifies the index file self._index was read from
+        self._accessed: Dict[str, float] = {}  # content hash -> last access not yet written
+        self._accessed_urls: Dict[str, str] = {}  # url -> content hash not yet written
+        self._last_flush = time.time()
+        atexit.register(_flush_at_exit, weakref.ref(self))
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(directory={self.directory}, max_size={self.max_size})'
+
+    @property
+    def index_filename(self) -> pathlib.Path:
+        return self.directory / 'index.json'
+
+    @property
+    def lock_filename(self) -> pathlib.Path:
+        return self.directory / 'index.lock'
+
+    def _read_index(self, cached: bool = True) -> Dict:
+        """Read the index. With `cached`, the index read before is returned
+        (and must not be modified) as long as the file has not been replaced."""
+        try:
+            stat = self.index_filename.stat()
+            index_stat = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if cached and index_stat == self._index_stat:
+                return self._index
+            with open(self.index_filename, encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('version') == INDEX_VERSION:
+                if cached:
+                    self._index, self._index_stat = index, index_stat
+                return index
+        except (OSError, ValueError):
+            pass
+        return {'version': INDEX_VERSION, 'urls': {}, 'objects': {}}
+
+    def _write_index(self, index: Dict):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_filename = self.index_filename.with_name(f'index.json.{os.getpid()}.tmp')
+        with open(tmp_filename, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(tmp_filename, self.index_filename)
+        stat = self.index_filename.stat()
+        self._index, self._index_stat = index, (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _apply_accesses(self, index: Dict):
+        """Write the collected access times and URLs of cache hits into `index`"""
+        for content_hash, last_access in self._accessed.items():
+            entry = index['objects'].get(content_hash)
+            if entry is not None:
+                entry['last_access'] = max(entry.get('last_access', 0), last_access)
+        for url, content_hash in self._accessed_urls.items():
+            if content_hash in index['objects']:
+                index['urls'][url] = content_hash
+        self._accessed.clear()
+        self._accessed_urls.clear()
+        self._last_flush = time.time()
+
+    def _flush(self):
+        if not (self._accessed or self._accessed_urls):
+            return
+        if not self.index_filename.exists():  # the cache has been removed
+            self._accessed.clear()
+            self._accessed_urls.clear()
+            return
+        with _file_lock(self.lock_filename):
+            index = self._read_index(cached=False)
+            self._apply_accesses(index)
+            self._write_index(index)
+
+    def flush(self):
+        """Write the access times of the cache hits to the index (done
+        automatically every FLUSH_INTERVAL seconds, on changes and at exit)"""
+        with self._lock:
+            self._flush()
+
+    def get_part_filename(self, url: str) -> pathlib.Path:
+        """Return the temporary filename used while downloading `url` (stable to allow resuming).
+        It must only be written while holding `download_lock(url)`."""
+        tmp_dir = self.directory / 'tmp'
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        return tmp_dir / f'{hashlib.sha256(url.encode("utf-8")).hexdigest()}.part'
+
+    def download_lock(self, url: str):
+        """Return a context manager holding the lock of the partial download
+        of `url` (see `get_part_filename`), which is shared by all processes"""
+        return _file_lock(self.get_part_filename(url).with_suffix('.lock'))
+
+    def lookup(self, url: Optional[str] = None, known_hash: Optional[str] = None) -> Optional[pathlib.Path]:
+        """Return the cached file of a URL or a content hash, or None on a cache miss.
+
+        If both are given, the file of `url` is only returned if its hash
+        equals `known_hash`; any other URL with the same content is a hit as well.
+        """
+        with self._lock:
+            index = self._read_index()
+            content_hash = (self._accessed_urls.get(url) or index['urls'].get(url)) if url else None
+            if known_hash and content_hash != known_hash:
+                content_hash = known_hash
+            entry = index['objects'].get(content_hash) if content_hash else None
+            if entry is None:
+                return None
+            filename = self.directory / entry['path']
+            if not filename.exists():
+                with _file_lock(self.lock_filename):
+                    index = self._read_index(cached=False)
+                    index['objects'].pop(content_hash, None)
+                    self._write_index(index)
+                return None
+            self._accessed[content_hash] = time.time()
+            if url and index['urls'].get(url) != content_hash:
+                self._accessed_urls[url] = content_hash
+            if time.time() - self._last_flush > FLUSH_INTERVAL:
+                self._flush()
+            return filename
+
+    def add(self, url: str, filename: Union[str, pathlib.Path], content_hash: str, name: str) -> pathlib.Path:
+        """Move a downloaded file into the cache and return its cached path.
+
+        If the same content is already cached, `filename` is removed and the
+        existing file is returned.
+        """
+        filename = pathlib.Path(filename)
+        with self._lock, _file_lock(self.lock_filename):
+            index = self._read_index(cached=False)
+            self._apply_accesses(index)
+            entry = index['objects'].get(content_hash)
+            if entry is not None and (self.directory / entry['path']).exists():
+                logger.debug(f'Content of {url} is already cached as {entry["path"]}')
+                filename.unlink()
+            else:
+                rel_path = pathlib.Path('objects') / content_hash[:2] / content_hash / (name or content_hash)
+                target = self.directory / rel_path
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(filename, target)
+                entry = {'path': rel_path.as_posix(), 'size': target.stat().st_size}
+                index['objects'][content_hash] = entry
+            entry['last_access'] = time.time()
+            index['urls'][url] = content_hash
+            self._evict(index, keep=content_hash)
+            self._write_index(index)
+            return self.directory / entry['path']
+
+    def _evict(self, index: Dict, keep: Optional[str] = None):
+        total_size = sum(entry['size'] for entry in index['objects'].values())
+        if total_size <= self.max_size:
+            return
+        for content_hash, entry in sorted(index['objects'].items(), key=lambda item: item[1]['last_access']):
+            if total_size <= self.max_size:
+                break
+            if content_hash == keep:
+                continue
+            logger.debug(f'Evicting {entry["path"]} from the cache')
+            shutil.rmtree((self.directory / entry['path']).parent, ignore_errors=True)
+            index['objects'].pop(content_hash)
+            total_size -= entry['size']
+        index['urls'] = {url: h for url, h in index['urls'].items() if h in index['objects']}
+
+    def evict(self):
+        """Remove least recently used files until the cache fits into `max_size`"""
+        with self._lock, _file_lock(self.lock_filename):
+            index = self._read_index(cached=False)
+            self._apply_accesses(index)
+            self._evict(index)
+            self._write_index(index)
+
+    @property
+    def size(self) -> int:
+        """Total size of the cached files in bytes"""
+        return sum(entry['size'] for entry in self._read_index()['objects'].values())
+
+
+_file_cache: Optional[FileCache] = None
+
+
+def get_file_cache() -> FileCache:
+    """Return the file cache located in the pivmetalib cache directory"""
+    global _file_cache
+    if _file_cache is None:
+        _file_cache = FileCache(utils.get_cache_dir() / 'files')
+    return _file_cache
+
+
+class GraphCache:
+    """LRU cache of parsed rdflib graphs, keyed by the hash of their source.
+
+    The graphs are shared between all callers and must not be modified.
+    With `persist=True`, parsed graphs are additionally stored as N-Triples
+    in a file cache, which are much faster to parse than Turtle or JSON-LD
+    in a new process. They count against the `max_size` of the file cache
+    and are evicted like any other cached file.
+
+    Parameters
+    ----------
+    maxsize: int
+        Maximum number of graphs kept in memory (0 disables the memory cache)
+    max_triples: int
+        Maximum total number of triples of the graphs kept in memory. Least
+        recently used graphs are dropped when it is exceeded, a larger graph
+        is not kept at all.
+    persist: bool
+        Whether to store parsed graphs on disk
+    directory: str or pathlib.Path
+        Directory of a file cache for the persisted graphs (defaults to the
+        pivmetalib file cache, see `get_file_cache`)
+    """
+
+    def __init__(self,
+                 maxsize: int = 16,
+                 persist: bool = False,
+                 directory: Union[str, pathlib.Path] = None,
+                 max_triples: int = GRAPH_CACHE_MAX_TRIPLES):
+        self.maxsize = maxsize
+        self.max_triples = max_triples
+        self.persist = persist
+        self._file_cache = FileCache(directory) if directory is not None else None
+        self._graphs = OrderedDict()  # key -> (graph, number of triples)
+        self._n_triples = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}(maxsize={self.maxsize}, max_triples={self.max_triples}, '
+                f'persist={self.persist}, n={len(self._graphs)}, n_triples={self._n_triples})')
+
+    @property
+    def file_cache(self) -> FileCache:
+        """The file cache holding the persisted graphs"""
+        if self._file_cache is None:
+            self._file_cache = get_file_cache()
+        return self._file_cache
+
+    @staticmethod
+    def _persisted_url(key: str) -> str:
+        """Return the key of a persisted graph in the file cache index"""
+        return f'graph:{key}'
+
+    def get(self, key: str) -> Optional[rdflib.Graph]:
+        """Return the cached graph of a key or None"""
+        with self._lock:
+            entry = self._graphs.get(key)
+            if entry is not None:
+                self._graphs.move_to_end(key)
+                return entry[0]
+        if self.persist:
+            filename = self.file_cache.lookup(self._persisted_url(key))
+            if filename is not None:
+                graph = rdflib.Graph()
+                graph.parse(filename, format='nt')
+                self._remember(key, graph)
+                return graph
+        return None
+
+    def _remember(self, key: str, graph: rdflib.Graph):
+        n_triples = len(graph)
+        with self._lock:
+            if key in self._graphs:
+                self._n_triples -= self._graphs.pop(key)[1]
+            if self.maxsize > 0 and n_triples <= self.max_triples:
+                self._graphs[key] = (graph, n_triples)
+                self._n_triples += n_triples
+            while self._graphs and (len(self._graphs) > self.maxsize or self._n_triples > self.max_triples):
+                self._n_triples -= self._graphs.popitem(last=False)[1][1]
+
+    def put(self, key: str, graph: rdflib.Graph):
+        """Add a parsed graph to the cache"""
+        self._remember(key, graph)
+        if self.persist:
+            url = self._persisted_url(key)
+            if self.file_cache.lookup(url) is None:
+                with self.file_cache.download_lock(url):
+                    if self.file_cache.lookup(url) is None:
+                        tmp_filename = self.file_cache.get_part_filename(url)
+                        graph.serialize(tmp_filename, format='nt', encoding='utf-8')
+                        self.file_cache.add(url, tmp_filename, utils._sha256_of_file(tmp_filename),
+                                            name=f'{key}.nt')
+
+    def clear(self):
+        """Remove all graphs from memory (persisted graphs are kept)"""
+        with self._lock:
+            self._graphs.clear()
+            self._n_triples = 0
+
+
+graph_cache = GraphCache()
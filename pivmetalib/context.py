@@ -0,0 +1,245 @@
+"""Resolve remote JSON-LD contexts from a local, versioned cache.
+
+Remote contexts (e.g. the pivmeta or codemeta context) are stored under
+``CACHE_DIR/contexts/v<CACHE_VERSION>/`` together with a small metadata file
+holding the URL, the ETag and the time of the last validation. A cached
+context is returned without network access as long as it is younger than the
+TTL. Older entries are revalidated with ``If-None-Match``. Responses, which
+are not JSON (e.g. HTML pages embedding the context), are resolved by the
+document loader of rdflib. In offline mode
+(argument or environment variable ``PIVMETALIB_OFFLINE=1``) the network is
+never touched.
+"""
+import copy
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import time
+from typing import Dict, List, Union, Optional, Tuple
+
+import requests
+
+from . import utils
+
+logger = logging.getLogger(__package__)
+
+CACHE_VERSION = 1
+DEFAULT_TTL = 24 * 3600  # seconds
+OFFLINE_ENV_VARIABLE = 'PIVMETALIB_OFFLINE'
+
+_memory_cache: Dict[str, Union[Dict, List]] = {}
+_memory_validated: Dict[str, float] = {}  # time of the last validation of the contexts in memory
+
+
+def is_offline() -> bool:
+    """Return True if the offline mode is enabled via the environment"""
+    return os.environ.get(OFFLINE_ENV_VARIABLE, '').lower() in ('1', 'true', 'yes', 'on')
+
+
+def get_context_cache_dir() -> pathlib.Path:
+    """Return the (versioned) directory holding the cached contexts"""
+    return utils.get_cache_dir() / 'contexts' / f'v{CACHE_VERSION}'
+
+
+def _cache_filenames(url: str) -> Tuple[pathlib.Path, pathlib.Path]:
+    name = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    cache_dir = get_context_cache_dir()
+    return cache_dir / f'{name}.jsonld', cache_dir / f'{name}.meta.json'
+
+
+def _read_meta(meta_filename: pathlib.Path) -> Dict:
+    try:
+        with open(meta_filename, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_atomic(filename: pathlib.Path, content: bytes):
+    filename.parent.mkdir(parents=True, exist_ok=True)
+    tmp_filename = filename.with_name(f'{filename.name}.{os.getpid()}.tmp')
+    with open(tmp_filename, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_filename, filename)
+
+
+def _store(url: str, content: bytes, etag: Optional[str] = None):
+    context_filename, meta_filename = _cache_filenames(url)
+    _write_atomic(context_filename, content)
+    _write_atomic(meta_filename, json.dumps({'url': url,
+                                             'etag': etag,
+                                             'validated': time.time()}).encode('utf-8'))
+    _memory_validated[url] = time.time()
+
+
+def _extract_context(content: bytes, url: str) -> Union[Dict, List]:
+    return _get_context(json.loads(content), url)
+
+
+def _get_context(data, url: str) -> Union[Dict, List]:
+    if not isinstance(data, dict) or '@context' not in data:
+        raise ValueError(f'No "@context" found in the document of {url}')
+    return data['@context']
+
+
+def register_context(url: str, source: Union[str, pathlib.Path, Dict]) -> pathlib.Path:
+    """Store a context in the cache, e.g. to prepare nodes without network access.
+
+    Parameters
+    ----------
+    url: str
+        The URL under which the context is referenced in documents
+    source: str or pathlib.Path or Dict
+        A local context file or the context document as dictionary
+
+    Returns
+    -------
+    pathlib.Path
+        The cached context file
+    """
+    if isinstance(source, dict):
+        content = json.dumps(source).encode('utf-8')
+    else:
+        content = pathlib.Path(source).read_bytes()
+    _extract_context(content, url)  # validate before storing
+    _store(url, content)
+    _memory_cache.pop(url, None)
+    return _cache_filenames(url)[0]
+
+
+def load_context(url: str,
+                 offline: Optional[bool] = None,
+                 ttl: float = DEFAULT_TTL,
+                 timeout: float = 10) -> Union[Dict, List]:
+    """Return the "@context" value of a remote JSON-LD context document.
+
+    Parameters
+    ----------
+    url: str
+        URL of the context document
+    offline: bool=None
+        Never access the network. Defaults to the `PIVMETALIB_OFFLINE`
+        environment variable.
+    ttl: float
+        Seconds a cached context is used without revalidation
+    timeout: float
+        Timeout of the HTTP request in seconds
+
+    Returns
+    -------
+    Dict or List
+        The (deep-copied) context
+
+    Raises
+    ------
+    FileNotFoundError if the context is not cached and cannot be fetched
+    """
+    if offline is None:
+        offline = is_offline()
+    # a context in memory is answered without touching the disk:
+    if url in _memory_cache and (offline or time.time() - _memory_validated.get(url, 0) < ttl):
+        return copy.deepcopy(_memory_cache[url])
+
+    context_filename, meta_filename = _cache_filenames(url)
+    meta = _read_meta(meta_filename)
+    is_cached = context_filename.exists()
+
+    if is_cached and (offline or time.time() - meta.get('validated', 0) < ttl):
+        _memory_validated[url] = meta.get('validated', 0)
+        return _load_cached(url, context_filename)
+
+    if offline:
+        raise FileNotFoundError(f'Context {url} is not cached and offline mode is enabled. '
+                                f'Use register_context() to provide it.')
+
+    headers = {'Accept': 'application/ld+json, application/json;q=0.9, */*;q=0.1'}
+    if is_cached and meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    try:
+        logger.debug(f'Fetching context {url}')
+        response = requests.get(url, headers=headers, timeout=timeout)
+    except requests.RequestException as e:
+        if is_cached:
+            logger.warning(f'Could not revalidate context {url} ({e}). Using the cached version.')
+            return _load_cached(url, context_filename)
+        raise FileNotFoundError(f'Context {url} is not cached and could not be downloaded: {e}') from e
+
+    if response.status_code == 304 and is_cached:
+        _store(url, context_filename.read_bytes(), meta.get('etag'))
+        return _load_cached(url, context_filename)
+    if not response.ok:
+        if is_cached:
+            logger.warning(f'Could not revalidate context {url} (HTTP {response.status_code}). '
+                           f'Using the cached version.')
+            return _load_cached(url, context_filename)
+        response.raise_for_status()
+
+    try:
+        content, etag = response.content, response.headers.get('ETag')
+        context = _extract_context(content, url)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        logger.debug(f'Context {url} is not served as JSON ({response.headers.get("Content-Type")}). '
+                     f'Loading it with rdflib.')
+        context = _get_context(_load_with_rdflib(url), url)
+        content, etag = json.dumps({'@context': context}).encode('utf-8'), None
+    _store(url, content, etag)
+    _memory_cache[url] = context
+    return copy.deepcopy(context)
+
+
+def _load_with_rdflib(url: str) -> Union[Dict, List]:
+    """Load a JSON-LD document the way rdflib resolves remote contexts
+    (content negotiation, JSON-LD embedded in HTML)"""
+    from rdflib.plugins.shared.jsonld.util import source_to_json
+    data, _ = source_to_json(url)
+    if isinstance(data, list):  # JSON-LD script elements of an HTML page
+        return next((d for d in data if isinstance(d, dict) and '@context' in d), None)
+    return data
+
+
+def _load_cached(url: str, context_filename: pathlib.Path) -> Union[Dict, List]:
+    if url not in _memory_cache:
+        _memory_cache[url] = _extract_context(context_filename.read_bytes(), url)
+    return copy.deepcopy(_memory_cache[url])
+
+
+def resolve_contexts(context: Union[str, Dict, List], **kwargs) -> Union[Dict, List]:
+    """Replace remote context references by their (cached) content.
+
+    Handles plain URLs, lists of contexts and "@import" entries, so that
+    rdflib does not need to fetch anything while parsing. Keyword arguments
+    are passed to `load_context`.
+    """
+    if isinstance(context, str):
+        if context.startswith('http://') or context.startswith('https://'):
+            return load_context(context, **kwargs)
+        return context
+    if isinstance(context, list):
+        resolved = []
+        for ctx in context:
+            ctx = resolve_contexts(ctx, **kwargs)
+            if isinstance(ctx, list):
+                resolved.extend(ctx)
+            else:
+                resolved.append(ctx)
+        return resolved
+    if isinstance(context, dict) and '@import' in context:
+        local_terms = {k: v for k, v in context.items() if k != '@import'}
+        imported = resolve_contexts(context['@import'], **kwargs)
+        if isinstance(imported, dict):
+            return {**imported, **local_terms}
+        return [*imported, local_terms] if local_terms else imported
+    return context
+
+
+def resolve_document(document: Union[Dict, List], **kwargs) -> Union[Dict, List]:
+    """Return a JSON-LD document (dict or list of dicts) whose top-level
+    "@context" entries are resolved with `resolve_contexts`."""
+    if isinstance(document, list):
+        return [resolve_document(d, **kwargs) for d in document]
+    if isinstance(document, dict) and '@context' in document:
+        document = dict(document)
+        document['@context'] = resolve_contexts(document['@context'], **kwargs)
+    return document
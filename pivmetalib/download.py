@@ -0,0 +1,186 @@
+"""Concurrent download of dataset distributions."""
+import hashlib
+import logging
+import pathlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Union, Iterable, Dict, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .utils import download_file, _sha256_of_file
+
+logger = logging.getLogger(__package__)
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of downloading a single distribution"""
+    distribution: object
+    filename: Optional[pathlib.Path] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _get_checksum(distribution) -> Tuple[Optional[str], Optional[str]]:
+    """Return (algorithm, value) of the spdx:checksum of a distribution.
+
+    (None, None) is returned if there is no checksum or its algorithm is not
+    defined ("None" is the default of spdx:Checksum).
+
+    Raises
+    ------
+    ValueError if the checksum has no value
+    """
+    checksum = getattr(distribution, 'checksum', None)
+    if checksum is None or isinstance(checksum, str):
+        return None, None
+    algorithm = getattr(checksum, 'algorithm', None)
+    if algorithm is None or str(algorithm) == 'None':
+        logger.debug(f'Checksum of {distribution.downloadURL} has no algorithm. It is not verified.')
+        return None, None
+    value = getattr(checksum, 'checksumValue', None)
+    if not value:
+        raise ValueError(f'Checksum of {distribution.downloadURL} has no value')
+    algorithm = str(algorithm).rsplit('checksumAlgorithm_', 1)[-1].replace('-', '').lower()
+    return algorithm, str(value).lower()
+
+
+def _verify_checksum(filename: pathlib.Path, algorithm: str, value: str):
+    if algorithm == 'sha256':
+        calculated = _sha256_of_file(filename)
+    else:
+        h = hashlib.new(algorithm)
+        with open(filename, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                h.update(block)
+        calculated = h.hexdigest()
+    if calculated != value:
+        raise ValueError(f'{algorithm} checksum of {filename} does not match the expected value')
+
+
+def _download_url(url: str,
+                  dest_filename: Optional[pathlib.Path],
+                  checksums: Dict[int, Tuple[str, str]],
+                  session: requests.Session,
+                  **kwargs) -> Tuple[pathlib.Path, Dict[int, Exception]]:
+    """Download a URL once and verify it against the checksums of all distributions
+    referencing it. Returns the filename and the checksum errors per distribution index."""
+    parsed_url = urlparse(url)
+    if parsed_url.scheme == 'file':
+        filename = pathlib.Path(parsed_url.path)
+        if not filename.exists():
+            raise FileNotFoundError(f"Source file '{filename}' does not exist")
+        known_hash = None
+    else:
+        # a sha256 checksum is verified while downloading (and allows cache lookups by hash)
+        known_hash = next((value for algorithm, value in checksums.values() if algorithm == 'sha256'), None)
+        filename = download_file(url, dest_filename, known_hash=known_hash, session=session, **kwargs)
+    errors = {}
+    for i, (algorithm, value) in checksums.items():
+        if algorithm == 'sha256' and value == known_hash:
+            continue
+        try:
+            _verify_checksum(filename, algorithm, value)
+        except (ValueError, OSError) as e:
+            errors[i] = e
+    return filename, errors
+
+
+def download_distributions(distributions: Iterable,
+                           target_folder: Union[str, pathlib.Path] = None,
+                           max_workers: int = 8,
+                           verify_checksums: bool = True,
+                           **kwargs) -> List[DownloadResult]:
+    """Download the files of many distributions concurrently.
+
+    All downloads share one HTTP session whose connection pool is sized to
+    `max_workers`, so connections to the same host are reused. Each URL is
+    downloaded only once, even if it is referenced by several distributions.
+    Errors do not stop the other downloads but are reported in the results.
+
+    Parameters
+    ----------
+    distributions: Iterable[Distribution]
+        The distributions to download (their `downloadURL` is used)
+    target_folder: str or pathlib.Path=None
+        Folder to store the files in. If None, the pivmetalib cache is used.
+    max_workers: int
+        Maximum number of concurrent downloads
+    verify_checksums: bool
+        Verify the files against the `checksum` (spdx:checksum) of the distributions
+    kwargs
+        Passed to `pivmetalib.utils.download_file`
+
+    Returns
+    -------
+    List[DownloadResult]
+        One result per distribution in the input order
+    """
+    distributions = list(distributions)
+    if target_folder is not None:
+        target_folder = pathlib.Path(target_folder)
+        target_folder.mkdir(parents=True, exist_ok=True)
+
+    results = [DownloadResult(distribution=d) for d in distributions]
+    urls: Dict[str, List[int]] = {}
+    for i, distribution in enumerate(distributions):
+        if getattr(distribution, 'downloadURL', None) is None:
+            results[i].error = ValueError(f'No downloadURL defined for {distribution}')
+            continue
+        urls.setdefault(str(distribution.downloadURL), []).append(i)
+
+    dest_filenames: Dict[str, Optional[pathlib.Path]] = {}
+    used_names = set()
+    for url in urls:
+        if target_folder is None:
+            dest_filenames[url] = None
+            continue
+        name = pathlib.PurePosixPath(urlparse(url).path).name or 'index'
+        stem, suffix, n = pathlib.PurePosixPath(name).stem, pathlib.PurePosixPath(name).suffix, 1
+        while name in used_names:  # different URLs with the same filename
+            name = f'{stem}_{n}{suffix}'
+            n += 1
+        used_names.add(name)
+        dest_filenames[url] = target_folder / name
+
+    with requests.Session() as session:
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for url, indices in urls.items():
+                checksums = {}
+                if verify_checksums:
+                    for i in indices:
+                        try:
+                            algorithm, value = _get_checksum(distributions[i])
+                        except Exception as e:
+                            logger.error(f'Invalid checksum of {url}: {e}')
+                            results[i].error = e
+                            continue
+                        if algorithm:
+                            checksums[i] = (algorithm, value)
+                urls[url] = [i for i in indices if results[i].error is None]
+                if not urls[url]:
+                    continue
+                futures[url] = executor.submit(_download_url, url, dest_filenames[url], checksums, session,
+                                               **kwargs)
+            for url, future in futures.items():
+                try:
+                    filename, errors = future.result()
+                except Exception as e:
+                    logger.error(f'Download of {url} failed: {e}')
+                    for i in urls[url]:
+                        results[i].error = e
+                else:
+                    for i in urls[url]:
+                        results[i].filename = filename
+                        results[i].error = errors.get(i, None)
+    return results
@@ -1,19 +1,376 @@
+import io
+import functools
+import itertools
 import json
-from typing import List
+import pathlib
+import shutil
+import tempfile
+import textwrap
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, IO, Iterable, Iterator, List, Sequence, Union
 
+from .utils import _map_chunks, _pool_size
 
-def merge(jsonld_strings: List[str]) -> str:
+JSONLDSource = Union[str, pathlib.Path, Dict]
+
+_INDENT = 2
+_SPOOL_SIZE = 16 * 1024 * 1024  # characters of @graph kept in memory before spooling to disk
+_CONFLICT_MODES = ('combine', 'first', 'last')
+
+
+def _iter_documents(sources: Iterable[JSONLDSource]) -> Iterator[Dict]:
+    """Yield the json-ld documents (dicts) of json-ld strings, file paths or dicts one by one"""
+    for source in sources:
+        if isinstance(source, dict):
+            doc = source
+        elif isinstance(source, pathlib.Path) or not source.lstrip().startswith(('{', '[')):
+            with open(source, encoding='utf-8') as f:
+                doc = json.load(f)
+        else:
+            doc = json.loads(source)
+        if isinstance(doc, list):
+            yield from doc
+        else:
+            yield doc
+
+
+def _check_on_conflict(on_conflict: str):
+    if on_conflict not in _CONFLICT_MODES:
+        raise ValueError(f'Invalid value for on_conflict: "{on_conflict}". Expected one of {_CONFLICT_MODES}')
+
+
+def _context_key(context) -> str:
+    return json.dumps(context, sort_keys=True)
+
+
+def _graph_item(doc: Dict):
+    """The item appended to the @graph of a (non-flattened) merge"""
+    if '@graph' in doc:
+        return doc['@graph']
+    return {k: v for k, v in doc.items() if k != '@context'}
+
+
+class _BlankNode:
+    """A blank node of one document. The name is assigned when all merged
+    documents are known, as blank node identifiers are scoped to their document."""
+    __slots__ = ('label', 'name')
+
+    def __init__(self, label: str):
+        self.label = label
+        self.name = label
+
+
+def _blank_node_name(obj) -> str:
+    if isinstance(obj, _BlankNode):
+        return obj.name
+    raise TypeError(f'Object of type {obj.__class__.__name__} is not JSON serializable')
+
+
+def _format_item(item, compact: bool, level: int) -> str:
+    if compact:
+        return json.dumps(item, separators=(',', ':'), default=_blank_node_name)
+    return textwrap.indent(json.dumps(item, indent=_INDENT, default=_blank_node_name), ' ' * _INDENT * level)
+
+
+def _iter_graph_nodes(items: Iterable) -> Iterator:
+    """Yield the nodes of a (possibly nested) @graph list"""
+    for item in items:
+        if isinstance(item, list):
+            yield from _iter_graph_nodes(item)
+        elif isinstance(item, dict) and '@graph' in item and set(item) <= {'@graph', '@context'}:
+            yield from _iter_graph_nodes(item['@graph'])
+        else:
+            yield item
+
+
+def _is_node(obj) -> bool:
+    return isinstance(obj, dict) and not any(k in obj for k in ('@value', '@list', '@set'))
+
+
+def _replace_blank_nodes(obj, blank_nodes: Dict[str, _BlankNode]):
+    """Return a copy of `obj` in which blank node identifiers are replaced by `_BlankNode` objects"""
+    if isinstance(obj, list):
+        return [_replace_blank_nodes(item, blank_nodes) for item in obj]
+    if isinstance(obj, dict):
+        copy = {}
+        for key, value in obj.items():
+            if key == '@id' and isinstance(value, str) and value.startswith('_:'):
+                if value not in blank_nodes:
+                    blank_nodes[value] = _BlankNode(value)
+                copy[key] = blank_nodes[value]
+            else:
+                copy[key] = _replace_blank_nodes(value, blank_nodes)
+        return copy
+    return obj
+
+
+def _flatten_value(value, nodes: List[Dict]):
+    if isinstance(value, list):
+        return [_flatten_value(v, nodes) for v in value]
+    if _is_node(value):
+        if '@id' in value and len(value) > 1:
+            _flatten_node(value, nodes)
+            return {'@id': value['@id']}
+        return {k: v if k.startswith('@') else _flatten_value(v, nodes) for k, v in value.items()}
+    return value
+
+
+def _flatten_node(node: Dict, nodes: List[Dict]):
+    """Append the node and all embedded nodes with an @id to `nodes`,
+    replacing the embedded nodes by references"""
+    flat = {}
+    nodes.append(flat)
+    for key, value in node.items():
+        flat[key] = value if key.startswith('@') else _flatten_value(value, nodes)
+
+
+def _value_key(value) -> str:
+    # blank nodes are only equal to themselves
+    return json.dumps(value, sort_keys=True, default=lambda b: f'_:{id(b)}')
+
+
+def _combine_values(existing, value):
+    """Union of two property values (single value or list) in order of appearance"""
+    values = existing if isinstance(existing, list) else [existing]
+    keys = {_value_key(v) for v in values}
+    combined = list(values)
+    for v in (value if isinstance(value, list) else [value]):
+        key = _value_key(v)
+        if key not in keys:
+            keys.add(key)
+            combined.append(v)
+    if len(combined) == len(values):
+        return existing
+    return combined
+
+
+class _MergeState:
+    """Intermediate result of merging a contiguous range of documents.
+
+    Merging documents one by one (serial merge) and combining the states of
+    consecutive chunks in order give the same result.
+    Without `flatten`, the graph items are stored already formatted.
+    """
+
+    def __init__(self, compact: bool, flatten: bool, on_conflict: str):
+        self.compact = compact
+        self.flatten = flatten
+        self.on_conflict = on_conflict
+        self.contexts: Dict[str, Union[str, Dict, List]] = {}
+        self.items: List = []
+        self.index: Dict[Union[str, _BlankNode], Dict] = {}
+        self.blank_nodes: Dict[str, List[_BlankNode]] = {}  # one per document using the label
+
+    def add_document(self, doc: Dict):
+        context = doc.get('@context', None)
+        if context is not None:
+            self.contexts.setdefault(_context_key(context), context)
+        if not self.flatten:
+            self.items.append(_format_item(_graph_item(doc), self.compact, level=2))
+            return
+        doc_blank_nodes: Dict[str, _BlankNode] = {}
+        items = _replace_blank_nodes(doc['@graph'] if '@graph' in doc else [_graph_item(doc)], doc_blank_nodes)
+        for label, blank_node in doc_blank_nodes.items():
+            self.blank_nodes.setdefault(label, []).append(blank_node)
+        flat_nodes = []
+        for node in _iter_graph_nodes(items):
+            if _is_node(node):
+                _flatten_node(node, flat_nodes)
+            else:
+                flat_nodes.append(node)
+        for node in flat_nodes:
+            self._add_node(node)
+
+    def update(self, other: '_MergeState'):
+        """Append the state of the documents following the ones of this state"""
+        for key, context in other.contexts.items():
+            self.contexts.setdefault(key, context)
+        for label, blank_nodes in other.blank_nodes.items():
+            self.blank_nodes.setdefault(label, []).extend(blank_nodes)
+        if not self.flatten:
+            self.items.extend(other.items)
+            return
+        for node in other.items:
+            self._add_node(node)
+
+    def _add_node(self, node):
+        node_id = node.get('@id', None) if isinstance(node, dict) else None
+        if node_id is None:
+            self.items.append(node)
+        elif node_id not in self.index:
+            self.index[node_id] = node
+            self.items.append(node)
+        else:
+            existing = self.index[node_id]
+            for key, value in node.items():
+                if key not in existing or self.on_conflict == 'last':
+                    existing[key] = value
+                elif self.on_conflict == 'combine':
+                    existing[key] = _combine_values(existing[key], value)
+
+    def name_blank_nodes(self):
+        """Keep the label of the first document using it, relabel the others (_:b1 -> _:b1_1, ...)"""
+        taken = set(self.blank_nodes)
+        for label, blank_nodes in self.blank_nodes.items():
+            n = 0
+            for blank_node in blank_nodes[1:]:
+                n += 1
+                while f'{label}_{n}' in taken:
+                    n += 1
+                blank_node.name = f'{label}_{n}'
+                taken.add(blank_node.name)
+
+    def iter_formatted_items(self) -> Iterator[str]:
+        if not self.flatten:
+            return iter(self.items)
+        self.name_blank_nodes()
+        return (_format_item(node, self.compact, level=2) for node in self.items)
+
+
+def _format_items(items: List, compact: bool) -> List[str]:
+    return [_format_item(item, compact, level=2) for item in items]
+
+
+class _ArrayWriter:
+    """Writes the items of a JSON array one by one.
+
+    The output is identical to the array written by `json.dumps(..., indent=2)`
+    (or `separators=(',', ':')` if `compact`) of the enclosing object.
+    """
+
+    def __init__(self, f: IO[str], compact: bool, level: int):
+        self.f = f
+        self.compact = compact
+        self.level = level
+        self.n = 0
+
+    def write(self, item):
+        self.write_formatted(_format_item(item, self.compact, self.level))
+
+    def write_formatted(self, formatted_item: str):
+        if self.compact:
+            if self.n:
+                self.f.write(',')
+        else:
+            self.f.write(',\n' if self.n else '\n')
+        self.f.write(formatted_item)
+        self.n += 1
+
+    def close(self):
+        if self.n and not self.compact:
+            self.f.write('\n' + ' ' * _INDENT * (self.level - 1))
+        self.f.write(']')
+
+
+def _write_merged(target: IO[str], contexts: Iterable, graph: Union[IO[str], Iterable[str]], compact: bool):
+    """Write the merged document. `graph` is either the written @graph array
+    (without the opening bracket) or an iterable of formatted graph items."""
+    target.write('{"@context":[' if compact else '{\n' + ' ' * _INDENT + '"@context": [')
+    context_writer = _ArrayWriter(target, compact, level=2)
+    for context in contexts:
+        context_writer.write(context)
+    context_writer.close()
+    target.write(',"@graph":[' if compact else ',\n' + ' ' * _INDENT + '"@graph": [')
+    if hasattr(graph, 'read'):
+        shutil.copyfileobj(graph, target)
+    else:
+        graph_writer = _ArrayWriter(target, compact, level=2)
+        for formatted_item in graph:
+            graph_writer.write_formatted(formatted_item)
+        graph_writer.close()
+    target.write('}' if compact else '\n}')
+
+
+def merge_to(sources: Iterable[JSONLDSource],
+             target: Union[str, pathlib.Path, IO[str]],
+             compact: bool = False,
+             flatten: bool = False,
+             on_conflict: str = 'combine') -> None:
+    """Merge multiple json-ld documents into one json-ld file or stream.
+
+    The documents are read one at a time and their nodes are written
+    incrementally, so the memory consumption does not grow with the number
+    of documents. Identical contexts are only written once.
+
+    With `flatten=True`, nested graphs and embedded nodes are flattened into
+    one @graph and nodes with the same @id are combined. Blank node identifiers
+    that occur in several documents are relabeled, as they are scoped to their
+    document. The properties are compared as written, i.e. compatible contexts
+    are assumed. In this mode all nodes are held in memory until written.
+
+    .. note::
+
+        Without `flatten`, it is not checked if the @id's are unique!
+
+
+    Parameters
+    ----------
+    sources : Iterable[str or pathlib.Path or Dict]
+        json-ld strings, paths to json-ld files or json-ld dictionaries
+    target : str or pathlib.Path or IO[str]
+        Filename or text stream to write the merged json-ld to
+    compact : bool
+        Write without indentation and whitespace
+    flatten : bool
+        Flatten the graphs and combine nodes with the same @id
+    on_conflict : str
+        How to combine differing values of a property of nodes with the same
+        @id (only used with `flatten`): "combine" collects all distinct values
+        in order of appearance, "first" and "last" keep the value of the
+        first or last node.
+
+    Raises
+    ------
+    ValueError
+        If `on_conflict` is invalid
+    """
+    _check_on_conflict(on_conflict)
+    if isinstance(target, (str, pathlib.Path)):
+        with open(target, 'w', encoding='utf-8') as f:
+            merge_to(sources, f, compact=compact, flatten=flatten, on_conflict=on_conflict)
+        return
+
+    if flatten:
+        state = _merge_chunk(sources, compact, flatten, on_conflict)
+        _write_merged(target, state.contexts.values(), state.iter_formatted_items(), compact)
+        return
+
+    contexts = {}
+    # the nodes are spooled until all contexts are known, which are written first
+    with tempfile.SpooledTemporaryFile(max_size=_SPOOL_SIZE, mode='w+', encoding='utf-8') as graph_spool:
+        graph = _ArrayWriter(graph_spool, compact, level=2)
+        for doc in _iter_documents(sources):
+            context = doc.get('@context', None)
+            if context is not None:
+                contexts.setdefault(_context_key(context), context)
+            graph.write(_graph_item(doc))
+        graph.close()
+        graph_spool.seek(0)
+        _write_merged(target, contexts.values(), graph_spool, compact)
+
+
+def merge(jsonld_strings: Iterable[JSONLDSource],
+          compact: bool = False,
+          flatten: bool = False,
+          on_conflict: str = 'combine') -> str:
     """Merge multiple json-ld strings into one json-ld string.
 
     .. note::
 
-        It is not checked if the @id's are unique!
+        It is not checked if the @id's are unique unless `flatten` is True!
 
 
     Parameters
     ----------
-    jsonld_strings : List[str]
-        List of json-ld strings to merge.
+    jsonld_strings : Iterable[str or pathlib.Path or Dict]
+        json-ld strings to merge. Paths to json-ld files and json-ld
+        dictionaries are accepted as well.
+    compact : bool
+        Return the json-ld without indentation and whitespace
+    flatten : bool
+        Flatten the graphs and combine nodes with the same @id (see `merge_to`)
+    on_conflict : str
+        "combine", "first" or "last" (see `merge_to`)
 
     Returns
     -------
@@ -21,22 +378,105 @@ def merge(jsonld_strings: List[str]) -> str:
         Merged json-ld string.
 
     """
-    jsonld_dicts = [json.loads(jldd) for jldd in jsonld_strings]
+    buffer = io.StringIO()
+    merge_to(jsonld_strings, buffer, compact=compact, flatten=flatten, on_conflict=on_conflict)
+    return buffer.getvalue()
 
-    contexts = []
-    for jldd in jsonld_dicts:
-        if jldd['@context'] not in contexts:
-            contexts.append(jldd['@context'])
 
-    out = {'@context': contexts,
-           '@graph': []}
+def _merge_chunk(sources: Iterable[JSONLDSource], compact: bool, flatten: bool, on_conflict: str) -> _MergeState:
+    """Merge the documents one by one into a new state"""
+    state = _MergeState(compact, flatten, on_conflict)
+    for doc in _iter_documents(sources):
+        single = _MergeState(compact, flatten, on_conflict)
+        single.add_document(doc)
+        state.update(single)
+    return state
+
+
+def _combine_states(left: _MergeState, right: _MergeState) -> _MergeState:
+    left.update(right)
+    return left
 
-    for jldd in jsonld_dicts:
-        if '@graph' in jldd:
-            out['@graph'].append(jldd['@graph'])
-        else:
-            data = dict(jldd.items())
-            data.pop('@context')
-            out['@graph'].append(data)
 
-    return json.dumps(out, indent=2)
+def merge_parallel(sources: Sequence[JSONLDSource],
+                   target: Union[str, pathlib.Path, IO[str]],
+                   compact: bool = False,
+                   flatten: bool = False,
+                   on_conflict: str = 'combine',
+                   max_workers: int = None,
+                   chunk_size: int = 64) -> None:
+    """Merge many json-ld documents using multiple processes.
+
+    The documents are parsed and normalized (and, without `flatten`,
+    formatted) in chunks of `chunk_size` in a process pool. The chunk results
+    are folded in order in the parent process (no tree reduction). The output
+    is identical to the one of `merge_to`.
+
+    Without `flatten`, the formatted items of each chunk are written to the
+    same spooled temporary file as in `merge_to` as soon as the chunk is
+    done, so the parent holds only the chunks the workers finished ahead.
+    With `flatten`, nodes with the same @id may occur in any document, so
+    all combined nodes are kept in memory of the parent process and are
+    formatted in the pool.
+
+    Parameters
+    ----------
+    sources : Sequence[str or pathlib.Path or Dict]
+        json-ld strings, paths to json-ld files or json-ld dictionaries.
+        Paths are preferable, as they are cheap to send to the processes.
+    target : str or pathlib.Path or IO[str]
+        Filename or text stream to write the merged json-ld to
+    compact : bool
+        Write without indentation and whitespace
+    flatten : bool
+        Flatten the graphs and combine nodes with the same @id (see `merge_to`)
+    on_conflict : str
+        "combine", "first" or "last" (see `merge_to`)
+    max_workers : int
+        Number of processes. Defaults to the number of CPUs.
+    chunk_size : int
+        Number of documents processed per task
+
+    Raises
+    ------
+    ValueError
+        If `on_conflict` is invalid
+    """
+    _check_on_conflict(on_conflict)
+    if isinstance(target, (str, pathlib.Path)):
+        with open(target, 'w', encoding='utf-8') as f:
+            merge_parallel(sources, f, compact=compact, flatten=flatten, on_conflict=on_conflict,
+                           max_workers=max_workers, chunk_size=chunk_size)
+        return
+
+    sources = list(sources)
+    max_workers = _pool_size(len(sources), chunk_size, max_workers)
+    if max_workers == 1:
+        merge_to(sources, target, compact=compact, flatten=flatten, on_conflict=on_conflict)
+        return
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        states = _map_chunks(executor, _merge_chunk, sources, chunk_size, compact, flatten, on_conflict)
+        if not flatten:
+            contexts = {}
+            with tempfile.SpooledTemporaryFile(max_size=_SPOOL_SIZE, mode='w+', encoding='utf-8') as graph_spool:
+                graph = _ArrayWriter(graph_spool, compact, level=2)
+                for chunk_state in states:
+                    for key, context in chunk_state.contexts.items():
+                        contexts.setdefault(key, context)
+                    for formatted_item in chunk_state.items:
+                        graph.write_formatted(formatted_item)
+                graph.close()
+                graph_spool.seek(0)
+                _write_merged(target, contexts.values(), graph_spool, compact)
+            return
+
+        state = functools.reduce(_combine_states, states)
+        if state.items:
+            # formatting the (combined) nodes dominates the runtime of the final step
+            state.name_blank_nodes()
+            n = -(-len(state.items) // (4 * max_workers))
+            formatted_items = itertools.chain.from_iterable(_map_chunks(executor, _format_items, state.items, n,
+                                                                        compact))
+        else:
+            formatted_items = state.iter_formatted_items()
+        _write_merged(target, state.contexts.values(), formatted_items, compact)
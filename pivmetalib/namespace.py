@@ -1,3 +1,7 @@
+# Generated by deploy.py from the pivmeta context. Do not edit.
+# terms sha256: 42fe8d9faf1e13c96d1cb2293c6a09440cdeb42434b94bb829501ab941e252dd
+from types import MappingProxyType
+
 from rdflib.namespace import DefinedNamespace, Namespace
 from rdflib.term import URIRef
 
@@ -5,26 +9,49 @@ from rdflib.term import URIRef
 class PIV(DefinedNamespace):
     # uri = "https://matthiasprobst.github.io/pivmeta#"
     # Generated with pivmetalib
-    Flag: URIRef  # ['Flag']
-    FlagScheme: URIRef  # ['flag scheme']
-    FlagMapping: URIRef  # ['flag mapping']
-    FlagSchemeType: URIRef  # ['flag scheme type']
-    BitwiseFlagScheme: URIRef  # ['bitwise flag scheme']
-    EnumeratedFlagScheme: URIRef  # ['enumerated flag scheme']
     BackgroundSubtractionMethod: URIRef  # ['background subtraction method']
+    BitwiseFlagScheme: URIRef  # ['bitwise flag scheme']
+    BlackmanWindow: URIRef  # ['blackman window']
     Camera: URIRef  # ['camera']
     CorrelationMethod: URIRef  # ['correlation method']
+    DEHS: URIRef  # ['DEHS']
     DigitalCamera: URIRef  # ['digital camera']
+    EnumeratedFlagScheme: URIRef  # ['enumerated flag scheme']
+    ExperimentalImage: URIRef  # ['experimental image']
     ExperimentalSetup: URIRef  # ['experimental setup']
+    Flag: URIRef  # ['Flag']
+    FlagActive: URIRef  # ['active']
+    FlagDisabled: URIRef  # ['disabled']
+    FlagFiltered: URIRef  # ['filtered']
+    FlagInactive: URIRef  # ['inactive']
+    FlagInterpolated: URIRef  # ['interpolated']
+    FlagManualEdit: URIRef  # ['manualedit']
+    FlagMapping: URIRef  # ['flag mapping']
+    FlagMasked: URIRef  # ['masked']
+    FlagNoResult: URIRef  # ['noresult']
+    FlagReplaced: URIRef  # ['replaced']
+    FlagScheme: URIRef  # ['flag scheme']
+    FlagSchemeType: URIRef  # ['flag scheme type']
+    GaussianWindow: URIRef  # ['Gaussian window']
+    HammingWindow: URIRef  # ['Hamming window']
+    HannWindow: URIRef  # ['Hann window']
+    Image: URIRef  # ['image']
+    ImageDewarping: URIRef  # ['image dewarping']
+    ImageFiltering: URIRef  # ['image filtering']
+    ImageHorizontalFlip: URIRef  # ['image horizontal flip']
     ImageManipulationMethod: URIRef  # ['image manipulation method']
     ImageVelocimetryDataset: URIRef  # ['Image Velocimetry Dataset']
     ImageVelocimetryDistribution: URIRef  # ['Image Velocimetry Distribution']
     ImageVelocimetryMethod: URIRef  # ['image velocimetry method']
+    Interpolation: URIRef  # ['interpolation']
     InterrogationMethod: URIRef  # ['interrogation method']
     Laser: URIRef  # ['laser']
+    LeftRightFlip: URIRef  # ['left right flip']
     Lens: URIRef  # ['lens']
     LensSystem: URIRef  # ['lens system']
     LightSource: URIRef  # ['light source']
+    Mask: URIRef  # ['Mask']
+    MilliM_PER_PIXEL: URIRef  # ['millimeter per pixel']
     MinimumIntensityBackgroundSubtractionMethod: URIRef  # ['minimum intensity background subtraction method']
     Multigrid: URIRef  # ['multigrid']
     Multipass: URIRef  # ['multipass']
@@ -33,6 +60,8 @@ class PIV(DefinedNamespace):
     OpticalComponent: URIRef  # ['optical component']
     OutlierDetectionMethod: URIRef  # ['Outlier detection method']
     OutlierReplacementScheme: URIRef  # ['Outlier replacement scheme']
+    PER_PIXEL: URIRef  # ['per pixel']
+    PIV: URIRef  # ['Particle Image Velocimetry']
     PIVAnalysis: URIRef  # ['PIV Analysis']
     PIVBackgroundGeneration: URIRef  # ['PIV background generation']
     PIVCalibration: URIRef  # ['PIV calibration']
@@ -46,99 +75,97 @@ class PIV(DefinedNamespace):
     PIVProcessingStep: URIRef  # ['PIV Processing step']
     PIVRecording: URIRef  # ['PIV recording']
     PIVSoftware: URIRef  # ['PIV software']
+    PTV: URIRef  # ['Particle Tracking Velocimetry']
     PTVDataset: URIRef  # ['PTV dataset']
     PeakSearchMethod: URIRef  # ['peak search method']
+    ProcessedImage: URIRef  # ['processed image']
+    ReEvaluateWithLargerSample: URIRef  # ['re-evaluate with larger sample']
+    ResultData: URIRef  # ['result data']
     Setup: URIRef  # ['Setup']
     Singlepass: URIRef  # ['singlepass']
+    SpatialResolution: URIRef  # ['spatial resolution']
+    SplitImage: URIRef  # ['split image']
+    SquareWindow: URIRef  # ['square window']
+    SyntheticImage: URIRef  # ['synthetic image']
     SyntheticPIVParticle: URIRef  # ['synthetic PIV particle']
     TemporalVariable: URIRef  # ['temporal variable']
+    TopBottomFlip: URIRef  # ['top bottom flip']
+    TryLowerOrderPeaks: URIRef  # ['try lower order peaks']
+    TukeyWindow: URIRef  # ['Tukey window']
     VirtualCamera: URIRef  # ['virtual camera']
     VirtualLaser: URIRef  # ['virtual laser']
     VirtualSetup: URIRef  # ['virtual setup']
     VirtualTool: URIRef  # ['virtual tool']
     WindowWeightingFunction: URIRef  # ['window weighting function']
-    hasFlagScheme: URIRef  # ['has flag scheme']
     allowedFlag: URIRef  # ['allowed flag']
-    usesFlagSchemeType: URIRef  # ['uses flag scheme type']
-    mapsToFlag: URIRef  # ['maps to flag']
+    filenamePattern: URIRef  # ['filename pattern']
+    fnumber: URIRef  # ['fnumber']
     hasFlagMapping: URIRef  # ['has flag mapping']
+    hasFlagScheme: URIRef  # ['has flag scheme']
+    hasFlagValue: URIRef  # ['has flag value']
     hasMetric: URIRef  # ['has metric']
     hasPIVDataType: URIRef  # ['has PIV data type']
     hasSetup: URIRef  # ['has setup']
     hasWindowWeightingFunction: URIRef  # ['has window weighting function']
     isSetupFor: URIRef  # ['is setup for']
     manufacturer: URIRef  # ['manufacturer']
+    mapsToFlag: URIRef  # ['maps to flag']
+    mask: URIRef  # ['mask']
+    meaning: URIRef  # ['meaning']
+    microPIV: URIRef  # ['Micro Particle Image Velocimetry']
     outlierReplacementScheme: URIRef  # ['outlier replacement scheme']
+    timeValue: URIRef  # ['time value']
     usesAcquisitionSoftware: URIRef  # ['uses acquisition software']
     usesAnalysisSoftware: URIRef  # ['uses analysis software']
+    usesFlagSchemeType: URIRef  # ['uses flag scheme type']
     usesSoftware: URIRef  # ['uses software']
-    filenamePattern: URIRef  # ['filename pattern']
-    fnumber: URIRef  # ['fnumber']
-    mask: URIRef  # ['mask']
-    meaning: URIRef  # ['meaning']
-    hasFlagValue: URIRef  # ['has flag value']
-    timeValue: URIRef  # ['time value']
-    BlackmanWindow: URIRef  # ['blackman window']
-    DEHS: URIRef  # ['DEHS']
-    ExperimentalImage: URIRef  # ['experimental image']
-    GaussianWindow: URIRef  # ['Gaussian window']
-    HammingWindow: URIRef  # ['Hamming window']
-    HannWindow: URIRef  # ['Hann window']
-    Image: URIRef  # ['image']
-    ImageDewarping: URIRef  # ['image dewarping']
-    ImageFiltering: URIRef  # ['image filtering']
-    ImageHorizontalFlip: URIRef  # ['image horizontal flip']
-    Interpolation: URIRef  # ['interpolation']
-    LeftRightFlip: URIRef  # ['left right flip']
-    Mask: URIRef  # ['Mask']
-    MilliM_PER_PIXEL: URIRef  # ['millimeter per pixel']
-    PER_PIXEL: URIRef  # ['per pixel']
-    PIV: URIRef  # ['Particle Image Velocimetry']
-    PTV: URIRef  # ['Particle Tracking Velocimetry']
-    ProcessedImage: URIRef  # ['processed image']
-    ReEvaluateWithLargerSample: URIRef  # ['re-evaluate with larger sample']
-    ResultData: URIRef  # ['result data']
-    SpatialResolution: URIRef  # ['spatial resolution']
-    SplitImage: URIRef  # ['split image']
-    SquareWindow: URIRef  # ['square window']
-    SyntheticImage: URIRef  # ['synthetic image']
-    TopBottomFlip: URIRef  # ['top bottom flip']
-    TryLowerOrderPeaks: URIRef  # ['try lower order peaks']
-    TukeyWindow: URIRef  # ['Tukey window']
-    microPIV: URIRef  # ['Micro Particle Image Velocimetry']
-    FlagInactive: URIRef  # ['inactive']
-    FlagActive: URIRef  # ['active']
-    FlagMasked: URIRef  # ['masked']
-    FlagNoResult: URIRef  # ['noresult']
-    FlagDisabled: URIRef  # ['disabled']
-    FlagFiltered: URIRef  # ['filtered']
-    FlagInterpolated: URIRef  # ['interpolated']
-    FlagReplaced: URIRef  # ['replaced']
-    FlagManualEdit: URIRef  # ['manualedit']
 
     _NS = Namespace("https://matthiasprobst.github.io/pivmeta#")
 
 
-setattr(PIV, "Flag", PIV.Flag)
-setattr(PIV, "flag_scheme", PIV.FlagScheme)
-setattr(PIV, "flag_mapping", PIV.FlagMapping)
-setattr(PIV, "flag_scheme_type", PIV.FlagSchemeType)
-setattr(PIV, "bitwise_flag_scheme", PIV.BitwiseFlagScheme)
-setattr(PIV, "enumerated_flag_scheme", PIV.EnumeratedFlagScheme)
 setattr(PIV, "background_subtraction_method", PIV.BackgroundSubtractionMethod)
+setattr(PIV, "bitwise_flag_scheme", PIV.BitwiseFlagScheme)
+setattr(PIV, "blackman_window", PIV.BlackmanWindow)
 setattr(PIV, "camera", PIV.Camera)
 setattr(PIV, "correlation_method", PIV.CorrelationMethod)
+setattr(PIV, "DEHS", PIV.DEHS)
 setattr(PIV, "digital_camera", PIV.DigitalCamera)
+setattr(PIV, "enumerated_flag_scheme", PIV.EnumeratedFlagScheme)
+setattr(PIV, "experimental_image", PIV.ExperimentalImage)
 setattr(PIV, "experimental_setup", PIV.ExperimentalSetup)
+setattr(PIV, "Flag", PIV.Flag)
+setattr(PIV, "active", PIV.FlagActive)
+setattr(PIV, "disabled", PIV.FlagDisabled)
+setattr(PIV, "filtered", PIV.FlagFiltered)
+setattr(PIV, "inactive", PIV.FlagInactive)
+setattr(PIV, "interpolated", PIV.FlagInterpolated)
+setattr(PIV, "manualedit", PIV.FlagManualEdit)
+setattr(PIV, "flag_mapping", PIV.FlagMapping)
+setattr(PIV, "masked", PIV.FlagMasked)
+setattr(PIV, "noresult", PIV.FlagNoResult)
+setattr(PIV, "replaced", PIV.FlagReplaced)
+setattr(PIV, "flag_scheme", PIV.FlagScheme)
+setattr(PIV, "flag_scheme_type", PIV.FlagSchemeType)
+setattr(PIV, "Gaussian_window", PIV.GaussianWindow)
+setattr(PIV, "Hamming_window", PIV.HammingWindow)
+setattr(PIV, "Hann_window", PIV.HannWindow)
+setattr(PIV, "image", PIV.Image)
+setattr(PIV, "image_dewarping", PIV.ImageDewarping)
+setattr(PIV, "image_filtering", PIV.ImageFiltering)
+setattr(PIV, "image_horizontal_flip", PIV.ImageHorizontalFlip)
 setattr(PIV, "image_manipulation_method", PIV.ImageManipulationMethod)
 setattr(PIV, "Image_Velocimetry_Dataset", PIV.ImageVelocimetryDataset)
 setattr(PIV, "Image_Velocimetry_Distribution", PIV.ImageVelocimetryDistribution)
 setattr(PIV, "image_velocimetry_method", PIV.ImageVelocimetryMethod)
+setattr(PIV, "interpolation", PIV.Interpolation)
 setattr(PIV, "interrogation_method", PIV.InterrogationMethod)
 setattr(PIV, "laser", PIV.Laser)
+setattr(PIV, "left_right_flip", PIV.LeftRightFlip)
 setattr(PIV, "lens", PIV.Lens)
 setattr(PIV, "lens_system", PIV.LensSystem)
 setattr(PIV, "light_source", PIV.LightSource)
+setattr(PIV, "Mask", PIV.Mask)
+setattr(PIV, "millimeter_per_pixel", PIV.MilliM_PER_PIXEL)
 setattr(PIV, "minimum_intensity_background_subtraction_method", PIV.MinimumIntensityBackgroundSubtractionMethod)
 setattr(PIV, "multigrid", PIV.Multigrid)
 setattr(PIV, "multipass", PIV.Multipass)
@@ -147,6 +174,8 @@ setattr(PIV, "optic_sensor", PIV.OpticSensor)
 setattr(PIV, "optical_component", PIV.OpticalComponent)
 setattr(PIV, "Outlier_detection_method", PIV.OutlierDetectionMethod)
 setattr(PIV, "Outlier_replacement_scheme", PIV.OutlierReplacementScheme)
+setattr(PIV, "per_pixel", PIV.PER_PIXEL)
+setattr(PIV, "Particle_Image_Velocimetry", PIV.PIV)
 setattr(PIV, "PIV_Analysis", PIV.PIVAnalysis)
 setattr(PIV, "PIV_background_generation", PIV.PIVBackgroundGeneration)
 setattr(PIV, "PIV_calibration", PIV.PIVCalibration)
@@ -160,72 +189,166 @@ setattr(PIV, "PIV_pre_processing", PIV.PIVPreProcessing)
 setattr(PIV, "PIV_Processing_step", PIV.PIVProcessingStep)
 setattr(PIV, "PIV_recording", PIV.PIVRecording)
 setattr(PIV, "PIV_software", PIV.PIVSoftware)
+setattr(PIV, "Particle_Tracking_Velocimetry", PIV.PTV)
 setattr(PIV, "PTV_dataset", PIV.PTVDataset)
 setattr(PIV, "peak_search_method", PIV.PeakSearchMethod)
+setattr(PIV, "processed_image", PIV.ProcessedImage)
+setattr(PIV, "re-evaluate_with_larger_sample", PIV.ReEvaluateWithLargerSample)
+setattr(PIV, "result_data", PIV.ResultData)
 setattr(PIV, "Setup", PIV.Setup)
 setattr(PIV, "singlepass", PIV.Singlepass)
+setattr(PIV, "spatial_resolution", PIV.SpatialResolution)
+setattr(PIV, "split_image", PIV.SplitImage)
+setattr(PIV, "square_window", PIV.SquareWindow)
+setattr(PIV, "synthetic_image", PIV.SyntheticImage)
 setattr(PIV, "synthetic_PIV_particle", PIV.SyntheticPIVParticle)
 setattr(PIV, "temporal_variable", PIV.TemporalVariable)
+setattr(PIV, "top_bottom_flip", PIV.TopBottomFlip)
+setattr(PIV, "try_lower_order_peaks", PIV.TryLowerOrderPeaks)
+setattr(PIV, "Tukey_window", PIV.TukeyWindow)
 setattr(PIV, "virtual_camera", PIV.VirtualCamera)
 setattr(PIV, "virtual_laser", PIV.VirtualLaser)
 setattr(PIV, "virtual_setup", PIV.VirtualSetup)
 setattr(PIV, "virtual_tool", PIV.VirtualTool)
 setattr(PIV, "window_weighting_function", PIV.WindowWeightingFunction)
-setattr(PIV, "has_flag_scheme", PIV.hasFlagScheme)
 setattr(PIV, "allowed_flag", PIV.allowedFlag)
-setattr(PIV, "uses_flag_scheme_type", PIV.usesFlagSchemeType)
-setattr(PIV, "maps_to_flag", PIV.mapsToFlag)
+setattr(PIV, "filename_pattern", PIV.filenamePattern)
+setattr(PIV, "fnumber", PIV.fnumber)
 setattr(PIV, "has_flag_mapping", PIV.hasFlagMapping)
+setattr(PIV, "has_flag_scheme", PIV.hasFlagScheme)
+setattr(PIV, "has_flag_value", PIV.hasFlagValue)
 setattr(PIV, "has_metric", PIV.hasMetric)
 setattr(PIV, "has_PIV_data_type", PIV.hasPIVDataType)
 setattr(PIV, "has_setup", PIV.hasSetup)
 setattr(PIV, "has_window_weighting_function", PIV.hasWindowWeightingFunction)
 setattr(PIV, "is_setup_for", PIV.isSetupFor)
 setattr(PIV, "manufacturer", PIV.manufacturer)
+setattr(PIV, "maps_to_flag", PIV.mapsToFlag)
+setattr(PIV, "mask", PIV.mask)
+setattr(PIV, "meaning", PIV.meaning)
+setattr(PIV, "Micro_Particle_Image_Velocimetry", PIV.microPIV)
 setattr(PIV, "outlier_replacement_scheme", PIV.outlierReplacementScheme)
+setattr(PIV, "time_value", PIV.timeValue)
 setattr(PIV, "uses_acquisition_software", PIV.usesAcquisitionSoftware)
 setattr(PIV, "uses_analysis_software", PIV.usesAnalysisSoftware)
+setattr(PIV, "uses_flag_scheme_type", PIV.usesFlagSchemeType)
 setattr(PIV, "uses_software", PIV.usesSoftware)
-setattr(PIV, "filename_pattern", PIV.filenamePattern)
-setattr(PIV, "fnumber", PIV.fnumber)
-setattr(PIV, "mask", PIV.mask)
-setattr(PIV, "meaning", PIV.meaning)
-setattr(PIV, "has_flag_value", PIV.hasFlagValue)
-setattr(PIV, "time_value", PIV.timeValue)
-setattr(PIV, "blackman_window", PIV.BlackmanWindow)
-setattr(PIV, "DEHS", PIV.DEHS)
-setattr(PIV, "experimental_image", PIV.ExperimentalImage)
-setattr(PIV, "Gaussian_window", PIV.GaussianWindow)
-setattr(PIV, "Hamming_window", PIV.HammingWindow)
-setattr(PIV, "Hann_window", PIV.HannWindow)
-setattr(PIV, "image", PIV.Image)
-setattr(PIV, "image_dewarping", PIV.ImageDewarping)
-setattr(PIV, "image_filtering", PIV.ImageFiltering)
-setattr(PIV, "image_horizontal_flip", PIV.ImageHorizontalFlip)
-setattr(PIV, "interpolation", PIV.Interpolation)
-setattr(PIV, "left_right_flip", PIV.LeftRightFlip)
-setattr(PIV, "Mask", PIV.Mask)
-setattr(PIV, "millimeter_per_pixel", PIV.MilliM_PER_PIXEL)
-setattr(PIV, "per_pixel", PIV.PER_PIXEL)
-setattr(PIV, "Particle_Image_Velocimetry", PIV.PIV)
-setattr(PIV, "Particle_Tracking_Velocimetry", PIV.PTV)
-setattr(PIV, "processed_image", PIV.ProcessedImage)
-setattr(PIV, "re-evaluate_with_larger_sample", PIV.ReEvaluateWithLargerSample)
-setattr(PIV, "result_data", PIV.ResultData)
-setattr(PIV, "spatial_resolution", PIV.SpatialResolution)
-setattr(PIV, "split_image", PIV.SplitImage)
-setattr(PIV, "square_window", PIV.SquareWindow)
-setattr(PIV, "synthetic_image", PIV.SyntheticImage)
-setattr(PIV, "top_bottom_flip", PIV.TopBottomFlip)
-setattr(PIV, "try_lower_order_peaks", PIV.TryLowerOrderPeaks)
-setattr(PIV, "Tukey_window", PIV.TukeyWindow)
-setattr(PIV, "Micro_Particle_Image_Velocimetry", PIV.microPIV)
-setattr(PIV, "inactive", PIV.FlagInactive)
-setattr(PIV, "active", PIV.FlagActive)
-setattr(PIV, "masked", PIV.FlagMasked)
-setattr(PIV, "noresult", PIV.FlagNoResult)
-setattr(PIV, "disabled", PIV.FlagDisabled)
-setattr(PIV, "filtered", PIV.FlagFiltered)
-setattr(PIV, "interpolated", PIV.FlagInterpolated)
-setattr(PIV, "replaced", PIV.FlagReplaced)
-setattr(PIV, "manualedit", PIV.FlagManualEdit)
+
+# Pre-built URIRefs of all terms and the reverse lookup IRI -> term (keys are URIRefs)
+PIV_TERMS = MappingProxyType({
+    "BackgroundSubtractionMethod": URIRef("https://matthiasprobst.github.io/pivmeta#BackgroundSubtractionMethod"),
+    "BitwiseFlagScheme": URIRef("https://matthiasprobst.github.io/pivmeta#BitwiseFlagScheme"),
+    "BlackmanWindow": URIRef("https://matthiasprobst.github.io/pivmeta#BlackmanWindow"),
+    "Camera": URIRef("https://matthiasprobst.github.io/pivmeta#Camera"),
+    "CorrelationMethod": URIRef("https://matthiasprobst.github.io/pivmeta#CorrelationMethod"),
+    "DEHS": URIRef("https://matthiasprobst.github.io/pivmeta#DEHS"),
+    "DigitalCamera": URIRef("https://matthiasprobst.github.io/pivmeta#DigitalCamera"),
+    "EnumeratedFlagScheme": URIRef("https://matthiasprobst.github.io/pivmeta#EnumeratedFlagScheme"),
+    "ExperimentalImage": URIRef("https://matthiasprobst.github.io/pivmeta#ExperimentalImage"),
+    "ExperimentalSetup": URIRef("https://matthiasprobst.github.io/pivmeta#ExperimentalSetup"),
+    "Flag": URIRef("https://matthiasprobst.github.io/pivmeta#Flag"),
+    "FlagActive": URIRef("https://matthiasprobst.github.io/pivmeta#FlagActive"),
+    "FlagDisabled": URIRef("https://matthiasprobst.github.io/pivmeta#FlagDisabled"),
+    "FlagFiltered": URIRef("https://matthiasprobst.github.io/pivmeta#FlagFiltered"),
+    "FlagInactive": URIRef("https://matthiasprobst.github.io/pivmeta#FlagInactive"),
+    "FlagInterpolated": URIRef("https://matthiasprobst.github.io/pivmeta#FlagInterpolated"),
+    "FlagManualEdit": URIRef("https://matthiasprobst.github.io/pivmeta#FlagManualEdit"),
+    "FlagMapping": URIRef("https://matthiasprobst.github.io/pivmeta#FlagMapping"),
+    "FlagMasked": URIRef("https://matthiasprobst.github.io/pivmeta#FlagMasked"),
+    "FlagNoResult": URIRef("https://matthiasprobst.github.io/pivmeta#FlagNoResult"),
+    "FlagReplaced": URIRef("https://matthiasprobst.github.io/pivmeta#FlagReplaced"),
+    "FlagScheme": URIRef("https://matthiasprobst.github.io/pivmeta#FlagScheme"),
+    "FlagSchemeType": URIRef("https://matthiasprobst.github.io/pivmeta#FlagSchemeType"),
+    "GaussianWindow": URIRef("https://matthiasprobst.github.io/pivmeta#GaussianWindow"),
+    "HammingWindow": URIRef("https://matthiasprobst.github.io/pivmeta#HammingWindow"),
+    "HannWindow": URIRef("https://matthiasprobst.github.io/pivmeta#HannWindow"),
+    "Image": URIRef("https://matthiasprobst.github.io/pivmeta#Image"),
+    "ImageDewarping": URIRef("https://matthiasprobst.github.io/pivmeta#ImageDewarping"),
+    "ImageFiltering": URIRef("https://matthiasprobst.github.io/pivmeta#ImageFiltering"),
+    "ImageHorizontalFlip": URIRef("https://matthiasprobst.github.io/pivmeta#ImageHorizontalFlip"),
+    "ImageManipulationMethod": URIRef("https://matthiasprobst.github.io/pivmeta#ImageManipulationMethod"),
+    "ImageVelocimetryDataset": URIRef("https://matthiasprobst.github.io/pivmeta#ImageVelocimetryDataset"),
+    "ImageVelocimetryDistribution": URIRef("https://matthiasprobst.github.io/pivmeta#ImageVelocimetryDistribution"),
+    "ImageVelocimetryMethod": URIRef("https://matthiasprobst.github.io/pivmeta#ImageVelocimetryMethod"),
+    "Interpolation": URIRef("https://matthiasprobst.github.io/pivmeta#Interpolation"),
+    "InterrogationMethod": URIRef("https://matthiasprobst.github.io/pivmeta#InterrogationMethod"),
+    "Laser": URIRef("https://matthiasprobst.github.io/pivmeta#Laser"),
+    "LeftRightFlip": URIRef("https://matthiasprobst.github.io/pivmeta#LeftRightFlip"),
+    "Lens": URIRef("https://matthiasprobst.github.io/pivmeta#Lens"),
+    "LensSystem": URIRef("https://matthiasprobst.github.io/pivmeta#LensSystem"),
+    "LightSource": URIRef("https://matthiasprobst.github.io/pivmeta#LightSource"),
+    "Mask": URIRef("https://matthiasprobst.github.io/pivmeta#Mask"),
+    "MilliM_PER_PIXEL": URIRef("https://matthiasprobst.github.io/pivmeta#MilliM_PER_PIXEL"),
+    "MinimumIntensityBackgroundSubtractionMethod": URIRef("https://matthiasprobst.github.io/pivmeta#MinimumIntensityBackgroundSubtractionMethod"),
+    "Multigrid": URIRef("https://matthiasprobst.github.io/pivmeta#Multigrid"),
+    "Multipass": URIRef("https://matthiasprobst.github.io/pivmeta#Multipass"),
+    "Objective": URIRef("https://matthiasprobst.github.io/pivmeta#Objective"),
+    "OpticSensor": URIRef("https://matthiasprobst.github.io/pivmeta#OpticSensor"),
+    "OpticalComponent": URIRef("https://matthiasprobst.github.io/pivmeta#OpticalComponent"),
+    "OutlierDetectionMethod": URIRef("https://matthiasprobst.github.io/pivmeta#OutlierDetectionMethod"),
+    "OutlierReplacementScheme": URIRef("https://matthiasprobst.github.io/pivmeta#OutlierReplacementScheme"),
+    "PER_PIXEL": URIRef("https://matthiasprobst.github.io/pivmeta#PER_PIXEL"),
+    "PIV": URIRef("https://matthiasprobst.github.io/pivmeta#PIV"),
+    "PIVAnalysis": URIRef("https://matthiasprobst.github.io/pivmeta#PIVAnalysis"),
+    "PIVBackgroundGeneration": URIRef("https://matthiasprobst.github.io/pivmeta#PIVBackgroundGeneration"),
+    "PIVCalibration": URIRef("https://matthiasprobst.github.io/pivmeta#PIVCalibration"),
+    "PIVDataType": URIRef("https://matthiasprobst.github.io/pivmeta#PIVDataType"),
+    "PIVDataset": URIRef("https://matthiasprobst.github.io/pivmeta#PIVDataset"),
+    "PIVEvaluation": URIRef("https://matthiasprobst.github.io/pivmeta#PIVEvaluation"),
+    "PIVMaskGeneration": URIRef("https://matthiasprobst.github.io/pivmeta#PIVMaskGeneration"),
+    "PIVParticle": URIRef("https://matthiasprobst.github.io/pivmeta#PIVParticle"),
+    "PIVPostProcessing": URIRef("https://matthiasprobst.github.io/pivmeta#PIVPostProcessing"),
+    "PIVPreProcessing": URIRef("https://matthiasprobst.github.io/pivmeta#PIVPreProcessing"),
+    "PIVProcessingStep": URIRef("https://matthiasprobst.github.io/pivmeta#PIVProcessingStep"),
+    "PIVRecording": URIRef("https://matthiasprobst.github.io/pivmeta#PIVRecording"),
+    "PIVSoftware": URIRef("https://matthiasprobst.github.io/pivmeta#PIVSoftware"),
+    "PTV": URIRef("https://matthiasprobst.github.io/pivmeta#PTV"),
+    "PTVDataset": URIRef("https://matthiasprobst.github.io/pivmeta#PTVDataset"),
+    "PeakSearchMethod": URIRef("https://matthiasprobst.github.io/pivmeta#PeakSearchMethod"),
+    "ProcessedImage": URIRef("https://matthiasprobst.github.io/pivmeta#ProcessedImage"),
+    "ReEvaluateWithLargerSample": URIRef("https://matthiasprobst.github.io/pivmeta#ReEvaluateWithLargerSample"),
+    "ResultData": URIRef("https://matthiasprobst.github.io/pivmeta#ResultData"),
+    "Setup": URIRef("https://matthiasprobst.github.io/pivmeta#Setup"),
+    "Singlepass": URIRef("https://matthiasprobst.github.io/pivmeta#Singlepass"),
+    "SpatialResolution": URIRef("https://matthiasprobst.github.io/pivmeta#SpatialResolution"),
+    "SplitImage": URIRef("https://matthiasprobst.github.io/pivmeta#SplitImage"),
+    "SquareWindow": URIRef("https://matthiasprobst.github.io/pivmeta#SquareWindow"),
+    "SyntheticImage": URIRef("https://matthiasprobst.github.io/pivmeta#SyntheticImage"),
+    "SyntheticPIVParticle": URIRef("https://matthiasprobst.github.io/pivmeta#SyntheticPIVParticle"),
+    "TemporalVariable": URIRef("https://matthiasprobst.github.io/pivmeta#TemporalVariable"),
+    "TopBottomFlip": URIRef("https://matthiasprobst.github.io/pivmeta#TopBottomFlip"),
+    "TryLowerOrderPeaks": URIRef("https://matthiasprobst.github.io/pivmeta#TryLowerOrderPeaks"),
+    "TukeyWindow": URIRef("https://matthiasprobst.github.io/pivmeta#TukeyWindow"),
+    "VirtualCamera": URIRef("https://matthiasprobst.github.io/pivmeta#VirtualCamera"),
+    "VirtualLaser": URIRef("https://matthiasprobst.github.io/pivmeta#VirtualLaser"),
+    "VirtualSetup": URIRef("https://matthiasprobst.github.io/pivmeta#VirtualSetup"),
+    "VirtualTool": URIRef("https://matthiasprobst.github.io/pivmeta#VirtualTool"),
+    "WindowWeightingFunction": URIRef("https://matthiasprobst.github.io/pivmeta#WindowWeightingFunction"),
+    "allowedFlag": URIRef("https://matthiasprobst.github.io/pivmeta#allowedFlag"),
+    "filenamePattern": URIRef("https://matthiasprobst.github.io/pivmeta#filenamePattern"),
+    "fnumber": URIRef("https://matthiasprobst.github.io/pivmeta#fnumber"),
+    "hasFlagMapping": URIRef("https://matthiasprobst.github.io/pivmeta#hasFlagMapping"),
+    "hasFlagScheme": URIRef("https://matthiasprobst.github.io/pivmeta#hasFlagScheme"),
+    "hasFlagValue": URIRef("https://matthiasprobst.github.io/pivmeta#hasFlagValue"),
+    "hasMetric": URIRef("https://matthiasprobst.github.io/pivmeta#hasMetric"),
+    "hasPIVDataType": URIRef("https://matthiasprobst.github.io/pivmeta#hasPIVDataType"),
+    "hasSetup": URIRef("https://matthiasprobst.github.io/pivmeta#hasSetup"),
+    "hasWindowWeightingFunction": URIRef("https://matthiasprobst.github.io/pivmeta#hasWindowWeightingFunction"),
+    "isSetupFor": URIRef("https://matthiasprobst.github.io/pivmeta#isSetupFor"),
+    "manufacturer": URIRef("https://matthiasprobst.github.io/pivmeta#manufacturer"),
+    "mapsToFlag": URIRef("https://matthiasprobst.github.io/pivmeta#mapsToFlag"),
+    "mask": URIRef("https://matthiasprobst.github.io/pivmeta#mask"),
+    "meaning": URIRef("https://matthiasprobst.github.io/pivmeta#meaning"),
+    "microPIV": URIRef("https://matthiasprobst.github.io/pivmeta#microPIV"),
+    "outlierReplacementScheme": URIRef("https://matthiasprobst.github.io/pivmeta#outlierReplacementScheme"),
+    "timeValue": URIRef("https://matthiasprobst.github.io/pivmeta#timeValue"),
+    "usesAcquisitionSoftware": URIRef("https://matthiasprobst.github.io/pivmeta#usesAcquisitionSoftware"),
+    "usesAnalysisSoftware": URIRef("https://matthiasprobst.github.io/pivmeta#usesAnalysisSoftware"),
+    "usesFlagSchemeType": URIRef("https://matthiasprobst.github.io/pivmeta#usesFlagSchemeType"),
+    "usesSoftware": URIRef("https://matthiasprobst.github.io/pivmeta#usesSoftware"),
+})
+PIV_TERM_OF_IRI = MappingProxyType({iri: term for term, iri in PIV_TERMS.items()})
+
+for _term, _iri in PIV_TERMS.items():
+    setattr(PIV, _term, _iri)
+del _term, _iri
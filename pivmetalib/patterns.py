@@ -0,0 +1,158 @@
+"""Expansion and matching of filename patterns (piv:filenamePattern).
+
+A pattern is a Python format string with a single integer field holding the
+frame index, e.g. ``image_{:04d}.tif`` or ``raw/img_{}.png``. Supported
+format specifications are ``d`` and zero padding (``0<width>d``). Patterns
+given as regular expressions (e.g. ``^C\\d{3}_\\d.tif$``) have no frame index
+field and are rejected with a ValueError.
+"""
+import functools
+import os
+import pathlib
+import re
+import string
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+_FORMAT_SPEC = re.compile(r'^(?:0(\d+))?d?$')
+
+
+@dataclass(frozen=True)
+class FilenamePattern:
+    """A compiled filename pattern (see `compile_pattern`)"""
+    pattern: str
+    directory: str  # directory part of the pattern ('' if none)
+    regex: re.Pattern  # matches the name of a file and captures the frame index
+    line_regex: re.Pattern  # the same for names joined by line breaks
+
+    def format(self, index: int) -> str:
+        return self.pattern.format(index)
+
+    def match(self, name: str) -> Optional[int]:
+        """Return the frame index of a filename (without directory) or None"""
+        m = self.regex.fullmatch(name)
+        return int(m.group(1)) if m else None
+
+
+@functools.lru_cache(maxsize=256)
+def compile_pattern(pattern: str) -> FilenamePattern:
+    """Compile a filename pattern into a regular expression matching the
+    filenames, which `pattern.format(index)` returns for non-negative indices.
+
+    Raises
+    ------
+    ValueError
+        If the pattern does not contain exactly one supported integer field
+    """
+    directory, name = os.path.split(pattern.replace('\\', '/'))
+    parts, n_fields = [], 0
+    for literal, field_name, format_spec, conversion in string.Formatter().parse(name):
+        parts.append(re.escape(literal))
+        if field_name is None:
+            continue
+        n_fields += 1
+        spec = _FORMAT_SPEC.match(format_spec or '')
+        if field_name not in ('', '0') or conversion or spec is None:
+            field = f'{field_name}!{conversion}' if conversion else field_name
+            field = f'{field}:{format_spec}' if format_spec else field
+            raise ValueError(f'Unsupported field "{{{field}}}" in filename pattern "{pattern}"')
+        width = int(spec.group(1) or 1)
+        if width > 1:
+            # exactly `width` digits or more digits without leading zero, as written by "{:0<width>d}"
+            parts.append(rf'(\d{{{width}}}|[1-9]\d{{{width},}})')
+        else:
+            parts.append(r'(0|[1-9]\d*)')
+    if n_fields != 1:
+        raise ValueError(f'Filename pattern "{pattern}" must contain exactly one field for the frame index')
+    if directory and '{' in directory:
+        raise ValueError(f'The frame index must be part of the filename, not the directory: "{pattern}"')
+    regex = ''.join(parts)
+    return FilenamePattern(pattern=pattern, directory=directory, regex=re.compile(regex),
+                           line_regex=re.compile(f'^{regex}$', re.MULTILINE))
+
+
+def expand_pattern(pattern: str, start: int, stop: int, step: int = 1) -> List[str]:
+    """Return the filenames of the frames `range(start, stop, step)`"""
+    compile_pattern(pattern)  # validate
+    return list(map(pattern.format, range(start, stop, step)))
+
+
+@dataclass
+class FrameScan:
+    """Result of scanning a directory for the frames of a filename pattern"""
+    pattern: str
+    directory: pathlib.Path
+    indices: np.ndarray  # sorted indices of the existing frames
+    start: int  # first expected frame index
+    stop: int  # end of the expected frame indices (exclusive)
+
+    @property
+    def missing(self) -> np.ndarray:
+        """Indices of the missing frames in [start, stop)"""
+        return np.setdiff1d(np.arange(self.start, self.stop, dtype=np.int64), self.indices, assume_unique=True)
+
+    @property
+    def gaps(self) -> List[Tuple[int, int]]:
+        """Ranges (start, stop) of consecutive missing frames in [start, stop)"""
+        indices = self.indices[(self.indices >= self.start) & (self.indices < self.stop)]
+        bounds = np.concatenate(([self.start - 1], indices, [self.stop]))
+        jumps = np.flatnonzero(np.diff(bounds) > 1)
+        return [(int(bounds[i]) + 1, int(bounds[i + 1])) for i in jumps]
+
+    @property
+    def complete(self) -> bool:
+        return not self.gaps
+
+    def filenames(self) -> List[pathlib.Path]:
+        """Paths of the existing frames"""
+        pattern = self.pattern.replace('\\', '/')
+        return [self.directory / pattern.format(int(i)) for i in self.indices]
+
+
+def scan_pattern(pattern: str,
+                 directory: Union[str, pathlib.Path] = '.',
+                 start: Optional[int] = None,
+                 stop: Optional[int] = None) -> FrameScan:
+    """Find the existing frames of a filename pattern in a directory.
+
+    The directory is listed once (`os.scandir`) and all file names are
+    matched in a single pass of the compiled pattern. Files and directories
+    are told apart by the type reported with the listing, so files are
+    usually not `stat`-ed.
+
+    Parameters
+    ----------
+    pattern: str
+        The filename pattern, e.g. "image_{:04d}.tif". A directory part of
+        the pattern is relative to `directory`.
+    directory: str or pathlib.Path
+        The directory to scan
+    start: int=None
+        First expected frame index. Defaults to the smallest found index.
+    stop: int=None
+        End of the expected frame indices (exclusive). Defaults to the
+        largest found index + 1.
+
+    Returns
+    -------
+    FrameScan
+        The found frame indices and the missing frames (`missing`, `gaps`)
+    """
+    compiled = compile_pattern(pattern)
+    directory = pathlib.Path(directory)
+    scan_directory = directory / compiled.directory if compiled.directory else directory
+    with os.scandir(scan_directory) as it:
+        names = [entry.name for entry in it if entry.is_file()]
+    text = '\n'.join(names)
+    if text.count('\n') == max(len(names) - 1, 0):
+        indices = list(map(int, compiled.line_regex.findall(text)))
+    else:  # a filename contains a line break
+        indices = [i for i in map(compiled.match, names) if i is not None]
+    indices = np.unique(np.array(indices, dtype=np.int64))
+    if start is None:
+        start = int(indices[0]) if indices.size else 0
+    if stop is None:
+        stop = int(indices[-1]) + 1 if indices.size else start
+    return FrameScan(pattern=pattern, directory=directory, indices=indices, start=start, stop=stop)
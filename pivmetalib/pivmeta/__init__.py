@@ -1,41 +1,106 @@
-from .distribution import (ImageVelocimetryDistribution,
-                           PIVDataType,
-                           ImageVelocimetryDataset
-                           )
-from .method import (ImageManipulationMethod,
-                     InterrogationMethod,
-                     CorrelationMethod,
-                     OutlierDetectionMethod,
-                     Singlepass,
-                     Multipass,
-                     Multigrid,
-                     WindowWeightingFunction
-                     )
-from .pivsetup import (Setup, VirtualSetup, ExperimentalSetup)
-from .processingstep import (PIVProcessingStep,
-                             PIVMaskGeneration,
-                             PIVPreProcessing,
-                             PIVPostProcessing,
-                             PIVEvaluation,
-                             PIVBackgroundGeneration)
-from .tool import (PIVSoftware,
-                   DigitalCamera,
-                   Laser,
-                   NdYAGLaser,
-                   VirtualLaser,
-                   VirtualCamera,
-                   PIVParticle,
-                   SyntheticPIVParticle,
-                   Objective,
-                   Lens,
-                   LensSystem,
-                   Camera,
-                   LightSource,
-                   LightSource,
-                   OpticSensor,
-                   OpticalComponent)
-from .variable import TemporalVariable, Flag, FlagMapping, FlagScheme, FlagSchemeType, BitwiseFlagScheme, \
-    EnumeratedFlagScheme
+# The classes are imported from their modules on first access (see __getattr__),
+# so that importing a single class does not import all modules and their dependencies.
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .distribution import (ImageVelocimetryDistribution,
+                               PIVDataType,
+                               ImageVelocimetryDataset
+                               )
+    from .method import (ImageManipulationMethod,
+                         InterrogationMethod,
+                         CorrelationMethod,
+                         OutlierDetectionMethod,
+                         Singlepass,
+                         Multipass,
+                         Multigrid,
+                         WindowWeightingFunction
+                         )
+    from .pivsetup import (Setup, VirtualSetup, ExperimentalSetup)
+    from .processingstep import (PIVProcessingStep,
+                                 PIVMaskGeneration,
+                                 PIVPreProcessing,
+                                 PIVPostProcessing,
+                                 PIVEvaluation,
+                                 PIVBackgroundGeneration)
+    from .tool import (PIVSoftware,
+                       DigitalCamera,
+                       Laser,
+                       NdYAGLaser,
+                       VirtualLaser,
+                       VirtualCamera,
+                       PIVParticle,
+                       SyntheticPIVParticle,
+                       Objective,
+                       Lens,
+                       LensSystem,
+                       Camera,
+                       LightSource,
+                       LightSource,
+                       OpticSensor,
+                       OpticalComponent)
+    from .variable import TemporalVariable, Flag, FlagMapping, FlagScheme, FlagSchemeType, BitwiseFlagScheme, \
+        EnumeratedFlagScheme
+
+_MODULE_OF_CLASS = {
+    'ImageVelocimetryDistribution': 'distribution',
+    'PIVDataType': 'distribution',
+    'ImageVelocimetryDataset': 'distribution',
+    'ImageManipulationMethod': 'method',
+    'InterrogationMethod': 'method',
+    'CorrelationMethod': 'method',
+    'OutlierDetectionMethod': 'method',
+    'Singlepass': 'method',
+    'Multipass': 'method',
+    'Multigrid': 'method',
+    'WindowWeightingFunction': 'method',
+    'Setup': 'pivsetup',
+    'VirtualSetup': 'pivsetup',
+    'ExperimentalSetup': 'pivsetup',
+    'PIVProcessingStep': 'processingstep',
+    'PIVMaskGeneration': 'processingstep',
+    'PIVPreProcessing': 'processingstep',
+    'PIVPostProcessing': 'processingstep',
+    'PIVEvaluation': 'processingstep',
+    'PIVBackgroundGeneration': 'processingstep',
+    'PIVSoftware': 'tool',
+    'DigitalCamera': 'tool',
+    'Laser': 'tool',
+    'NdYAGLaser': 'tool',
+    'VirtualLaser': 'tool',
+    'VirtualCamera': 'tool',
+    'PIVParticle': 'tool',
+    'SyntheticPIVParticle': 'tool',
+    'Objective': 'tool',
+    'Lens': 'tool',
+    'LensSystem': 'tool',
+    'Camera': 'tool',
+    'LightSource': 'tool',
+    'OpticSensor': 'tool',
+    'OpticalComponent': 'tool',
+    'TemporalVariable': 'variable',
+    'Flag': 'variable',
+    'FlagMapping': 'variable',
+    'FlagScheme': 'variable',
+    'FlagSchemeType': 'variable',
+    'BitwiseFlagScheme': 'variable',
+    'EnumeratedFlagScheme': 'variable',
+}
+
+
+def __getattr__(name: str):
+    module_name = _MODULE_OF_CLASS.get(name, None)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_MODULE_OF_CLASS})
+
 
 __all__ = ('TemporalVariable',
            'Flag',
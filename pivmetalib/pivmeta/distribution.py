@@ -1,3 +1,4 @@
+import pathlib
 from typing import List
 from typing import Union, Optional
 
@@ -9,6 +10,8 @@ from ssnolib.m4i import NumericalVariable
 from ssnolib.pimsii import Variable
 
 from pivmetalib.dcat import Dataset, Distribution
+from pivmetalib.download import download_distributions, DownloadResult
+from pivmetalib.patterns import FrameScan, expand_pattern, scan_pattern
 from .variable import FlagScheme
 
 
@@ -58,6 +61,26 @@ class ImageVelocimetryDistribution(Distribution):
     def _hasPIVDataType(cls, dist_type):
         return str(HttpUrl(dist_type))
 
+    def _get_filename_pattern(self) -> str:
+        if self.filenamePattern is None:
+            raise ValueError(f'No filenamePattern defined for {self}')
+        return self.filenamePattern
+
+    def expand_filenames(self, start: int, stop: int, step: int = 1) -> List[str]:
+        """Return the filenames of the frames `range(start, stop, step)` of the filenamePattern"""
+        return expand_pattern(self._get_filename_pattern(), start, stop, step)
+
+    def scan_frames(self,
+                    directory: Union[str, pathlib.Path] = '.',
+                    start: Optional[int] = None,
+                    stop: Optional[int] = None) -> FrameScan:
+        """Find the existing frames of the filenamePattern in a directory.
+
+        See `pivmetalib.patterns.scan_pattern` for the parameters. The
+        returned `FrameScan` holds the found frame indices and the gaps.
+        """
+        return scan_pattern(self._get_filename_pattern(), directory, start=start, stop=stop)
+
 
 @namespaces(piv="https://matthiasprobst.github.io/pivmeta#",
             dcat="http://www.w3.org/ns/dcat#")
@@ -74,6 +97,27 @@ class ImageVelocimetryDataset(Dataset):
         alias='has_flag_scheme'
     )
 
+    def download_all(self,
+                     target_folder: Union[str, pathlib.Path] = None,
+                     max_workers: int = 8,
+                     verify_checksums: bool = True,
+                     **kwargs) -> List[DownloadResult]:
+        """Download the files of all distributions concurrently.
+
+        See `pivmetalib.download.download_distributions` for the parameters.
+        Returns one `DownloadResult` per distribution.
+        """
+        distributions = self.distribution
+        if distributions is None:
+            return []
+        if not isinstance(distributions, list):
+            distributions = [distributions]
+        return download_distributions(distributions,
+                                      target_folder=target_folder,
+                                      max_workers=max_workers,
+                                      verify_checksums=verify_checksums,
+                                      **kwargs)
+
 
 ImageVelocimetryDistribution.model_rebuild()
 ImageVelocimetryDataset.model_rebuild()
@@ -1,11 +1,15 @@
 from datetime import datetime, date
-from typing import Optional, Union, List
+from types import MappingProxyType
+from typing import Optional, Union, List, Dict
 
+import numpy as np
 from ontolutils import namespaces, urirefs, Thing
 from ontolutils.ex.m4i import TextVariable
-from pydantic import Field, NonNegativeInt
+from pydantic import Field, NonNegativeInt, PrivateAttr
 from ssnolib.m4i import NumericalVariable
 
+from pivmetalib._flags import FlagLookupTable
+
 
 @namespaces(piv="https://matthiasprobst.github.io/pivmeta#")
 @urirefs(TemporalVariable='piv:TemporalVariable',
@@ -90,28 +94,142 @@ class FlagScheme(Thing):
         description="Explicit value-to-flag mappings (useful for enumerations and lookups)."
     )
 
+    _compiled: Optional[FlagLookupTable] = PrivateAttr(default=None)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if not name.startswith('_'):
+            # any field change invalidates the compiled lookup tables
+            self._compiled = None
+
+    def __copy__(self):
+        # model_copy(update=...) bypasses __setattr__, so copies never share the tables
+        copied = super().__copy__()
+        copied.__pydantic_private__['_compiled'] = None
+        return copied
+
+    def __deepcopy__(self, memo=None):
+        compiled = self.__pydantic_private__.get('_compiled')
+        self.__pydantic_private__['_compiled'] = None  # the tables are not copied
+        try:
+            return super().__deepcopy__(memo)
+        finally:
+            self.__pydantic_private__['_compiled'] = compiled
+
+    def __getstate__(self):
+        # the tables are rebuilt on first use after unpickling
+        state = super().__getstate__()
+        private = state.get('__pydantic_private__')
+        if private and private.get('_compiled') is not None:
+            state['__pydantic_private__'] = {**private, '_compiled': None}
+        return state
+
+    def compile(self) -> FlagLookupTable:
+        """Return the lookup tables of this scheme, building them on first use.
+
+        The tables are rebuilt after any field assignment and are neither
+        shared with copies (`model_copy`) nor pickled. In-place changes
+        (e.g. appending to `allowedFlag`) are not detected; reassign the
+        field in that case.
+        """
+        # read the private storage directly, attribute access through the
+        # ontolutils/pydantic __getattr__ would dominate the lookup cost
+        compiled = self.__pydantic_private__.get('_compiled')
+        if compiled is None:
+            compiled = _compile_flag_scheme(self)
+            self._compiled = compiled
+        return compiled
+
     def get_flags(self, mask: int) -> List[Flag]:
-        if self.usesFlagSchemeType is None:
-            raise ValueError("Flag scheme type is not defined.")
-        scheme_type = self.usesFlagSchemeType
-        if isinstance(scheme_type, BitwiseFlagScheme):
-            out = []
-            for flag in self.allowedFlag or []:
-                if flag.mask is not None and (flag.mask & mask) != 0:
-                    out.append(flag)
-            return out
-        elif isinstance(scheme_type, EnumeratedFlagScheme):
-            out = []
-            for flag in self.allowedFlag or []:
-                if flag.mask == mask:
-                    out.append(flag)
-            mapping = self.hasFlagMapping or []
-            for map_entry in mapping:
-                if map_entry.hasFlagValue == mask and map_entry.mapsToFlag is not None:
-                    out.append(map_entry.mapsToFlag)
-            return out
-        else:
-            raise ValueError("Unknown flag scheme type.")
+        return list(self.compile().lookup(mask))
+
+    def get_flag_masks(self, values: np.ndarray) -> Dict[str, np.ndarray]:
+        """Decode an integer flag array into one boolean array per allowed flag.
+
+        Parameters
+        ----------
+        values: np.ndarray
+            Integer array of flag values (any shape)
+
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            Boolean arrays with the shape of `values`, keyed by the flag label
+            (falls back to the meaning and then the mask value)
+        """
+        compiled = self.compile()
+        values = np.asarray(values)
+        if not np.issubdtype(values.dtype, np.integer):
+            raise TypeError(f"Flag values must be integers, got {values.dtype}.")
+        if compiled.bitwise:
+            return {key: (values & mask) != 0 for key, mask in compiled.key_masks}
+        return {key: np.isin(values, key_values) for key, key_values in compiled.key_values.items()}
+
+    def count_flags(self, values: np.ndarray) -> Dict[str, int]:
+        """Count the occurrences of each allowed flag in an integer flag array."""
+        return {k: int(np.count_nonzero(m)) for k, m in self.get_flag_masks(values).items()}
+
+    def get_flag_labels(self, values: np.ndarray, sep: str = "|") -> np.ndarray:
+        """Return an object array with the flag label(s) of each value.
+
+        Values matching multiple flags (bitwise schemes) get their labels
+        joined by `sep`. Values matching no flag get an empty string.
+        Decoding is done once per unique value, so the cost is dominated
+        by the `np.unique` call rather than by Python-level loops.
+        """
+        values = np.asarray(values)
+        unique_values, inverse = np.unique(values, return_inverse=True)
+        unique_labels = np.array(
+            [sep.join(_flag_key(f) for f in self.get_flags(int(v))) for v in unique_values],
+            dtype=object
+        )
+        return unique_labels[inverse].reshape(values.shape)
+
+
+def _compile_flag_scheme(scheme: FlagScheme) -> FlagLookupTable:
+    """Build the lookup tables of a flag scheme"""
+    scheme_type = scheme.usesFlagSchemeType
+    if scheme_type is None:
+        raise ValueError("Flag scheme type is not defined.")
+    if isinstance(scheme_type, BitwiseFlagScheme):
+        bit_flags = tuple((flag.mask, flag) for flag in scheme.allowedFlag or [] if flag.mask is not None)
+        union_mask = 0
+        for flag_mask, _ in bit_flags:
+            union_mask |= flag_mask
+        return FlagLookupTable(bitwise=True,
+                               key_masks=tuple((_flag_key(flag), flag_mask) for flag_mask, flag in bit_flags),
+                               key_values=MappingProxyType({}),
+                               union_mask=union_mask,
+                               bit_flags=bit_flags)
+    if isinstance(scheme_type, EnumeratedFlagScheme):
+        table = {}
+        key_values = {}
+        for flag in scheme.allowedFlag or []:
+            if flag.mask is not None:
+                table[flag.mask] = table.get(flag.mask, ()) + (flag,)
+                key_values.setdefault(_flag_key(flag), []).append(flag.mask)
+        for map_entry in scheme.hasFlagMapping or []:
+            if map_entry.hasFlagValue is not None and map_entry.mapsToFlag is not None:
+                value = map_entry.hasFlagValue
+                table[value] = table.get(value, ()) + (map_entry.mapsToFlag,)
+                key_values.setdefault(_flag_key(map_entry.mapsToFlag), []).append(value)
+        return FlagLookupTable(bitwise=False,
+                               key_masks=(),
+                               key_values=MappingProxyType({k: tuple(sorted(set(v))) for k, v in key_values.items()}),
+                               union_mask=0,
+                               bit_flags=(),
+                               table=table)
+    raise ValueError("Unknown flag scheme type.")
+
+
+def _flag_key(flag: Flag) -> str:
+    """Return the label of a flag, falling back to its meaning and mask"""
+    label = flag.get_label()
+    if label:
+        return str(label)
+    if flag.meaning:
+        return flag.meaning
+    return str(flag.mask)
 
 
 @namespaces(piv="https://matthiasprobst.github.io/pivmeta#")
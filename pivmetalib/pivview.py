@@ -0,0 +1,351 @@
+"""Reader for PIVview ASCII result files (``.dat``, Tecplot point format).
+
+PIVview writes a ``# ...`` header describing the software, the grid size, the
+variables and the flag legend, e.g. (see ``docs/vp1a.dat``)::
+
+    # Software: PIVTEC PIVview Module - C:/Program Files/PIVtec/pivUtils_386/dpiv.exe
+    # Grid size: 63 horiz.nodes, 59 vert.nodes, 1 depth.nodes
+    # var 4: 'dx' - displacement conponent X in [pixel]
+    # var 6: 'flag' - status flag: 0=Disabled, 1=NoResult, 2=Outlier, 3=ValidData, ...
+
+followed by the Tecplot header (TITLE, VARIABLES, ZONE) and one line of
+numbers per grid node. The header is parsed line by line, the body is
+loaded in one call by the C parser of numpy.
+
+For cataloguing, `harvest` reads only the headers of all result files in a
+directory tree (in a process pool) and returns their metadata.
+"""
+import functools
+import itertools
+import logging
+import pathlib
+import re
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+from ontolutils import parse_unit
+from ssnolib.m4i import NumericalVariable
+
+from .namespace import PIV
+from .pivmeta.distribution import ImageVelocimetryDistribution
+from .pivmeta.processingstep import PIVEvaluation
+from .pivmeta.tool import PIVSoftware
+from .pivmeta.variable import EnumeratedFlagScheme, Flag, FlagScheme
+from .utils import _find_files, _map_chunks, _pool_size
+
+logger = logging.getLogger(__package__)
+
+_CREATION_DATE = re.compile(r'#\s*Creation date:\s*(.*?)\s*$')
+_SOFTWARE = re.compile(r'#\s*Software:\s*(.*?)\s*$')
+_GRID_SIZE = re.compile(r'#\s*Grid size:\s*(\d+)\s*horiz[^,]*,\s*(\d+)\s*vert[^,]*(?:,\s*(\d+)\s*depth)?')
+_VARIABLE = re.compile(r"#\s*var\s+(\d+):\s*'([^']*)'\s*-\s*(.*?)(?:\s+in\s+\[([^\]]*)\])?\s*$")
+_FLAG_LEGEND = re.compile(r'(\d+)\s*=\s*([^,\s]+)')
+_TITLE = re.compile(r'TITLE\s*=\s*"([^"]*)"')
+_VARIABLES = re.compile(r'"([^"]*)"')
+_ZONE_SIZE = re.compile(r'\b([IJK])\s*=\s*(\d+)')
+
+HEADER_BLOCK_SIZE = 4096  # bytes read at once while reading a header
+MAX_HEADER_SIZE = 1024 ** 2  # bytes
+
+
+@dataclass
+class PIVViewVariable:
+    """A variable (column) of a PIVview result file"""
+    name: str
+    description: Optional[str] = None
+    unit: Optional[str] = None
+
+
+@dataclass
+class PIVViewHeader:
+    """Content of the header of a PIVview result file"""
+    creation_date: Optional[str] = None
+    software: Optional[str] = None
+    grid_shape: Optional[Tuple[int, int, int]] = None  # number of nodes in (x, y, z)
+    variables: List[PIVViewVariable] = field(default_factory=list)
+    flags: Dict[int, str] = field(default_factory=dict)  # flag value -> name
+    flag_variable: Optional[str] = None  # name of the variable holding the flags
+    title: Optional[str] = None
+    n_lines: int = 0  # number of lines before the numeric body
+
+    @property
+    def n_nodes(self) -> Optional[int]:
+        if self.grid_shape is None:
+            return None
+        return self.grid_shape[0] * self.grid_shape[1] * self.grid_shape[2]
+
+    @property
+    def variable_names(self) -> List[str]:
+        return [v.name for v in self.variables]
+
+    def to_flag_scheme(self) -> Optional[FlagScheme]:
+        """Return the flag legend as enumerated flag scheme (None if there is no legend)"""
+        if not self.flags:
+            return None
+        description = next((v.description for v in self.variables if v.name == self.flag_variable), None)
+        return FlagScheme(
+            label=description or 'status flag',
+            usesFlagSchemeType=EnumeratedFlagScheme(),
+            allowedFlag=[Flag(label=name, mask=value) for value, name in self.flags.items()]
+        )
+
+    def to_metrics(self) -> List[NumericalVariable]:
+        """Return the variables as numerical variables (used as piv:hasMetric)"""
+        metrics = []
+        for variable in self.variables:
+            kwargs = {'label': variable.name}
+            if variable.description:
+                kwargs['description'] = variable.description
+            unit = _qudt_unit(variable.unit) if variable.unit else None
+            if unit:
+                kwargs['hasUnit'] = unit
+            metrics.append(NumericalVariable(**kwargs))
+        return metrics
+
+    def to_software(self) -> Optional[PIVSoftware]:
+        """Return the software, which wrote the file (None if it is not given)"""
+        if not self.software:
+            return None
+        return PIVSoftware(name=self.software.split(' - ', 1)[0].strip(), description=self.software)
+
+    def to_distribution(self, filename: Union[str, pathlib.Path] = None, **kwargs) -> ImageVelocimetryDistribution:
+        """Return the result file as piv:ImageVelocimetryDistribution with its
+        variables (piv:hasMetric), flag scheme (piv:hasFlagScheme) and the
+        PIV evaluation employing the software, which wrote it (prov:wasGeneratedBy).
+        Keyword arguments are passed to the distribution."""
+        if filename is not None:
+            filename = pathlib.Path(filename)
+            kwargs.setdefault('downloadURL', filename.resolve().as_uri())
+            kwargs.setdefault('byteSize', filename.stat().st_size)
+        if self.title:
+            kwargs.setdefault('title', self.title)
+        kwargs.setdefault('mediaType', 'text/plain')
+        kwargs.setdefault('hasPIVDataType', str(PIV.ResultData))
+        metrics = self.to_metrics()
+        if metrics:
+            kwargs.setdefault('hasMetric', metrics)
+        flag_scheme = self.to_flag_scheme()
+        if flag_scheme is not None:
+            kwargs.setdefault('hasFlagScheme', flag_scheme)
+        if 'wasGeneratedBy' not in kwargs:
+            software = self.to_software()
+            if software is not None:
+                kwargs['wasGeneratedBy'] = PIVEvaluation(hasEmployedTool=software)
+        return ImageVelocimetryDistribution(**kwargs)
+
+
+@functools.lru_cache(maxsize=None)
+def _qudt_unit(unit: str) -> Optional[str]:
+    """Return the QUDT IRI of a unit string or None if it is unknown"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        try:
+            return str(parse_unit(unit))
+        except (KeyError, ValueError):
+            logger.debug(f'Unknown unit "{unit}"')
+            return None
+
+
+def _parse_header_line(header: PIVViewHeader, line: str) -> bool:
+    """Parse a header line into `header`. Returns False if the line is not part of the header."""
+    if line.startswith('#'):
+        match = _VARIABLE.match(line)
+        if match:
+            _, name, description, unit = match.groups()
+            if ':' in description and _FLAG_LEGEND.search(description):
+                description, legend = description.split(':', 1)
+                header.flags = {int(value): flag_name for value, flag_name in _FLAG_LEGEND.findall(legend)}
+                header.flag_variable = name
+            header.variables.append(PIVViewVariable(name=name, description=description.strip() or None,
+                                                    unit=unit or None))
+        elif _GRID_SIZE.match(line):
+            nx, ny, nz = _GRID_SIZE.match(line).groups()
+            header.grid_shape = (int(nx), int(ny), int(nz or 1))
+        elif _SOFTWARE.match(line):
+            header.software = _SOFTWARE.match(line).group(1)
+        elif _CREATION_DATE.match(line):
+            header.creation_date = _CREATION_DATE.match(line).group(1)
+        return True
+    if line.startswith('TITLE'):
+        match = _TITLE.match(line)
+        header.title = match.group(1) if match else None
+        return True
+    if line.startswith('VARIABLES'):
+        if not header.variables:
+            header.variables = [PIVViewVariable(name=name) for name in _VARIABLES.findall(line)]
+        return True
+    if line.startswith('ZONE'):
+        if header.grid_shape is None:
+            size = dict(_ZONE_SIZE.findall(line))
+            header.grid_shape = (int(size.get('I', 1)), int(size.get('J', 1)), int(size.get('K', 1)))
+        return True
+    return False
+
+
+def read_header(filename: Union[str, pathlib.Path], block_size: int = HEADER_BLOCK_SIZE) -> PIVViewHeader:
+    """Read the header of a PIVview result file.
+
+    Only the leading bytes of the file are read (in blocks of `block_size`),
+    so the cost does not depend on the size of the numeric body.
+
+    Raises
+    ------
+    ValueError
+        If no end of the header is found within `MAX_HEADER_SIZE` bytes
+    """
+    header = PIVViewHeader()
+    with open(filename, 'rb', buffering=0) as f:
+        head, start = f.read(block_size), 0
+        while True:
+            end = head.find(b'\n', start)
+            if end < 0:
+                block = f.read(block_size) if f.tell() < MAX_HEADER_SIZE else b''
+                if block:
+                    head, start = head[start:] + block, 0
+                    continue
+                if f.tell() >= MAX_HEADER_SIZE:
+                    raise ValueError(f'No end of the header found in the first {MAX_HEADER_SIZE} bytes '
+                                     f'of {filename}')
+                end = len(head)
+            line = head[start:end]
+            if not _parse_header_line(header, line.decode('latin-1').strip()):
+                break
+            header.n_lines += 1
+            if line.startswith(b'ZONE') or end == len(head):
+                break
+            start = end + 1
+    return header
+
+
+@dataclass
+class PIVViewResult:
+    """Header and data of a PIVview result file"""
+    filename: pathlib.Path
+    header: PIVViewHeader
+    data: np.ndarray  # one row per node, one column per variable
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Return the values of a variable with the shape (nz, ny, nx) of the grid"""
+        try:
+            column = self.header.variable_names.index(name)
+        except ValueError:
+            raise KeyError(f'Unknown variable "{name}". Available: {self.header.variable_names}') from None
+        values = self.data[:, column]
+        if self.header.grid_shape is None:
+            return values
+        nx, ny, nz = self.header.grid_shape
+        return values.reshape(nz, ny, nx)
+
+    @property
+    def flags(self) -> Optional[np.ndarray]:
+        """The flag values as integer array (None if the file has no flag variable)"""
+        if self.header.flag_variable is None:
+            return None
+        return self[self.header.flag_variable].astype(np.int64)
+
+    def to_distribution(self, **kwargs) -> ImageVelocimetryDistribution:
+        """Return the metadata of the file (see `PIVViewHeader.to_distribution`)"""
+        return self.header.to_distribution(self.filename, **kwargs)
+
+
+def read_dat(filename: Union[str, pathlib.Path]) -> PIVViewResult:
+    """Read a PIVview result file.
+
+    Parameters
+    ----------
+    filename: str or pathlib.Path
+        The ``.dat`` file
+
+    Returns
+    -------
+    PIVViewResult
+        The parsed header and the data as (n_nodes, n_variables) float array
+    """
+    filename = pathlib.Path(filename)
+    header = read_header(filename)
+    data = np.loadtxt(filename, dtype=np.float64, skiprows=header.n_lines, max_rows=header.n_nodes, ndmin=2)
+    if header.variables and data.shape[1] != len(header.variables):
+        raise ValueError(f'{filename} has {data.shape[1]} columns but {len(header.variables)} variables '
+                         f'are defined in the header')
+    if header.n_nodes is not None and data.shape[0] != header.n_nodes:
+        raise ValueError(f'{filename} has {data.shape[0]} rows but the grid has {header.n_nodes} nodes')
+    return PIVViewResult(filename=filename, header=header, data=data)
+
+
+@dataclass
+class HarvestResult:
+    """Metadata harvested from the header of a single result file"""
+    filename: pathlib.Path
+    distribution: Optional[ImageVelocimetryDistribution] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def software(self) -> Optional[PIVSoftware]:
+        """The software employed by the evaluation, which generated the file"""
+        if self.distribution is None or self.distribution.wasGeneratedBy is None:
+            return None
+        return self.distribution.wasGeneratedBy.hasEmployedTool
+
+    @property
+    def flag_scheme(self) -> Optional[FlagScheme]:
+        if self.distribution is None:
+            return None
+        return self.distribution.hasFlagScheme
+
+
+def harvest_file(filename: Union[str, pathlib.Path]) -> HarvestResult:
+    """Build the metadata of a result file from its header only"""
+    filename = pathlib.Path(filename)
+    try:
+        header = read_header(filename)
+        return HarvestResult(filename=filename, distribution=header.to_distribution(filename))
+    except (OSError, ValueError) as e:
+        logger.debug(f'Could not harvest {filename}: {e}')
+        return HarvestResult(filename=filename, error=e)
+
+
+def _harvest_chunk(filenames: List[pathlib.Path]) -> List[HarvestResult]:
+    return [harvest_file(filename) for filename in filenames]
+
+
+def harvest(sources: Union[str, pathlib.Path, Iterable[Union[str, pathlib.Path]]],
+            pattern: str = '*.dat',
+            max_workers: int = None,
+            chunk_size: int = 64) -> List[HarvestResult]:
+    """Harvest the metadata of many PIVview result files from their headers.
+
+    Only the header of each file is read (see `read_header`), so the cost
+    per file does not depend on the size of its numeric body. The files are
+    processed in chunks of `chunk_size` in a process pool.
+
+    Parameters
+    ----------
+    sources: str or pathlib.Path or Iterable
+        Directories, which are searched recursively for `pattern`, and/or
+        result files
+    pattern: str
+        Filename pattern of the result files within directories
+    max_workers: int
+        Number of processes. Defaults to the number of CPUs.
+    chunk_size: int
+        Number of files processed per task
+
+    Returns
+    -------
+    List[HarvestResult]
+        One result per file (sorted per directory). Files, which cannot be
+        read, are reported with their `error`.
+    """
+    filenames = _find_files(sources, pattern)
+    max_workers = _pool_size(len(filenames), chunk_size, max_workers)
+    if max_workers == 1:
+        return _harvest_chunk(filenames)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(itertools.chain.from_iterable(_map_chunks(executor, _harvest_chunk, filenames, chunk_size)))
@@ -1,12 +1,158 @@
+import functools
+import json
+import logging
 import pathlib
-from typing import Union, List
+import typing
+from typing import Union, List, Dict, Iterable, Optional, Type, Tuple
 
-from ontolutils import namespaces, urirefs, get_urirefs, dquery
-from pydantic import HttpUrl, AnyUrl, Field
+from ontolutils import namespaces, urirefs, get_urirefs, get_namespaces, dquery, Thing
+from pydantic import HttpUrl, AnyUrl, Field, ValidationError
 
 from ontolutils.ex.prov import Person, Organization
 from ontolutils.ex.schema import SoftwareSourceCode, SoftwareApplication
 
+from ..context import load_context
+from ..utils import _find_files
+
+logger = logging.getLogger('pivmetalib')
+
+CODEMETA_CONTEXT_URL = 'https://raw.githubusercontent.com/codemeta/codemeta/2.0/codemeta.jsonld'
+
+
+def _read_codemeta(filename: Union[str, pathlib.Path]) -> Dict:
+    with open(filename, encoding='utf-8') as f:
+        return json.load(f)
+
+
+# schema.org terms of codemeta and their counterparts in the prov/foaf classes
+# used by the fields of the sd classes (used only if a class has no field or
+# nested class for the schema.org term itself):
+_EQUIVALENT_IRIS = {
+    'https://schema.org/Person': 'http://www.w3.org/ns/prov#Person',
+    'https://schema.org/Organization': 'http://www.w3.org/ns/prov#Organization',
+    'https://schema.org/givenName': 'http://xmlns.com/foaf/0.1/firstName',
+    'https://schema.org/familyName': 'http://xmlns.com/foaf/0.1/lastName',
+    'https://schema.org/email': 'http://xmlns.com/foaf/0.1/mbox',
+    'https://schema.org/name': 'http://xmlns.com/foaf/0.1/name',
+    'https://schema.org/version': 'https://schema.org/softwareVersion',
+}
+
+
+class _Unmapped(Exception):
+    """Raised if a codemeta document cannot be mapped directly onto the fields of a class"""
+
+
+def _expand_term(term: str, context: Dict) -> Optional[str]:
+    """Return the IRI of a codemeta term (schema.org IRIs with https, as used
+    by ontolutils) or None if the term is not defined in the context"""
+    definition = context.get(term)
+    if isinstance(definition, dict):
+        definition = definition.get('@id')
+    if not isinstance(definition, str) or definition.startswith('@'):
+        return None
+    prefix, sep, name = definition.partition(':')
+    if sep and not name.startswith('//'):
+        if not isinstance(context.get(prefix), str):
+            return None
+        definition = f'{context[prefix]}{name}'
+    return definition.replace('http://schema.org/', 'https://schema.org/')
+
+
+@functools.lru_cache(maxsize=None)
+def _fields_by_iri(cls: Type[Thing]) -> Dict[str, str]:
+    """Return {IRI: field name} of the urirefs of a class (including its class name)"""
+    ns = get_namespaces(cls)
+    fields = {}
+    for field, uriref in get_urirefs(cls).items():
+        prefix, name = uriref.split(':', 1)
+        fields[f'{ns[prefix]}{name}'] = field
+    return fields
+
+
+def _class_iri(cls: Type[Thing], name: Optional[str] = None) -> str:
+    uriref = get_urirefs(cls)[name or cls.__name__]
+    prefix, name = uriref.split(':', 1)
+    return f'{get_namespaces(cls)[prefix]}{name}'
+
+
+@functools.lru_cache(maxsize=None)
+def _field_classes(cls: Type[Thing], field: str) -> Dict[str, Type[Thing]]:
+    """Return {class IRI: class} of the Thing classes in the annotation of a field"""
+    model_field = cls.model_fields.get(field)
+    if model_field is None:
+        return {}
+    classes, annotations = {}, [model_field.annotation]
+    while annotations:
+        annotation = annotations.pop()
+        if isinstance(annotation, type) and issubclass(annotation, Thing):
+            classes[_class_iri(annotation)] = annotation
+        annotations.extend(typing.get_args(annotation))
+    return classes
+
+
+def _map_codemeta_value(cls: Type[Thing], field: str, value, context: Dict):
+    if isinstance(value, list):
+        return [_map_codemeta_value(cls, field, v, context) for v in value]
+    if isinstance(value, dict):
+        node_type = value.get('@type')
+        node_cls = None
+        if isinstance(node_type, str):
+            classes, iri = _field_classes(cls, field), _expand_term(node_type, context)
+            node_cls = classes.get(iri) or classes.get(_EQUIVALENT_IRIS.get(iri))
+        if node_cls is None:
+            raise _Unmapped(f'Nested node of type {node_type} of field "{field}"')
+        return _map_codemeta_node(node_cls, value, context)
+    return value
+
+
+def _map_codemeta_node(cls: Type[Thing], node: Dict, context: Dict) -> Thing:
+    fields = _fields_by_iri(cls)
+    kwargs = {}
+    for key, value in node.items():
+        if key in ('@context', '@type'):
+            continue
+        if key == '@id':
+            kwargs['id'] = value
+            continue
+        iri = _expand_term(key, context)
+        if iri is None:
+            raise _Unmapped(f'Unknown term "{key}"')
+        # like the RDF path, properties without field are stored under their local name:
+        field = fields.get(iri) or fields.get(_EQUIVALENT_IRIS.get(iri)) or iri.rsplit('#', 1)[-1].rsplit('/', 1)[-1]
+        kwargs[field] = _map_codemeta_value(cls, field, value, context)
+    return cls(**kwargs)
+
+
+def _from_codemeta(cls: Type[Thing], data: Dict, codemeta_context: Union[Dict, List],
+                   types: Tuple[str, ...] = ()) -> Thing:
+    """Map a codemeta document onto the fields of `cls` using its urirefs.
+
+    The document is parsed as RDF (`from_jsonld`) only if it contains terms
+    unknown to the codemeta context, nested nodes without a matching class
+    or values, which do not validate. `types` are further class IRIs, which
+    are accepted as "@type" of the document.
+
+    Raises
+    ------
+    ValueError
+        If the document (parsed as RDF) does not describe an instance of `cls`
+    """
+    data.pop('@context', None)
+    if isinstance(codemeta_context, dict):
+        try:
+            doc_type = data.get('@type')
+            accepted_types = {_class_iri(cls), *types}
+            if not isinstance(doc_type, str) or _expand_term(doc_type, codemeta_context) not in accepted_types:
+                raise _Unmapped(f'Document type {doc_type}')
+            return _map_codemeta_node(cls, data, codemeta_context)
+        except (_Unmapped, ValidationError) as e:
+            logger.debug(f'Parsing codemeta document as RDF: {e}')
+    data['@context'] = codemeta_context
+    result = cls.from_jsonld(data=json.dumps(data), limit=1)
+    if result is None or isinstance(result, list):
+        raise ValueError(f'The codemeta document does not describe a {cls.__name__}')
+    return result
+
 
 @namespaces(sd="https://w3id.org/okn/o/sd#")
 @urirefs(SourceCode='sd:SourceCode')
@@ -19,28 +165,58 @@ class SourceCode(SoftwareSourceCode):
     """
 
     @classmethod
-    def from_codemeta(cls, filename: Union[str, pathlib.Path]) -> SoftwareSourceCode:
-        """Create a SoftwareSourceCode instance from a codemeta.json file."""
-        import json
-        from ontolutils.classes.utils import download_file
-
-        # get codemeta context file:
-        codemeta_context_file = download_file(
-            'https://raw.githubusercontent.com/codemeta/codemeta/2.0/codemeta.jsonld',
-            None)
-        with open(codemeta_context_file) as f:
-            codemeta_context = json.load(f)['@context']
-
-        with open(filename, encoding='utf-8') as f:
-            data = json.load(f)
-            # ssc = SoftwareSourceCode.from_jsonld(data=data)
-
-        # replace context in data
-        _ = data.pop('@context')
-        data['@context'] = codemeta_context
-
-        return SoftwareSourceCode.from_jsonld(data=json.dumps(data), limit=1)
+    def from_codemeta(cls, filename: Union[str, pathlib.Path],
+                      offline: Optional[bool] = None) -> SoftwareSourceCode:
+        """Create a SoftwareSourceCode instance from a codemeta.json file.
+
+        The codemeta context is taken from the pivmetalib context cache
+        (see `pivmetalib.context.load_context`), so it is downloaded at most
+        once and is available offline afterwards. The keys of the file are
+        mapped directly onto the fields of the class (via its urirefs); only
+        documents with unknown terms or nested nodes, which do not match
+        a field, are parsed as RDF.
+        """
+        codemeta_context = load_context(CODEMETA_CONTEXT_URL, offline=offline)
+        return _from_codemeta(SoftwareSourceCode, _read_codemeta(filename), codemeta_context)
 
+    @classmethod
+    def from_codemeta_many(cls,
+                           sources: Union[str, pathlib.Path, Iterable[Union[str, pathlib.Path]]],
+                           pattern: str = 'codemeta.json',
+                           offline: Optional[bool] = None,
+                           ignore_errors: bool = False) -> Dict[pathlib.Path, SoftwareSourceCode]:
+        """Create SoftwareSourceCode instances from many codemeta.json files.
+
+        The codemeta context is loaded once for all files.
+
+        Parameters
+        ----------
+        sources: str or pathlib.Path or Iterable
+            Directories, which are searched recursively for `pattern`, and/or
+            codemeta files
+        pattern: str
+            Filename pattern of the codemeta files within directories
+        offline: bool=None
+            Never access the network (defaults to the PIVMETALIB_OFFLINE
+            environment variable)
+        ignore_errors: bool
+            Log and skip files, which cannot be read, instead of raising
+
+        Returns
+        -------
+        Dict[pathlib.Path, SoftwareSourceCode]
+            The source code descriptions by filename (in sorted order per directory)
+        """
+        codemeta_context = load_context(CODEMETA_CONTEXT_URL, offline=offline)
+        results = {}
+        for filename in _find_files(sources, pattern):
+            try:
+                results[filename] = _from_codemeta(SoftwareSourceCode, _read_codemeta(filename), codemeta_context)
+            except Exception as e:
+                if not ignore_errors:
+                    raise
+                logger.warning(f'Could not read codemeta file {filename}: {e}')
+        return results
 
 
 @namespaces(schema="https://schema.org/",
@@ -63,3 +239,16 @@ class Software(SoftwareApplication):
     downloadURL: HttpUrl = Field(alias="has_download_URL", default=None)
     author: Union[Person, Organization, List[Union[Person, Organization]]] = Field(default=None)
     hasSourceCode: Union[SourceCode, SoftwareSourceCode] = Field(alias="has_source_code", default=None)
+
+    @classmethod
+    def from_codemeta(cls, filename: Union[str, pathlib.Path],
+                      offline: Optional[bool] = None) -> "Software":
+        """Create a Software instance from a codemeta.json file describing a
+        SoftwareSourceCode or SoftwareApplication (see `SourceCode.from_codemeta`).
+
+        The schema.org persons and organizations of codemeta are mapped onto
+        the prov classes of `author`.
+        """
+        codemeta_context = load_context(CODEMETA_CONTEXT_URL, offline=offline)
+        types = (_class_iri(SoftwareApplication), _class_iri(SoftwareSourceCode))
+        return _from_codemeta(cls, _read_codemeta(filename), codemeta_context, types=types)
@@ -1,47 +1,144 @@
 from __future__ import annotations
 
+import contextlib
+import functools
+import hashlib
+import itertools
+import json
 import logging
+import os
 import pathlib
-from typing import Dict, List, Union, Optional
+import re
+import sys
+import threading
+from collections.abc import MutableMapping
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Dict, IO, Iterable, Iterator, List, Sequence, Union, Optional, Tuple
 
 import appdirs
 import rdflib
 import requests
-from rdflib import Graph, Namespace, URIRef
+from rdflib import Graph, Literal, Namespace, URIRef, RDF
 from rdflib.util import guess_format
 
 logger = logging.getLogger(__package__)
 logger.setLevel('DEBUG')
 
 
+class _ClassEntries(MutableMapping):
+    """Resolved entries of a class returned by `UNManager`.
+
+    Setting (or deleting) an item registers (or unregisters) it for the
+    class. The entries are resolved on first access and again after the
+    class or one of its bases changed.
+    """
+
+    def __init__(self, manager: "UNManager", cls):
+        self._manager = manager
+        self._cls = cls
+        self._entries = None
+
+    def _resolved(self) -> Dict:
+        if self._entries is None:
+            self._entries = self._manager._resolve(self._cls)
+        return self._entries
+
+    def __getitem__(self, key):
+        return self._resolved()[key]
+
+    def __iter__(self):
+        return iter(self._resolved())
+
+    def __len__(self):
+        return len(self._resolved())
+
+    def __setitem__(self, key, value):
+        self._manager.register(self._cls, key, value)
+
+    def __delitem__(self, key):
+        self._manager.unregister(self._cls, key)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self._resolved()!r})'
+
+
 class UNManager:
-    """Manager class for URIRef and Namespace."""
+    """Manager class for URIRef and Namespace.
+
+    Entries registered for a class are inherited by its subclasses. The
+    entries of a class are resolved once along its MRO (the closest class
+    wins) and cached until the class or one of its bases registers new entries.
+    """
 
     def __init__(self):
         self.data = {}
+        self._resolved = {}
+
+    def register(self, cls, key, value):
+        """Register an entry for a class"""
+        self.data.setdefault(cls, {})[key] = value
+        self._invalidate(cls)
+
+    def unregister(self, cls, key):
+        """Remove an entry registered for a class (inherited entries are kept)
+
+        Raises
+        ------
+        KeyError if the entry is not registered for the class itself
+        """
+        entries = self.data.get(cls, {})
+        del entries[key]
+        if not entries:
+            del self.data[cls]
+        self._invalidate(cls)
+
+    def _invalidate(self, cls):
+        """Drop the resolved entries of `cls` and its subclasses"""
+        for resolved_cls, entries in self._resolved.items():
+            if issubclass(resolved_cls, cls):
+                entries._entries = None
+
+    def _resolve(self, cls) -> Dict:
+        entries = {}
+        for base in reversed(cls.__mro__):
+            base_entries = self.data.get(base)
+            if base_entries:
+                entries.update(base_entries)
+        return entries
 
     def __getitem__(self, cls):
-        if cls not in self.data:
-            self.data[cls] = {}
-        # there might be subclass to this cls. get those data as well
-        for k, v in self.data.items():
-            if k != cls:
-                if issubclass(cls, k):
-                    self.data[cls].update(v)
-        return self.data[cls]
-
-
-def split_URIRef(uri: rdflib.URIRef) -> List[Union[str, None]]:
-    """Split a URIRef into namespace and key."""
-    _uri = str(uri)
-    if _uri.startswith('http'):
-        if '#' in _uri:
-            return _uri.rsplit('#', 1)
-        _split = _uri.rsplit('/', 1)
-        return [f'{_split[0]}/', _split[1]]
-    if ':' in _uri:
-        return _uri.rsplit(':', 1)
-    return [None, uri]
+        entries = self._resolved.get(cls)
+        if entries is None:
+            entries = self._resolved[cls] = _ClassEntries(self, cls)
+        return entries
+
+
+@functools.lru_cache(maxsize=8192)
+def _split_uri(uri: str) -> Tuple[Union[str, None], str]:
+    if uri.startswith('http'):
+        if '#' in uri:
+            ns, key = uri.rsplit('#', 1)
+            return sys.intern(ns), key
+        ns, key = uri.rsplit('/', 1)
+        return sys.intern(f'{ns}/'), key
+    if ':' in uri:
+        ns, key = uri.rsplit(':', 1)
+        return sys.intern(ns), key
+    return None, uri
+
+
+def split_URIRef(uri: rdflib.URIRef) -> Tuple[Union[str, None], str]:
+    """Split a URIRef into namespace and key.
+
+    Results are cached and the namespace strings are interned, as the same
+    few hundred IRIs are split over and over again when walking graphs.
+    """
+    return _split_uri(str(uri))
+
+
+def split_URIRefs(uris: Iterable[rdflib.URIRef]) -> List[Tuple[Union[str, None], str]]:
+    """Split many URIRefs into namespace and key (see `split_URIRef`)"""
+    return [_split_uri(str(uri)) for uri in uris]
 
 
 # def merge_jsonld(jsonld_strings: List[str]) -> str:
@@ -75,23 +172,316 @@ def get_cache_dir() -> pathlib.Path:
     return cache_dir
 
 
+def _find_files(sources: Union[str, pathlib.Path, Iterable[Union[str, pathlib.Path]]],
+                pattern: str) -> List[pathlib.Path]:
+    """Return the files of `sources`. Directories are searched recursively
+    for `pattern` (sorted per directory), files are taken as they are."""
+    if isinstance(sources, (str, pathlib.Path)):
+        sources = [sources]
+    filenames = []
+    for source in sources:
+        source = pathlib.Path(source)
+        if source.is_dir():
+            filenames.extend(sorted(source.rglob(pattern)))
+        else:
+            filenames.append(source)
+    return filenames
+
+
+def _pool_size(n_items: int, chunk_size: int, max_workers: Optional[int] = None) -> int:
+    """Return the number of processes for `n_items` processed in chunks of
+    `chunk_size` (at most `max_workers`, defaulting to the number of CPUs)"""
+    n_chunks = -(-n_items // chunk_size)
+    return max(1, min(max_workers or os.cpu_count() or 1, n_chunks))
+
+
+def _map_chunks(executor: Executor, func: Callable, items: Sequence, chunk_size: int, *args) -> Iterator:
+    """Return the results of `func(chunk, *args)` for the consecutive chunks
+    of `items` (in order), computed by `executor`"""
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    return executor.map(func, chunks, *(itertools.repeat(arg) for arg in args))
+
+
+def _sha256_of_file(filename: pathlib.Path, block_size: int = 1024 * 1024) -> str:
+    """Return the SHA-256 hex digest of a file, reading it block by block"""
+    sha256 = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def _print_progress(n_bytes: int, total_size: int):
+    if total_size:
+        sys.stderr.write(f'\r{n_bytes / total_size * 100:5.1f} % ({n_bytes}/{total_size} bytes)')
+    else:
+        sys.stderr.write(f'\r{n_bytes} bytes')
+    if n_bytes == total_size:
+        sys.stderr.write('\n')
+    sys.stderr.flush()
+
+
+def _write_response(response: requests.Response, f, block_size: int, on_block: Callable[[bytes], None]):
+    for block in response.iter_content(chunk_size=block_size):
+        f.write(block)
+        on_block(block)
+
+
+_CONTENT_RANGE = re.compile(r'bytes\s+(\d+)-(\d+)/(\d+|\*)')
+_UNSATISFIED_RANGE = re.compile(r'bytes\s+\*/(\d+)')
+
+
+def _validator_filename(tmp_filename: pathlib.Path) -> pathlib.Path:
+    """Return the file holding the validator of a partial download"""
+    return tmp_filename.with_name(f'{tmp_filename.name}.validator')
+
+
+def _get_validator(response: requests.Response) -> Optional[str]:
+    """Return the validator of a response usable with If-Range (strong ETag or Last-Modified)"""
+    etag = response.headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return response.headers.get('Last-Modified')
+
+
+def _check_content_range(response: requests.Response, url: str, start: int,
+                         end: Optional[int] = None) -> Optional[int]:
+    """Check that a response holds the requested range and return the total size
+    of the file (None if the server reports it as unknown, "*").
+
+    Raises
+    ------
+    HTTPError if the response is not a 206 response starting at `start` (and ending at `end`)
+    """
+    content_range = response.headers.get('Content-Range', '')
+    match = _CONTENT_RANGE.fullmatch(content_range.strip())
+    if response.status_code != 206 or match is None or int(match.group(1)) != start \
+            or (end is not None and int(match.group(2)) != end):
+        raise requests.HTTPError(f'Server did not return the requested range {start}-{"" if end is None else end} '
+                                 f'of {url} (status {response.status_code}, Content-Range "{content_range}")',
+                                 response=response)
+    return None if match.group(3) == '*' else int(match.group(3))
+
+
+def _is_empty_resource(response: requests.Response) -> bool:
+    """Return True if a 416 response reports that the file is empty ("bytes */0")"""
+    match = _UNSATISFIED_RANGE.fullmatch(response.headers.get('Content-Range', '').strip())
+    return response.status_code == 416 and match is not None and int(match.group(1)) == 0
+
+
+def _download_ranges(session: requests.Session,
+                     url: str,
+                     filename: pathlib.Path,
+                     start: int,
+                     total_size: int,
+                     n_connections: int,
+                     block_size: int,
+                     on_block: Callable[[bytes], None],
+                     **kwargs):
+    """Download the bytes from `start` to `total_size` of `url` into the
+    (preallocated) `filename` using `n_connections` concurrent range requests,
+    each writing to its own region of the file."""
+    headers = kwargs.pop('headers', {})
+    range_size = -(-(total_size - start) // n_connections)  # ceil
+    ranges = [(i, min(i + range_size, total_size) - 1) for i in range(start, total_size, range_size)]
+
+    def _download_range(byte_range):
+        range_start, range_end = byte_range
+        with session.get(url, stream=True, headers={**headers, 'Range': f'bytes={range_start}-{range_end}'},
+                         **kwargs) as response:
+            _check_content_range(response, url, range_start, range_end)
+            with open(filename, 'r+b') as f:
+                f.seek(range_start)
+                _write_response(response, f, block_size, on_block)
+                received_end = f.tell()
+            if received_end != range_end + 1:
+                raise requests.ConnectionError(f'Incomplete range {range_start}-{range_end} received from {url}')
+
+    with ThreadPoolExecutor(max_workers=n_connections) as executor:
+        for future in [executor.submit(_download_range, r) for r in ranges]:
+            future.result()
+
+
+def _download(url: str,
+              tmp_filename: pathlib.Path,
+              block_size: int,
+              progress: Union[bool, Callable[[int, int], None]],
+              resume: bool,
+              n_connections: int,
+              session: Optional[requests.Session] = None,
+              **kwargs) -> Tuple[str, str]:
+    """Download `url` into `tmp_filename` and return the SHA-256 of the content
+    and the final URL of the response (after redirects).
+
+    The validator (strong ETag or Last-Modified) of the response is stored
+    next to `tmp_filename`. Only a partial file with a validator is resumed:
+    its range request is sent with If-Range, so the server sends the full
+    content (and the download restarts from zero) if the file has changed.
+    With `n_connections > 1`, the first block is requested as a range as
+    well, whose Content-Range reports the size to split the rest into. If
+    the size is unknown, the file is downloaded in a single stream.
+    """
+    kwargs.pop('stream', None)
+    headers = dict(kwargs.pop('headers', None) or {})
+    if progress is True:
+        progress = _print_progress
+    validator_filename = _validator_filename(tmp_filename)
+    offset = 0
+    request_headers = dict(headers)
+    if resume and n_connections <= 1 and tmp_filename.exists() and validator_filename.exists():
+        offset = tmp_filename.stat().st_size
+        request_headers.update({'Range': f'bytes={offset}-',
+                                'If-Range': validator_filename.read_text(encoding='utf-8')})
+    elif n_connections > 1:
+        request_headers['Range'] = f'bytes=0-{block_size - 1}'
+    with contextlib.nullcontext(session) if session is not None else requests.Session() as session:
+        response = session.get(url, stream=True, headers=request_headers, **kwargs)
+        try:
+            if _is_empty_resource(response):
+                # no range of an empty file can be satisfied
+                tmp_filename.parent.mkdir(parents=True, exist_ok=True)
+                tmp_filename.write_bytes(b'')
+                validator_filename.unlink(missing_ok=True)
+                if progress:
+                    progress(0, 0)
+                return hashlib.sha256().hexdigest(), response.url
+            if response.status_code == 416 and offset:
+                # the partial file is not a prefix of the current content
+                logger.debug(f'Cannot resume download of {url} at byte {offset}. Restarting it.')
+                response.close()
+                tmp_filename.unlink(missing_ok=True)
+                validator_filename.unlink(missing_ok=True)
+                return _download(url, tmp_filename, block_size, progress, resume, n_connections,
+                                 session=session, headers=headers, **kwargs)
+            if not response.ok:
+                response.raise_for_status()
+
+            response_url = response.url
+            validator = _get_validator(response)
+            if response.status_code == 206:
+                total_size = _check_content_range(response, url, offset)
+            else:
+                # full content: the range is not supported or the file has changed
+                offset = 0
+                total_size = int(response.headers.get("content-length", 0))
+
+            sha256 = hashlib.sha256()
+            n_bytes = 0
+            lock = threading.Lock()
+
+            def _on_block(block: bytes, update_hash: bool):
+                nonlocal n_bytes
+                with lock:
+                    if update_hash:
+                        sha256.update(block)
+                    n_bytes += len(block)
+                    if progress:
+                        progress(n_bytes, total_size)
+
+            if n_connections > 1 and response.status_code == 206 and total_size is None:
+                logger.debug(f'Size of {url} is unknown. Downloading it in a single stream.')
+                response.close()
+                return _download(url, tmp_filename, block_size, progress, resume, 1,
+                                 session=session, headers=headers, **kwargs)
+            if total_size is None:
+                total_size = 0
+            if n_connections > 1 and response.status_code == 206:
+                logger.debug(f'Downloading {url} with {n_connections} range requests')
+                try:
+                    with open(tmp_filename, 'wb') as f:
+                        f.truncate(total_size)
+                        _write_response(response, f, block_size, lambda block: _on_block(block, False))
+                        received = f.tell()
+                    response.close()
+                    if received < total_size:
+                        range_headers = {**headers, 'If-Range': validator} if validator else headers
+                        _download_ranges(session, url, tmp_filename, received, total_size, n_connections,
+                                         block_size, lambda block: _on_block(block, False),
+                                         headers=range_headers, **kwargs)
+                except BaseException:
+                    # a partially written parallel download has holes and cannot be resumed
+                    tmp_filename.unlink(missing_ok=True)
+                    raise
+                return _sha256_of_file(tmp_filename, block_size), response_url
+
+            resumable = resume and validator is not None and (
+                    response.status_code == 206 or response.headers.get('Accept-Ranges', '').lower() == 'bytes')
+            if offset:
+                logger.debug(f'Resuming download of {url} at byte {offset}')
+                with open(tmp_filename, 'rb') as f:
+                    for block in iter(lambda: f.read(block_size), b''):
+                        _on_block(block, True)
+            elif resumable:
+                tmp_filename.parent.mkdir(parents=True, exist_ok=True)
+                validator_filename.write_text(validator, encoding='utf-8')
+            else:
+                validator_filename.unlink(missing_ok=True)
+            try:
+                with open(tmp_filename, "ab" if offset else "wb") as f:
+                    _write_response(response, f, block_size, lambda block: _on_block(block, True))
+            except BaseException:
+                if not resumable:
+                    tmp_filename.unlink(missing_ok=True)
+                raise
+            validator_filename.unlink(missing_ok=True)
+            return sha256.hexdigest(), response_url
+        finally:
+            response.close()
+
+
 def download_file(url,
                   dest_filename=None,
                   known_hash=None,
                   overwrite_existing: bool = False,
+                  block_size: int = 1024 * 1024,
+                  progress: Union[bool, Callable[[int, int], None]] = False,
+                  resume: bool = True,
+                  n_connections: int = 1,
+                  session: Optional[requests.Session] = None,
                   **kwargs) -> pathlib.Path:
     """Download a file from a URL and check its hash
+
+    The response is streamed in blocks of `block_size` bytes into a temporary
+    ".part" file, while the SHA-256 is updated on the fly. Only after the
+    download completed (and the hash matched) the temporary file is atomically
+    moved to its destination. Thus, memory usage does not depend on the file
+    size and no partially written file ever appears at the destination.
+
+    Without `dest_filename`, the file is stored in the content-addressed cache
+    (see `pivmetalib.cache`). A URL (or `known_hash`) found in the cache index
+    is returned without any HTTP request, and identical contents are stored
+    only once.
+
+    If the server supports range requests, an interrupted download is resumed
+    from the existing ".part" file (`resume=True`), as long as the file on the
+    server has not changed since (If-Range), and a large file can be split
+    into `n_connections` concurrent range requests.
     
     Parameter
     ---------
     url: str
         The URL of the file to download
     dest_filename: str or pathlib.Path =None
-        The destination filename. If None, the filename is taken from the URL
+        The destination filename. If None, the file is stored in the cache
+        under the filename taken from the URL
     known_hash: str
         The expected hash of the file
     overwrite_existing: bool
-        Whether to overwrite an existing file
+        Whether to overwrite an existing file (or to bypass the cache)
+    block_size: int
+        Number of bytes read from the response and written at once
+    progress: bool or Callable[[int, int], None]
+        If True, the progress is written to stderr. A callable is called
+        with the number of bytes received so far and the total size (0 if
+        the server does not report it).
+    resume: bool
+        Continue from an existing ".part" file instead of starting from zero.
+        Only used for sequential downloads (`n_connections=1`).
+    n_connections: int
+        Number of concurrent range requests. Falls back to a single request
+        if the server does not accept ranges or does not report the size.
+    session: requests.Session=None
+        Session to reuse (pooled connections). A new one is used if None.
     
     Returns
     -------
@@ -103,48 +493,52 @@ def download_file(url,
     HTTPError if the request is not successful
     ValueError if the hash of the downloaded file does not match the expected hash
     """
-    logger.debug(f'Performing request to {url}')
-    response = requests.get(url, **kwargs)
-    if not response.ok:
-        response.raise_for_status()
-
-    content = response.content
+    def _download_checked(tmp_filename: pathlib.Path) -> Tuple[str, str]:
+        logger.debug(f'Performing request to {url}')
+        calculated_hash, response_url = _download(url, tmp_filename, block_size, progress, resume, n_connections,
+                                                  session=session, **kwargs)
+        if known_hash and calculated_hash != known_hash:
+            tmp_filename.unlink()
+            raise ValueError('File does not match the expected hash')
+        return calculated_hash, response_url
 
-    # Calculate the hash of the downloaded content
-    if known_hash:
-        import hashlib
-        calculated_hash = hashlib.sha256(content).hexdigest()
-        if not calculated_hash == known_hash:
-            raise ValueError('File does not match the expected has')
-
-    total_size = int(response.headers.get("content-length", 0))
-    block_size = 1024
-
-    # Save the content to a file
     if dest_filename is None:
-        filename = response.url.rsplit('/', 1)[1]
-        dest_parent = get_cache_dir() / f'{total_size}'
-        dest_filename = dest_parent / filename
-        if dest_filename.exists():
-            logger.debug(f'Taking existing file {dest_filename} and returning it.')
-            return dest_filename
-    else:
-        dest_filename = pathlib.Path(dest_filename)
-    dest_parent = dest_filename.parent
-    if not dest_parent.exists():
-        dest_parent.mkdir(parents=True)
-
+        from .cache import get_file_cache
+        file_cache = get_file_cache()
+        if not overwrite_existing:
+            cached_filename = file_cache.lookup(url, known_hash)
+            if cached_filename is not None:
+                logger.debug(f'Taking cached file {cached_filename} and returning it.')
+                return cached_filename
+        # the partial file of a URL is shared by all processes, only one of them downloads it
+        with file_cache.download_lock(url):
+            if not overwrite_existing:
+                cached_filename = file_cache.lookup(url, known_hash)
+                if cached_filename is not None:
+                    logger.debug(f'{url} has been downloaded by another process. Returning {cached_filename}.')
+                    return cached_filename
+            tmp_filename = file_cache.get_part_filename(url)
+            calculated_hash, response_url = _download_checked(tmp_filename)
+            return file_cache.add(url, tmp_filename, calculated_hash,
+                                  name=response_url.split('?', 1)[0].rsplit('/', 1)[1])
+
+    dest_filename = pathlib.Path(dest_filename)
     if dest_filename.exists():
         if overwrite_existing:
-            logger.debug(f'Destination filename found: {dest_filename}. Deleting it, as overwrite_existing is True.')
-            dest_filename.unlink()
+            logger.debug(f'Destination filename found: {dest_filename}. Overwriting it, '
+                         f'as overwrite_existing is True.')
+        elif known_hash and _sha256_of_file(dest_filename) != known_hash:
+            logger.debug(f'Destination filename found: {dest_filename}, but its hash does not match. '
+                         f'Downloading it again.')
         else:
             logger.debug(f'Destination filename found: {dest_filename}. Returning it')
             return dest_filename
-
-    with open(dest_filename, "wb") as f:
-        f.write(content)
-
+    dest_parent = dest_filename.parent
+    if not dest_parent.exists():
+        dest_parent.mkdir(parents=True)
+    tmp_filename = dest_filename.with_name(f'{dest_filename.name}.part')
+    _download_checked(tmp_filename)
+    os.replace(tmp_filename, dest_filename)
     return dest_filename
 
 
@@ -173,19 +567,128 @@ SELECT ?flag ?label ?meaning ?mask WHERE {
 """
 
 
-def _ensure_graph(graph_or_path: Union[str, Graph]) -> Graph:
+_FORMAT_BY_SUFFIX = {'.jsonld': 'json-ld', '.json': 'json-ld'}
+_SNIFF_SIZE = 1024
+
+
+def _sniff_format(head: Union[str, bytes]) -> str:
+    """Guess the RDF serialization from the first bytes of a document"""
+    if isinstance(head, bytes):
+        head = head.decode('utf-8', errors='ignore')
+    head = head.lstrip('\ufeff \t\r\n')
+    if head.startswith(('{', '[')):
+        return 'json-ld'
+    if head.startswith(('<?xml', '<rdf:RDF')):
+        return 'xml'
+    return 'ttl'  # also parses N-Triples
+
+
+def _format_of_path(path: pathlib.Path) -> str:
+    fmt = _FORMAT_BY_SUFFIX.get(path.suffix.lower(), None) or guess_format(path.name)
+    if fmt is None:
+        with open(path, 'rb') as f:
+            fmt = _sniff_format(f.read(_SNIFF_SIZE))
+    return fmt
+
+
+def _is_path(graph_or_path) -> bool:
+    if isinstance(graph_or_path, pathlib.Path):
+        return True
+    return (isinstance(graph_or_path, str)
+            and len(graph_or_path) < 4096
+            and '\n' not in graph_or_path
+            and os.path.isfile(graph_or_path))
+
+
+def _ensure_graph(graph_or_path: Union[str, pathlib.Path, IO, Graph]) -> Graph:
+    """Return the graph of a Turtle/JSON-LD string, file path or file object.
+
+    Files are parsed by rdflib directly from disk. The format is taken from
+    the file extension or guessed from the first bytes. Parsed strings and
+    files are cached by content hash or by path and modification time (see
+    `pivmetalib.cache.graph_cache`), so the returned graph may be shared and
+    must not be modified. File objects are not cached. The cache is bounded
+    by its `maxsize` (graphs) and `max_triples`. Use `graph_cache.clear()` to
+    free it and `graph_cache.maxsize = 0` to disable it.
+    """
     if isinstance(graph_or_path, Graph):
         return graph_or_path
+    if hasattr(graph_or_path, 'read'):
+        return _parse_file_object(graph_or_path)
+
+    from .cache import graph_cache
+    if _is_path(graph_or_path):
+        path = pathlib.Path(graph_or_path).resolve()
+        stat = path.stat()
+        key = hashlib.sha256(f'{path}\0{stat.st_mtime_ns}\0{stat.st_size}'.encode('utf-8')).hexdigest()
+        parse, source = _parse_path, path
+    else:
+        key = hashlib.sha256(graph_or_path.encode('utf-8')).hexdigest()
+        parse, source = _parse_graph, graph_or_path
+    g = graph_cache.get(key)
+    if g is None:
+        g = parse(source)
+        graph_cache.put(key, g)
+    return g
+
+
+def _new_graph() -> Graph:
     g = Graph()
     g.bind("piv", PIV)
     g.bind("skos", SKOS)
     g.bind("hdf5", HDF5)
     g.bind("xsd", XSD)
-    fmt = guess_format(graph_or_path)  # ttl, json-ld, xml, nt, etc.
+    return g
+
+
+def _parse_jsonld(g: Graph, document: Union[Dict, List]) -> Graph:
+    # resolve remote contexts from the local cache instead of letting rdflib fetch them
+    from .context import resolve_document
+    g.parse(data=resolve_document(document), format='json-ld')
+    return g
+
+
+def _parse_graph(data: str) -> Graph:
+    """Parse a Turtle/JSON-LD/RDF-XML string"""
+    g = _new_graph()
+    fmt = _sniff_format(data[:_SNIFF_SIZE])
+    if fmt == 'json-ld':
+        return _parse_jsonld(g, json.loads(data))
+    g.parse(data=data, format=fmt)
+    return g
+
+
+def _parse_path(path: pathlib.Path) -> Graph:
+    """Parse an RDF file without reading it into a string first"""
+    g = _new_graph()
+    fmt = _format_of_path(path)
+    if fmt == 'json-ld':
+        with open(path, 'rb') as f:
+            return _parse_jsonld(g, json.load(f))
+    g.parse(source=str(path), format=fmt)
+    return g
+
+
+def _parse_file_object(f: IO) -> Graph:
+    """Parse an opened (binary or text) file. Non-seekable streams are read into memory."""
+    name = getattr(f, 'name', None)
+    fmt = None
+    if isinstance(name, str):
+        fmt = _FORMAT_BY_SUFFIX.get(pathlib.Path(name).suffix.lower(), None) or guess_format(name)
     if fmt is None:
-        if "@prefix" in graph_or_path:
-            fmt = "ttl"
-    g.parse(data=graph_or_path, format=fmt)
+        if f.seekable():
+            pos = f.tell()
+            fmt = _sniff_format(f.read(_SNIFF_SIZE))
+            f.seek(pos)
+        else:
+            data = f.read()
+            if isinstance(data, bytes):
+                data = data.decode('utf-8')
+            return _parse_graph(data)
+    g = _new_graph()
+    if fmt == 'json-ld':
+        return _parse_jsonld(g, json.load(f))
+    g.parse(source=f, format=fmt)
     return g
 
 
@@ -203,38 +706,123 @@ def _label_of(flag_uri: URIRef, label_lit, meaning_lit) -> str:
     return s
 
 
-def get_flag_table(
-        graph_or_path: Union[str, Graph],
-        scheme: Optional[str] = None
-) -> List[Dict[str, Union[str, int]]]:
-    """
-    Returns a list of dicts: [{'uri': str, 'label': str, 'mask': int}, ...]
-    If `scheme` is provided (IRI string), restricts to that scheme's piv:allowedFlag.
-    """
-    g = _ensure_graph(graph_or_path)
-    q = SCHEME_QUERY % {"scheme": scheme} if scheme else ALL_FLAGS_QUERY
-
-    rows = g.query(q)
+def _build_flag_table(rows) -> List[Dict[str, Union[str, int]]]:
+    """Build the flag table from (flag, label, meaning, mask) rows"""
     table: List[Dict[str, Union[str, int]]] = []
     seen = set()  # avoid duplicates
 
     for flag, label, meaning, mask in rows:
-        key = (str(flag), int(mask.toPython()))
+        mask = int(mask.toPython())
+        key = (str(flag), mask)
         if key in seen:
             continue
         seen.add(key)
         table.append({
             "uri": str(flag),
             "label": _label_of(flag, label, meaning),
-            "mask": int(mask.toPython()),
+            "mask": mask,
         })
     # Stable sort by mask value
     table.sort(key=lambda r: r["mask"])
     return table
 
 
+def _get_flag_table_sparql(
+        graph_or_path: Union[str, pathlib.Path, IO, Graph],
+        scheme: Optional[str] = None
+) -> List[Dict[str, Union[str, int]]]:
+    """SPARQL implementation of `get_flag_table` (kept as reference)"""
+    g = _ensure_graph(graph_or_path)
+    q = SCHEME_QUERY % {"scheme": scheme} if scheme else ALL_FLAGS_QUERY
+    return _build_flag_table(g.query(q))
+
+
+def _pick(values) -> Optional[Literal]:
+    """Choose one of several labels (or meanings) of a flag independent of the graph order"""
+    return min(values, key=str, default=None)
+
+
+def _iter_flag_rows(g: Graph,
+                    flags: Optional[Iterable[URIRef]] = None,
+                    annotations: Optional[Dict[URIRef, Tuple]] = None,
+                    masks: Optional[Dict[URIRef, List]] = None):
+    """Yield (flag, label, meaning, mask) rows from the piv:mask triples.
+
+    Without `flags`, all piv:mask triples are walked once and rows of
+    subjects, which are not typed piv:Flag, are skipped. The (label, meaning)
+    of the flags and their masks can be passed as `annotations` and `masks`,
+    if they have been collected from the graph before (see `get_flag_tables`).
+    """
+    if flags is None:
+        triples = (t for t in g.triples((None, PIV.mask, None)) if (t[0], RDF.type, PIV.Flag) in g)
+    elif masks is None:
+        triples = (t for flag in flags for t in g.triples((flag, PIV.mask, None)))
+    else:
+        triples = ((flag, PIV.mask, mask) for flag in flags for mask in masks.get(flag, ()))
+    for flag, _, mask in triples:
+        annotation = annotations.get(flag) if annotations is not None else None
+        if annotation is None:
+            annotation = (_pick(g.objects(flag, SKOS.prefLabel)), _pick(g.objects(flag, PIV.meaning)))
+        yield flag, annotation[0], annotation[1], mask
+
+
+def get_flag_table(
+        graph_or_path: Union[str, pathlib.Path, IO, Graph],
+        scheme: Optional[str] = None
+) -> List[Dict[str, Union[str, int]]]:
+    """
+    Returns a list of dicts: [{'uri': str, 'label': str, 'mask': int}, ...]
+    If `scheme` is provided (IRI string), restricts to that scheme's piv:allowedFlag.
+
+    The triples are read directly from the graph indices (no SPARQL evaluation).
+    """
+    g = _ensure_graph(graph_or_path)
+    flags = g.objects(URIRef(scheme), PIV.allowedFlag) if scheme else None
+    return _build_flag_table(_iter_flag_rows(g, flags))
+
+
+def get_flag_tables(
+        graph_or_path: Union[str, pathlib.Path, IO, Graph],
+        schemes: Optional[Iterable[str]] = None
+) -> Dict[str, List[Dict[str, Union[str, int]]]]:
+    """
+    Returns the flag tables of many schemes at once: {scheme IRI: flag table}.
+    If `schemes` is None, all flag schemes of the graph are returned (every
+    subject of piv:allowedFlag and every piv:FlagScheme, Bitwise- or
+    EnumeratedFlagScheme).
+
+    The graph is parsed once and labels, meanings and masks are collected
+    in a single pass over each predicate. The rows are built by the same
+    code as in `get_flag_table`, so the tables are identical.
+    """
+    g = _ensure_graph(graph_or_path)
+    if schemes is None:
+        schemes = {}  # ordered set
+        for scheme_type in (PIV.FlagScheme, PIV.BitwiseFlagScheme, PIV.EnumeratedFlagScheme):
+            for scheme in g.subjects(RDF.type, scheme_type):
+                schemes.setdefault(str(scheme))
+        for scheme in g.subjects(PIV.allowedFlag, None, unique=True):
+            schemes.setdefault(str(scheme))
+
+    # one pass over each predicate instead of lookups per flag
+    labels: Dict[URIRef, List] = {}
+    meanings: Dict[URIRef, List] = {}
+    masks: Dict[URIRef, List] = {}
+    for flag, label in g.subject_objects(SKOS.prefLabel):
+        labels.setdefault(flag, []).append(label)
+    for flag, meaning in g.subject_objects(PIV.meaning):
+        meanings.setdefault(flag, []).append(meaning)
+    for flag, mask in g.subject_objects(PIV.mask):
+        masks.setdefault(flag, []).append(mask)
+    annotations = {flag: (_pick(labels.get(flag, ())), _pick(meanings.get(flag, ()))) for flag in masks}
+    # the flags of a scheme are taken in the same order as by get_flag_table
+    return {str(scheme): _build_flag_table(_iter_flag_rows(g, g.objects(URIRef(scheme), PIV.allowedFlag),
+                                                           annotations, masks))
+            for scheme in schemes}
+
+
 def get_flag_dict(
-        graph_or_path: Union[str, Graph],
+        graph_or_path: Union[str, pathlib.Path, IO, Graph],
         scheme: Optional[str] = None
 ) -> Dict[str, int]:
     """
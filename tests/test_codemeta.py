@@ -1,16 +1,22 @@
 import json
 import pathlib
+import shutil
+import tempfile
 import warnings
+from unittest import mock
 
 import requests
 from ontolutils.classes.utils import download_file
 
 import pivmetalib
 from pivmetalib import sd
+from pivmetalib import context
+from pivmetalib.sd.software import CODEMETA_CONTEXT_URL, _from_codemeta
 import utils
 from pivmetalib import __version__
 from ontolutils.ex.schema import SoftwareSourceCode
 from ontolutils.ex.schema import Person
+from ontolutils.ex.prov import Person as ProvPerson, Organization as ProvOrganization
 
 __this_dir__ = pathlib.Path(__file__).parent
 
@@ -27,6 +33,106 @@ except (requests.ConnectionError,
 
 
 class TestCodemeta(utils.ClassTest):
+
+    def _register_codemeta_context(self, cache_dir):
+        """Register a reduced codemeta context in a temporary context cache"""
+        patcher = mock.patch.object(context, 'get_context_cache_dir', return_value=pathlib.Path(cache_dir))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(context._memory_cache.pop, CODEMETA_CONTEXT_URL, None)
+        context.register_context(CODEMETA_CONTEXT_URL, __this_dir__ / 'testdata/codemeta_context.jsonld')
+
+    def test_from_codemeta_offline(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._register_codemeta_context(tmp_dir)
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', UserWarning)
+                sc = sd.SourceCode.from_codemeta(__this_dir__ / '../codemeta.json', offline=True)
+            self.assertEqual(sc.name, 'pivmetalib')
+            self.assertEqual(sc.version, __version__)
+            self.assertEqual(sc.author[0].family_name, "Probst")
+
+            # the context is kept in memory and does not need the cache files anymore:
+            shutil.rmtree(tmp_dir)
+            self.assertEqual(context.load_context(CODEMETA_CONTEXT_URL, offline=True)['name'],
+                             {"@id": "schema:name"})
+
+    def test_from_codemeta_direct_mapping(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._register_codemeta_context(tmp_dir)
+            codemeta_context = context.load_context(CODEMETA_CONTEXT_URL, offline=True)
+            with open(__this_dir__ / '../codemeta.json', encoding='utf-8') as f:
+                data = json.load(f)
+
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', UserWarning)
+                with mock.patch.object(SoftwareSourceCode, 'from_jsonld') as from_jsonld:
+                    sc = _from_codemeta(SoftwareSourceCode, dict(data), codemeta_context)
+                from_jsonld.assert_not_called()
+                rdf_sc = SoftwareSourceCode.from_jsonld(data=json.dumps(dict(data, **{'@context': codemeta_context})),
+                                                        limit=1)
+            expected = rdf_sc.model_dump(exclude={'id'}, exclude_none=True)
+            expected['author'][0]['affiliation'].pop('@type')  # artifact of the RDF path
+            self.assertEqual(sc.model_dump(exclude={'id'}, exclude_none=True), expected)
+            self.assertIsInstance(sc.author[0], Person)
+            self.assertEqual(sc.author[0].id, "https://orcid.org/0000-0001-8729-0482")
+
+            # unknown terms are parsed as RDF:
+            with mock.patch.object(SoftwareSourceCode, 'from_jsonld', return_value=rdf_sc) as from_jsonld:
+                _from_codemeta(SoftwareSourceCode, dict(data, unknownTerm='value'), codemeta_context)
+            from_jsonld.assert_called_once()
+
+    def test_software_from_codemeta(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._register_codemeta_context(pathlib.Path(tmp_dir) / 'contexts')
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', UserWarning)
+                software = sd.Software.from_codemeta(__this_dir__ / '../codemeta.json', offline=True)
+            self.assertIsInstance(software, sd.Software)
+            self.assertEqual(software.name, 'pivmetalib')
+            self.assertEqual(software.softwareVersion, __version__)
+            self.assertEqual(len(software.author), 1)
+            author = software.author[0]
+            self.assertIsInstance(author, ProvPerson)
+            self.assertEqual(author.id, "https://orcid.org/0000-0001-8729-0482")
+            self.assertEqual((author.firstName, author.lastName), ("Matthias", "Probst"))
+            self.assertEqual(author.mbox, "matthias.probst@kit.edu")
+            self.assertIsInstance(author.affiliation, ProvOrganization)
+            self.assertEqual(str(author.affiliation.name),
+                             "Karlsruhe Institute of Technology, Institute of Thermal Turbomachinery")
+
+            # SoftwareApplication documents:
+            with open(__this_dir__ / '../codemeta.json', encoding='utf-8') as f:
+                data = json.load(f)
+            app_filename = pathlib.Path(tmp_dir) / 'codemeta.json'
+            app_filename.write_text(json.dumps(dict(data, **{'@type': 'SoftwareApplication'})), encoding='utf-8')
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', UserWarning)
+                self.assertEqual(sd.Software.from_codemeta(app_filename, offline=True).name, 'pivmetalib')
+
+                # documents, which do not describe software:
+                app_filename.write_text(json.dumps(dict(data, **{'@type': 'Person'})), encoding='utf-8')
+                with self.assertRaises(ValueError):
+                    sd.Software.from_codemeta(app_filename, offline=True)
+
+    def test_from_codemeta_many(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._register_codemeta_context(pathlib.Path(tmp_dir) / 'contexts')
+            tools_dir = pathlib.Path(tmp_dir) / 'tools'
+            for name in ('tool_a', 'tool_b', 'group/tool_c'):
+                (tools_dir / name).mkdir(parents=True)
+                shutil.copy(__this_dir__ / '../codemeta.json', tools_dir / name / 'codemeta.json')
+            (tools_dir / 'broken').mkdir()
+            (tools_dir / 'broken' / 'codemeta.json').write_text('{"name": ')
+
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', UserWarning)
+                with self.assertRaises(json.JSONDecodeError):
+                    sd.SourceCode.from_codemeta_many(tools_dir, offline=True)
+                codes = sd.SourceCode.from_codemeta_many(tools_dir, offline=True, ignore_errors=True)
+            self.assertEqual(list(codes), sorted(tools_dir.rglob('codemeta.json'))[1:])
+            self.assertEqual({sc.name for sc in codes.values()}, {'pivmetalib'})
+
     if connected:
         def test_codemeta(self):
             # get codemeta context file:
@@ -1,11 +1,108 @@
+import json
+import os
+import pathlib
+import tempfile
 import unittest
+from unittest import mock
 
 from pydantic import HttpUrl
 
 from pivmetalib import CONTEXT
+from pivmetalib import context
+from pivmetalib.utils import get_flag_dict
+from utils import LocalHTTPServer
+
+PIV_CONTEXT_DOC = {
+    "@context": {
+        "piv": "https://matthiasprobst.github.io/pivmeta#",
+        "skos": "http://www.w3.org/2004/02/skos/core#",
+        "Flag": "piv:Flag",
+        "mask": "piv:mask",
+        "label": "skos:prefLabel"
+    }
+}
+
+
+PIV_CONTEXT_HTML = f"""<html><head>
+<script type="application/ld+json">{json.dumps(PIV_CONTEXT_DOC)}</script>
+</head><body></body></html>""".encode()
 
 
 class TestContext(unittest.TestCase):
 
+    def setUp(self):
+        # use a temporary context cache and no offline mode from the environment:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        patchers = [mock.patch.object(context, 'get_context_cache_dir', return_value=pathlib.Path(tmp_dir.name)),
+                    mock.patch.dict(os.environ),
+                    mock.patch.dict(context._memory_cache, clear=True),
+                    mock.patch.dict(context._memory_validated, clear=True)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        os.environ.pop(context.OFFLINE_ENV_VARIABLE, None)
+
     def test_context_url(self):
         self.assertTrue(HttpUrl(CONTEXT))
+
+    def test_load_context_cached(self):
+        with LocalHTTPServer({'/ctx.jsonld': json.dumps(PIV_CONTEXT_DOC).encode()}) as server:
+            url = f'{server.url}/ctx.jsonld'
+            with self.assertRaises(FileNotFoundError):
+                context.load_context(url, offline=True)
+            self.assertEqual(len(server.requests), 0)
+
+            ctx = context.load_context(url)
+            self.assertEqual(ctx, PIV_CONTEXT_DOC['@context'])
+            self.assertEqual(len(server.requests), 1)
+            self.assertIn('application/ld+json', server.requests[0][1]['Accept'])
+
+            # within the TTL, no request is made:
+            context.load_context(url)
+            self.assertEqual(len(server.requests), 1)
+
+            # returned contexts are copies:
+            ctx['mask'] = 'changed'
+            self.assertEqual(context.load_context(url)['mask'], 'piv:mask')
+
+            # expired TTL revalidates with the ETag:
+            self.assertEqual(context.load_context(url, ttl=0), PIV_CONTEXT_DOC['@context'])
+            self.assertEqual(len(server.requests), 2)
+            self.assertIn('If-None-Match', server.requests[-1][1])
+
+            # offline mode never touches the network, even with expired TTL:
+            self.assertEqual(context.load_context(url, ttl=0, offline=True), PIV_CONTEXT_DOC['@context'])
+            context._memory_cache.clear()
+            with mock.patch.dict(os.environ, {context.OFFLINE_ENV_VARIABLE: '1'}):
+                self.assertEqual(context.load_context(url, ttl=0), PIV_CONTEXT_DOC['@context'])
+            self.assertEqual(len(server.requests), 2)
+
+    def test_load_context_not_json(self):
+        files = {'/ctx.html': PIV_CONTEXT_HTML, '/page.html': b'<html><body>no context</body></html>'}
+        content_types = {'/ctx.html': 'text/html', '/page.html': 'text/html'}
+        with LocalHTTPServer(files, content_types=content_types) as server:
+            # the context embedded in the HTML page is loaded by rdflib:
+            url = f'{server.url}/ctx.html'
+            self.assertEqual(context.load_context(url), PIV_CONTEXT_DOC['@context'])
+            context._memory_cache.clear()
+            self.assertEqual(context.load_context(url, offline=True), PIV_CONTEXT_DOC['@context'])
+
+            with self.assertRaises(ValueError):
+                context.load_context(f'{server.url}/page.html')
+
+    def test_register_and_resolve(self):
+        url = 'https://example.org/pivmetalib-test/context.jsonld'
+        context.register_context(url, PIV_CONTEXT_DOC)
+
+        resolved = context.resolve_contexts({"@import": url, "ex": "https://example.org/"}, offline=True)
+        self.assertEqual(resolved['ex'], "https://example.org/")
+        self.assertEqual(resolved['mask'], "piv:mask")
+        self.assertEqual(context.resolve_contexts([url, {"ex": "https://example.org/"}], offline=True),
+                         [PIV_CONTEXT_DOC['@context'], {"ex": "https://example.org/"}])
+
+        doc = {
+            "@context": {"@import": url},
+            "@graph": [{"@id": "https://example.org/flag1", "@type": "Flag", "mask": 2, "label": "Outlier"}]
+        }
+        self.assertDictEqual(get_flag_dict(json.dumps(doc)), {"Outlier": 2})
@@ -0,0 +1,56 @@
+import importlib.util
+import json
+import pathlib
+import tempfile
+import unittest
+
+from pivmetalib import context
+
+__this_dir__ = pathlib.Path(__file__).parent
+
+_spec = importlib.util.spec_from_file_location('deploy', __this_dir__ / '../deploy.py')
+deploy = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(deploy)
+
+# context rebuilt from the terms of namespace.py (not a snapshot of the published context):
+# generating the module from it is a round trip. Drift from the published context is only
+# detected by test_namespace_file_matches_cached_context.
+CONTEXT_FILE = __this_dir__ / 'testdata/pivmeta_context_from_namespace.jsonld'
+NAMESPACE_FILE = __this_dir__ / '../pivmetalib/namespace.py'
+
+
+class TestDeploy(unittest.TestCase):
+
+    def test_generate_namespace_file_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_dir = pathlib.Path(tmp_dir)
+            target = tmp_dir / 'namespace.py'
+
+            self.assertTrue(deploy.generate_namespace_file(CONTEXT_FILE, target))
+            # the generator reproduces the shipped module from its own terms
+            self.assertEqual(target.read_text(encoding='UTF8'), NAMESPACE_FILE.read_text(encoding='UTF8'))
+
+            # unchanged terms (in any order) are not written again
+            with open(CONTEXT_FILE, encoding='UTF8') as f:
+                ctx = json.load(f)
+            reversed_context_file = tmp_dir / 'reversed_context.jsonld'
+            reversed_context_file.write_text(json.dumps({'@context': dict(reversed(ctx['@context'].items()))}),
+                                             encoding='UTF8')
+            mtime = target.stat().st_mtime_ns
+            self.assertFalse(deploy.generate_namespace_file(reversed_context_file, target))
+            self.assertEqual(target.stat().st_mtime_ns, mtime)
+
+            context_file = tmp_dir / 'context.jsonld'
+            ctx['@context']['new term'] = {'@id': 'piv:NewTerm'}
+            context_file.write_text(json.dumps(ctx), encoding='UTF8')
+            self.assertTrue(deploy.generate_namespace_file(context_file, target))
+            self.assertIn('NewTerm: URIRef  # [\'new term\']', target.read_text(encoding='UTF8'))
+
+    def test_namespace_file_matches_cached_context(self):
+        try:
+            cached_context = context.load_context(deploy.CONTEXT_URL, offline=True)
+        except FileNotFoundError:
+            self.skipTest('The pivmeta context is not cached')
+        url, iris = deploy.collect_iris({'@context': cached_context})
+        self.assertEqual(deploy._read_terms_hash(NAMESPACE_FILE), deploy.get_terms_hash(url, iris),
+                         'namespace.py is outdated, run deploy.py')
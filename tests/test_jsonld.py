@@ -1,8 +1,12 @@
+import io
 import json
+import pathlib
+import tempfile
 import unittest
 import warnings
 
 import rdflib
+from rdflib.compare import isomorphic
 import requests
 
 from pivmetalib import CONTEXT
@@ -57,6 +61,74 @@ class TestJSONLD(unittest.TestCase):
         },
             json.loads(p12))
 
+    def test_merge_to(self):
+        docs = [prov.Person(id=f'_:b{i}', firstName='John', lastName=f'Doe{i}').model_dump_jsonld()
+                for i in range(5)]
+        expected = jsonld.merge(docs)
+        self.assertEqual(len(json.loads(expected)['@context']), 1)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filenames = []
+            for i, doc in enumerate(docs):
+                filenames.append(pathlib.Path(tmp_dir) / f'{i}.jsonld')
+                filenames[-1].write_text(doc, encoding='utf-8')
+            target = pathlib.Path(tmp_dir) / 'merged.jsonld'
+            jsonld.merge_to(iter(filenames), target)
+            self.assertEqual(target.read_text(encoding='utf-8'), expected)
+
+        stream = io.StringIO()
+        jsonld.merge_to((json.loads(doc) for doc in docs), stream, compact=True)
+        self.assertEqual(stream.getvalue(), json.dumps(json.loads(expected), separators=(',', ':')))
+        self.assertEqual(jsonld.merge(docs, compact=True), stream.getvalue())
+
+    def test_merge_flatten(self):
+        docs = [
+            {'@context': {'ex': 'https://example.org/'},
+             '@id': 'https://example.org/a', '@type': 'ex:T', 'ex:p': 1,
+             'ex:q': {'@id': '_:b1', 'ex:r': 2}},
+            {'@context': {'ex': 'https://example.org/'},
+             '@graph': [[{'@id': 'https://example.org/a', '@type': 'ex:U', 'ex:p': 3}],
+                        {'@id': '_:b1', 'ex:r': 5}]}
+        ]
+        merged = json.loads(jsonld.merge(docs, flatten=True))
+        self.assertEqual(merged['@context'], [{'ex': 'https://example.org/'}])
+        self.assertEqual(merged['@graph'], [
+            {'@id': 'https://example.org/a', '@type': ['ex:T', 'ex:U'], 'ex:p': [1, 3], 'ex:q': {'@id': '_:b1'}},
+            {'@id': '_:b1', 'ex:r': 2},
+            {'@id': '_:b1_1', 'ex:r': 5},
+        ])
+        self.assertEqual(json.loads(jsonld.merge(docs, flatten=True, on_conflict='first'))['@graph'][0],
+                         {'@id': 'https://example.org/a', '@type': 'ex:T', 'ex:p': 1, 'ex:q': {'@id': '_:b1'}})
+        self.assertEqual(json.loads(jsonld.merge(docs, flatten=True, on_conflict='last'))['@graph'][0],
+                         {'@id': 'https://example.org/a', '@type': 'ex:U', 'ex:p': 3, 'ex:q': {'@id': '_:b1'}})
+        with self.assertRaises(ValueError):
+            jsonld.merge(docs, flatten=True, on_conflict='unknown')
+
+        g_expected = rdflib.Graph().parse(data="""@prefix ex: <https://example.org/> .
+ex:a a ex:T, ex:U ; ex:p 1, 3 ; ex:q [ ex:r 2 ] .
+[] ex:r 5 .""", format='ttl')
+        g_merged = rdflib.Graph().parse(data=jsonld.merge(docs, flatten=True), format='json-ld')
+        self.assertTrue(isomorphic(g_expected, g_merged))
+
+    def test_merge_parallel(self):
+        docs = []
+        for i in range(20):
+            docs.append({'@context': {'ex': 'https://example.org/'} if i % 3 else 'https://example.org/context',
+                         '@graph': [{'@id': f'https://example.org/n{i % 7}', 'ex:p': i % 4,
+                                     'ex:q': {'@id': f'_:b{i % 3}', 'ex:r': i % 2}}]})
+        for flatten in (False, True):
+            for compact in (False, True):
+                stream = io.StringIO()
+                jsonld.merge_parallel(docs, stream, compact=compact, flatten=flatten, max_workers=2, chunk_size=3)
+                self.assertEqual(stream.getvalue(), jsonld.merge(docs, compact=compact, flatten=flatten))
+
+        # documents without nodes
+        docs = [{'@context': {'ex': 'https://example.org/'}, '@graph': []} for _ in range(4)]
+        for flatten in (False, True):
+            stream = io.StringIO()
+            jsonld.merge_parallel(docs, stream, flatten=flatten, max_workers=2, chunk_size=2)
+            self.assertEqual(stream.getvalue(), jsonld.merge(docs, flatten=flatten))
+
     def test_correct_namespaces(self):
         dyn_mean = Method(
             name='dynamic mean test',
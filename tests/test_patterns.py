@@ -0,0 +1,80 @@
+import pathlib
+import tempfile
+import unittest
+
+import numpy as np
+
+from pivmetalib import patterns
+from pivmetalib.pivmeta import ImageVelocimetryDistribution
+
+
+class TestFilenamePattern(unittest.TestCase):
+
+    def test_expand_pattern(self):
+        self.assertEqual(patterns.expand_pattern('image_{:04d}.tif', 0, 3),
+                         ['image_0000.tif', 'image_0001.tif', 'image_0002.tif'])
+        self.assertEqual(patterns.expand_pattern('img_{}.png', 8, 12, 2), ['img_8.png', 'img_10.png'])
+        for pattern in ('image.tif', 'image_{}_{}.tif', 'image_{:x}.tif', 'image_{name}.tif',
+                        r'^C\d{3}_\d.tif$', 'run_{}/image.tif'):
+            with self.assertRaises(ValueError):
+                patterns.expand_pattern(pattern, 0, 1)
+
+    def test_match(self):
+        compiled = patterns.compile_pattern('image_{:04d}.tif')
+        self.assertEqual(compiled.match('image_0012.tif'), 12)
+        self.assertEqual(compiled.match('image_12345.tif'), 12345)
+        self.assertIsNone(compiled.match('image_00012.tif'))  # not written by the pattern
+        self.assertIsNone(compiled.match('image_012.tif'))
+        self.assertIsNone(compiled.match('image_0012.tiff'))
+        compiled = patterns.compile_pattern('image_{}.tif')
+        self.assertEqual(compiled.match('image_0.tif'), 0)
+        self.assertIsNone(compiled.match('image_01.tif'))
+        for i in (0, 7, 999, 10000, 123456):
+            self.assertEqual(patterns.compile_pattern('a.{:05d}.b').match(f'a.{i:05d}.b'), i)
+
+    def test_scan_pattern(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_dir = pathlib.Path(tmp_dir)
+            for i in (0, 1, 2, 5, 6, 9, 10000):
+                (tmp_dir / f'image_{i:04d}.tif').touch()
+            for name in ('image_00003.tif', 'image_0004.png', 'image_abcd.tif', 'image_0007.tif.bak'):
+                (tmp_dir / name).touch()
+            (tmp_dir / 'image_0008.tif').mkdir()  # directories are not frames
+
+            scan = patterns.scan_pattern('image_{:04d}.tif', tmp_dir)
+            np.testing.assert_array_equal(scan.indices, [0, 1, 2, 5, 6, 9, 10000])
+            self.assertEqual(scan.gaps, [(3, 5), (7, 9), (10, 10000)])
+            self.assertEqual(len(scan.missing), 10000 - 7 + 1)
+            self.assertFalse(scan.complete)
+            self.assertEqual(scan.filenames()[0], tmp_dir / 'image_0000.tif')
+
+            scan = patterns.scan_pattern('image_{:04d}.tif', tmp_dir, start=0, stop=12)
+            self.assertEqual(scan.gaps, [(3, 5), (7, 9), (10, 12)])
+            np.testing.assert_array_equal(scan.missing, [3, 4, 7, 8, 10, 11])
+
+            scan = patterns.scan_pattern('image_{:04d}.tif', tmp_dir, start=0, stop=3)
+            self.assertTrue(scan.complete)
+            self.assertEqual(scan.missing.size, 0)
+
+            (tmp_dir / 'raw').mkdir()
+            (tmp_dir / 'raw' / 'a_1.tif').touch()
+            scan = patterns.scan_pattern('raw/a_{}.tif', tmp_dir, start=0, stop=3)
+            self.assertEqual(scan.gaps, [(0, 1), (2, 3)])
+            self.assertEqual(scan.filenames(), [tmp_dir / 'raw' / 'a_1.tif'])
+
+            scan = patterns.scan_pattern('none_{}.tif', tmp_dir)
+            self.assertEqual(scan.indices.size, 0)
+            self.assertTrue(scan.complete)
+
+    def test_distribution(self):
+        dist = ImageVelocimetryDistribution(filenamePattern='image_{:04d}.tif')
+        self.assertEqual(dist.expand_filenames(0, 2), ['image_0000.tif', 'image_0001.tif'])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name in dist.expand_filenames(0, 100):
+                (pathlib.Path(tmp_dir) / name).touch()
+            (pathlib.Path(tmp_dir) / 'image_0042.tif').unlink()
+            scan = dist.scan_frames(tmp_dir, start=0, stop=100)
+            self.assertEqual(scan.gaps, [(42, 43)])
+            self.assertEqual(len(scan.indices), 99)
+        with self.assertRaises(ValueError):
+            ImageVelocimetryDistribution().expand_filenames(0, 1)
@@ -2,12 +2,14 @@ import ast
 import importlib
 import json
 import pathlib
+import pickle
 import sys
 import time
 import warnings
 from datetime import datetime
 from typing import Union, List
 
+import numpy as np
 import ontolutils
 import requests
 from ontolutils import get_urirefs
@@ -21,7 +23,7 @@ from ssnolib.pimsii import Variable
 import pivmetalib
 import utils
 from pivmetalib import pivmeta
-from pivmetalib.namespace import PIV
+from pivmetalib.namespace import PIV, PIV_TERMS, PIV_TERM_OF_IRI
 from pivmetalib.pivmeta import ImageVelocimetryDistribution, FlagScheme, EnumeratedFlagScheme
 from pivmetalib.pivmeta.variable import TemporalVariable
 
@@ -39,6 +41,16 @@ except (requests.ConnectionError,
 
 class TestPIVmeta(utils.ClassTest):
 
+    def test_namespace_terms(self):
+        self.assertEqual(set(PIV_TERMS), set(PIV.__annotations__))
+        for term, iri in PIV_TERMS.items():
+            self.assertIs(getattr(PIV, term), iri)
+            self.assertEqual(iri, PIV._NS[term])
+            self.assertEqual(PIV_TERM_OF_IRI[iri], term)
+        self.assertEqual(PIV_TERM_OF_IRI[PIV.hasFlagScheme], 'hasFlagScheme')
+        with self.assertRaises(TypeError):
+            PIV_TERMS['mask'] = PIV.mask
+
     def test_python_classes(self):
         namespace_names = [str(n).split('#', 1)[-1] for n in list(PIV.__dict__.values())]
         pivmeta_module_folder = __this_dir__ / "../pivmetalib/pivmeta"
@@ -500,3 +512,106 @@ class TestPIVmeta(utils.ClassTest):
 
         flag = flag_scheme.get_flags(mask=1)
         self.assertEqual(flag[0].mask, 1)
+
+    def test_flags_vectorized(self):
+        enum_scheme = FlagScheme(
+            usesFlagSchemeType=EnumeratedFlagScheme(),
+            allowedFlag=[
+                pivmeta.Flag(label="Disabled", mask=0),
+                pivmeta.Flag(label="NoResult", mask=1),
+                pivmeta.Flag(label="ValidData", mask=3),
+            ],
+            hasFlagMapping=[
+                pivmeta.FlagMapping(mapsToFlag=pivmeta.Flag(label="NoResult", mask=1), hasFlagValue=2),
+            ]
+        )
+        values = np.array([[0, 1, 2], [3, 3, 5]])
+        masks = enum_scheme.get_flag_masks(values)
+        self.assertEqual(sorted(masks), ["Disabled", "NoResult", "ValidData"])
+        np.testing.assert_array_equal(masks["NoResult"], [[False, True, True], [False, False, False]])
+        np.testing.assert_array_equal(masks["ValidData"], values == 3)
+        self.assertDictEqual(enum_scheme.count_flags(values), {"Disabled": 1, "NoResult": 2, "ValidData": 2})
+        labels = enum_scheme.get_flag_labels(values)
+        self.assertEqual(labels.shape, values.shape)
+        self.assertEqual(labels.tolist(), [["Disabled", "NoResult", "NoResult"], ["ValidData", "ValidData", ""]])
+
+        bitwise_scheme = FlagScheme(
+            usesFlagSchemeType=pivmeta.BitwiseFlagScheme(),
+            allowedFlag=[
+                pivmeta.Flag(label="Outlier", mask=1),
+                pivmeta.Flag(label="Interpolated", mask=2),
+                pivmeta.Flag(label="Masked", mask=4),
+            ]
+        )
+        values = np.array([0, 1, 3, 4, 6])
+        masks = bitwise_scheme.get_flag_masks(values)
+        np.testing.assert_array_equal(masks["Outlier"], [False, True, True, False, False])
+        np.testing.assert_array_equal(masks["Interpolated"], [False, False, True, False, True])
+        self.assertDictEqual(bitwise_scheme.count_flags(values), {"Outlier": 2, "Interpolated": 2, "Masked": 2})
+        self.assertEqual(bitwise_scheme.get_flag_labels(values).tolist(),
+                         ["", "Outlier", "Outlier|Interpolated", "Masked", "Interpolated|Masked"])
+
+        with self.assertRaises(TypeError):
+            bitwise_scheme.get_flag_masks(np.array([0.5, 1.0]))
+        with self.assertRaises(ValueError):
+            FlagScheme(allowedFlag=[]).get_flag_masks(values)
+
+    def test_flags_compiled(self):
+        scheme = FlagScheme(
+            usesFlagSchemeType=pivmeta.BitwiseFlagScheme(),
+            allowedFlag=[
+                pivmeta.Flag(label="Outlier", mask=1),
+                pivmeta.Flag(label="Interpolated", mask=2),
+            ]
+        )
+        compiled = scheme.compile()
+        self.assertIs(compiled, scheme.compile())
+        self.assertEqual([f.label for f in scheme.get_flags(3)], ["Outlier", "Interpolated"])
+        self.assertEqual([f.label for f in scheme.get_flags(2 | 8)], ["Interpolated"])
+        self.assertEqual(scheme.get_flags(8), [])
+
+        # assigning a field invalidates the compiled tables:
+        scheme.usesFlagSchemeType = EnumeratedFlagScheme()
+        self.assertIsNot(compiled, scheme.compile())
+        self.assertEqual([f.label for f in scheme.get_flags(2)], ["Interpolated"])
+        self.assertEqual(scheme.get_flags(3), [])
+
+        scheme.allowedFlag = [pivmeta.Flag(label="Masked", mask=3)]
+        self.assertEqual([f.label for f in scheme.get_flags(3)], ["Masked"])
+
+        # copies do not share the compiled tables:
+        scheme.compile()
+        copied = scheme.model_copy(update={'allowedFlag': [pivmeta.Flag(label="Invalid", mask=3)]})
+        self.assertEqual([f.label for f in copied.get_flags(3)], ["Invalid"])
+        self.assertEqual([f.label for f in scheme.get_flags(3)], ["Masked"])
+        deep_copied = scheme.model_copy(deep=True)
+        self.assertIsNot(deep_copied.compile(), scheme.compile())
+        self.assertEqual([f.label for f in deep_copied.get_flags(3)], ["Masked"])
+
+        # compiled schemes can be pickled (e.g. to be sent to worker processes):
+        unpickled = pickle.loads(pickle.dumps(scheme))
+        self.assertIsNotNone(scheme.__pydantic_private__['_compiled'])
+        self.assertIsNone(unpickled.__pydantic_private__['_compiled'])
+        self.assertEqual([f.label for f in unpickled.get_flags(3)], ["Masked"])
+
+        scheme.usesFlagSchemeType = None
+        with self.assertRaises(ValueError):
+            scheme.get_flags(3)
+
+    def test_get_iri_fields(self):
+        flags = [pivmeta.Flag(label="Good", mask=1), pivmeta.Flag(label="Bad", mask=0)]
+        iri_fields = pivmetalib.get_iri_fields(flags[0])
+        self.assertEqual(iri_fields['mask'], 'https://matthiasprobst.github.io/pivmeta#mask')
+        self.assertEqual(iri_fields['Flag'], 'https://matthiasprobst.github.io/pivmeta#Flag')
+        iri_fields['mask'] = 'changed'
+        self.assertEqual(pivmetalib.get_iri_fields(flags[0])['mask'], 'https://matthiasprobst.github.io/pivmeta#mask')
+
+        many = pivmetalib.get_iri_fields_many([*flags, FlagScheme()])
+        self.assertEqual(len(many), 3)
+        self.assertEqual(many[0], many[1])
+        self.assertEqual(many[2]['allowedFlag'], 'https://matthiasprobst.github.io/pivmeta#allowedFlag')
+        many[0]['mask'] = 'changed'
+        self.assertEqual(many[1]['mask'], 'https://matthiasprobst.github.io/pivmeta#mask')
+        self.assertEqual(pivmetalib.get_iri_fields(flags[0])['mask'], 'https://matthiasprobst.github.io/pivmeta#mask')
+        self.assertEqual(pivmetalib.get_iri_fields_many(flags)[0]['mask'],
+                         'https://matthiasprobst.github.io/pivmeta#mask')
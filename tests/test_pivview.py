@@ -0,0 +1,114 @@
+import pathlib
+import tempfile
+import unittest
+
+import numpy as np
+import rdflib
+
+from pivmetalib import PIV
+from pivmetalib import pivview
+from pivmetalib.pivmeta import EnumeratedFlagScheme, ImageVelocimetryDistribution, PIVEvaluation
+
+__this_dir__ = pathlib.Path(__file__).parent
+VP1A = __this_dir__ / '../docs/vp1a.dat'
+
+
+class TestPIVView(unittest.TestCase):
+
+    def test_read_header(self):
+        header = pivview.read_header(VP1A)
+        self.assertEqual(header.creation_date, 'Wed Jan 24 13:19:19 2024')
+        self.assertTrue(header.software.startswith('PIVTEC PIVview Module'))
+        self.assertEqual(header.grid_shape, (63, 59, 1))
+        self.assertEqual(header.n_nodes, 63 * 59)
+        self.assertEqual(header.variable_names, ['ix', 'iy', 'iz', 'dx', 'dy', 'flag', 'count', 'valid'])
+        self.assertEqual(header.variables[3].unit, 'pixel')
+        self.assertEqual(header.variables[3].description, 'displacement conponent X')
+        self.assertIsNone(header.variables[6].unit)
+        self.assertEqual(header.flag_variable, 'flag')
+        self.assertEqual(header.flags, {0: 'Disabled', 1: 'NoResult', 2: 'Outlier',
+                                        3: 'ValidData', 4: 'OtherPeak', 5: 'Interpolated'})
+        self.assertEqual(header.title, 'PIV Displacement Data : vp1a')
+        self.assertEqual(header.n_lines, 14)
+
+    def test_read_dat(self):
+        result = pivview.read_dat(VP1A)
+        self.assertEqual(result.data.shape, (63 * 59, 8))
+        self.assertEqual(result['dx'].shape, (1, 59, 63))
+        np.testing.assert_array_equal(result['ix'][0, 0, :3], [8, 16, 24])
+        np.testing.assert_array_equal(result['iy'][0, :3, 0], [8, 16, 24])
+        self.assertAlmostEqual(result['dx'][0, 0, 0], 0.143338)
+        self.assertEqual(result.flags.dtype, np.int64)
+        with self.assertRaises(KeyError):
+            result['unknown']
+
+        scheme = result.header.to_flag_scheme()
+        self.assertIsInstance(scheme.usesFlagSchemeType, EnumeratedFlagScheme)
+        counts = scheme.count_flags(result.flags)
+        self.assertEqual(sum(counts.values()), 63 * 59)
+        self.assertEqual(counts['ValidData'], np.count_nonzero(result.flags == 3))
+
+    def test_to_distribution(self):
+        dist = pivview.read_dat(VP1A).to_distribution()
+        self.assertIsInstance(dist, ImageVelocimetryDistribution)
+        self.assertEqual(dist.title, 'PIV Displacement Data : vp1a')
+        self.assertEqual(dist.hasPIVDataType, str(PIV.ResultData))
+        self.assertEqual(dist.byteSize, VP1A.stat().st_size)
+        self.assertEqual([m.label for m in dist.hasMetric],
+                         ['ix', 'iy', 'iz', 'dx', 'dy', 'flag', 'count', 'valid'])
+        self.assertEqual(str(dist.hasMetric[3].hasUnit), 'http://qudt.org/vocab/unit/PIXEL')
+        self.assertEqual(sorted((f.mask, f.label) for f in dist.hasFlagScheme.allowedFlag),
+                         [(0, 'Disabled'), (1, 'NoResult'), (2, 'Outlier'),
+                          (3, 'ValidData'), (4, 'OtherPeak'), (5, 'Interpolated')])
+        g = rdflib.Graph().parse(data=dist.model_dump_ttl(), format='ttl')
+        self.assertEqual(len(list(g.triples((None, PIV.hasFlagScheme, None)))), 1)
+        self.assertEqual(dist.wasGeneratedBy.hasEmployedTool.name, 'PIVTEC PIVview Module')
+
+    def test_inconsistent_file(self):
+        lines = VP1A.read_text().splitlines()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = pathlib.Path(tmp_dir) / 'truncated.dat'
+            filename.write_text('\n'.join(lines[:100]))
+            with self.assertRaises(ValueError):
+                pivview.read_dat(filename)
+
+    def test_read_header_blocks(self):
+        self.assertEqual(pivview.read_header(VP1A, block_size=7), pivview.read_header(VP1A))
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # the body is not read:
+            filename = pathlib.Path(tmp_dir) / 'header_only.dat'
+            header_lines = VP1A.read_text().splitlines()[:14]
+            filename.write_text('\n'.join(header_lines + ['not a number'] * 10000))
+            self.assertEqual(pivview.read_header(filename, block_size=64), pivview.read_header(VP1A))
+
+            filename = pathlib.Path(tmp_dir) / 'no_newline.dat'
+            filename.write_bytes(b'#' * (pivview.MAX_HEADER_SIZE + 10))
+            with self.assertRaises(ValueError):
+                pivview.read_header(filename)
+
+    def test_harvest(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_dir = pathlib.Path(tmp_dir)
+            for name in ('run1/vp1a.dat', 'run1/vp1b.dat', 'run2/sub/vp1a.dat'):
+                (tmp_dir / name).parent.mkdir(parents=True, exist_ok=True)
+                (tmp_dir / name).write_bytes(VP1A.read_bytes())
+            (tmp_dir / 'run2' / 'broken.dat').write_bytes(b'#' * (pivview.MAX_HEADER_SIZE + 10))
+
+            results = pivview.harvest(tmp_dir, max_workers=1)
+            self.assertEqual([r.filename for r in results], sorted(tmp_dir.rglob('*.dat')))
+            self.assertEqual([r.ok for r in results], [True, True, False, True])
+            self.assertIsInstance(results[2].error, ValueError)
+
+            result = results[0]
+            self.assertEqual(result.software.name, 'PIVTEC PIVview Module')
+            self.assertIsInstance(result.distribution.wasGeneratedBy, PIVEvaluation)
+            self.assertIs(result.distribution.wasGeneratedBy.hasEmployedTool, result.software)
+            self.assertEqual(str(result.distribution.downloadURL), result.filename.resolve().as_uri())
+            self.assertEqual(len(result.flag_scheme.allowedFlag), 6)
+            self.assertEqual(result.flag_scheme.get_flags(3)[0].label, 'ValidData')
+
+            parallel_results = pivview.harvest(tmp_dir, max_workers=2, chunk_size=1)
+            self.assertEqual([(r.filename, r.ok) for r in parallel_results],
+                             [(r.filename, r.ok) for r in results])
+            self.assertEqual(parallel_results[3].distribution.hasMetric[3].label, 'dx')
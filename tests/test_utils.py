@@ -0,0 +1,533 @@
+import hashlib
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import requests
+from ontolutils.ex.spdx import Checksum
+from rdflib import URIRef
+
+from pivmetalib import cache, pivmeta, utils
+from utils import LocalHTTPServer
+
+
+class TestDownload(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.tmp_path = pathlib.Path(self.tmp_dir.name)
+        self.content = os.urandom(3 * 1024 * 1024 + 17)
+        self.content_hash = hashlib.sha256(self.content).hexdigest()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_download_streaming(self):
+        with LocalHTTPServer({'/data.bin': self.content}) as server:
+            received = []
+            filename = utils.download_file(f'{server.url}/data.bin',
+                                           self.tmp_path / 'sub' / 'data.bin',
+                                           known_hash=self.content_hash,
+                                           block_size=1024 * 1024,
+                                           progress=lambda n, total: received.append((n, total)))
+            self.assertEqual(filename.read_bytes(), self.content)
+            self.assertEqual(received[-1], (len(self.content), len(self.content)))
+            self.assertEqual(len(received), 4)
+            self.assertFalse(filename.with_name('data.bin.part').exists())
+
+            # wrong hash: nothing is left at the destination
+            with self.assertRaises(ValueError):
+                utils.download_file(f'{server.url}/data.bin',
+                                    self.tmp_path / 'other.bin',
+                                    known_hash='0' * 64)
+            self.assertEqual(list(self.tmp_path.glob('other.bin*')), [])
+
+            # existing file with mismatching hash is replaced
+            filename.write_bytes(b'corrupted')
+            filename = utils.download_file(f'{server.url}/data.bin',
+                                           filename,
+                                           known_hash=self.content_hash)
+            self.assertEqual(filename.read_bytes(), self.content)
+
+    def test_download_resume(self):
+        dest = self.tmp_path / 'data.bin'
+        part = dest.with_name('data.bin.part')
+
+        def _interrupt(n_bytes, total_size):
+            raise ConnectionError('interrupted')
+
+        with LocalHTTPServer({'/data.bin': self.content}) as server:
+            url = f'{server.url}/data.bin'
+            with self.assertRaises(ConnectionError):
+                utils.download_file(url, dest, progress=_interrupt)
+            n_received = part.stat().st_size
+            self.assertTrue(0 < n_received < len(self.content))
+            self.assertEqual(part.read_bytes(), self.content[:n_received])
+
+            filename = utils.download_file(url, dest, known_hash=self.content_hash)
+            self.assertEqual(filename.read_bytes(), self.content)
+            self.assertEqual(len(server.requests), 2)
+            self.assertEqual(server.requests[-1][1].get('Range'), f'bytes={n_received}-')
+            self.assertEqual(server.requests[-1][1].get('If-Range'), f'"{self.content_hash}"')
+            self.assertEqual(list(self.tmp_path.iterdir()), [filename])  # no .part or validator left
+
+            # a file changed on the server is sent in full and the download restarts from zero:
+            with self.assertRaises(ConnectionError):
+                utils.download_file(url, dest, overwrite_existing=True, progress=_interrupt)
+            new_content = os.urandom(len(self.content))
+            server.files['/data.bin'] = new_content
+            filename = utils.download_file(url, dest, overwrite_existing=True,
+                                           known_hash=hashlib.sha256(new_content).hexdigest())
+            self.assertEqual(filename.read_bytes(), new_content)
+            self.assertIn('If-Range', server.requests[-1][1])
+
+        # a partial file without validator is not resumed:
+        part.write_bytes(self.content[:1000])
+        with LocalHTTPServer({'/data.bin': self.content}) as server:
+            filename = utils.download_file(f'{server.url}/data.bin', dest, known_hash=self.content_hash,
+                                           overwrite_existing=True)
+            self.assertEqual(filename.read_bytes(), self.content)
+            self.assertEqual(len(server.requests), 1)
+            self.assertNotIn('Range', server.requests[0][1])
+
+        # without range support, the download starts from zero:
+        part.write_bytes(b'garbage')
+        with LocalHTTPServer({'/data.bin': self.content}, accept_ranges=False) as server:
+            filename = utils.download_file(f'{server.url}/data.bin', dest, known_hash=self.content_hash,
+                                           overwrite_existing=True)
+            self.assertEqual(filename.read_bytes(), self.content)
+            self.assertEqual(len(server.requests), 1)
+
+    def test_download_parallel(self):
+        dest = self.tmp_path / 'data.bin'
+        with LocalHTTPServer({'/data.bin': self.content}) as server:
+            received = []
+            filename = utils.download_file(f'{server.url}/data.bin', dest, known_hash=self.content_hash,
+                                           n_connections=4, progress=lambda n, total: received.append(n))
+            self.assertEqual(filename.read_bytes(), self.content)
+            # the first block tells the size, the rest is split into 4 ranges:
+            ranges = [h['Range'] for _, h in server.requests]
+            self.assertEqual(len(ranges), 5)
+            self.assertEqual(ranges[0], f'bytes=0-{1024 * 1024 - 1}')
+            self.assertTrue(all('If-Range' in h for _, h in server.requests[1:]))
+            self.assertEqual(max(received), len(self.content))
+
+    def test_download_parallel_empty_file(self):
+        dest = self.tmp_path / 'empty.bin'
+        with LocalHTTPServer({'/empty.bin': b''}) as server:
+            for n_connections in (1, 4):
+                filename = utils.download_file(f'{server.url}/empty.bin', dest, overwrite_existing=True,
+                                               known_hash=hashlib.sha256(b'').hexdigest(),
+                                               n_connections=n_connections)
+                self.assertEqual(filename.read_bytes(), b'')
+            self.assertEqual(server.requests[-1][1].get('Range'), f'bytes=0-{1024 * 1024 - 1}')
+            self.assertEqual(list(self.tmp_path.iterdir()), [filename])
+
+    def test_download_parallel_unknown_size(self):
+        dest = self.tmp_path / 'data.bin'
+        with LocalHTTPServer({'/data.bin': self.content}, unknown_size=True) as server:
+            filename = utils.download_file(f'{server.url}/data.bin', dest, known_hash=self.content_hash,
+                                           n_connections=4)
+            self.assertEqual(filename.read_bytes(), self.content)
+            # the size is unknown after the first block, the file is downloaded in a single stream:
+            self.assertEqual(len(server.requests), 2)
+            self.assertNotIn('Range', server.requests[1][1])
+
+
+class TestFileCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self._default_file_cache = cache._file_cache
+        cache._file_cache = cache.FileCache(pathlib.Path(self.tmp_dir.name) / 'files', max_size=2500)
+
+    def tearDown(self):
+        cache._file_cache = self._default_file_cache
+        self.tmp_dir.cleanup()
+
+    def test_download_to_cache(self):
+        files = {'/a/data.bin': b'a' * 1000,
+                 '/b/data.bin': b'b' * 1000,
+                 '/copy/same.bin': b'a' * 1000,
+                 '/c/data.bin': b'c' * 1000}
+        file_cache = cache.get_file_cache()
+        with LocalHTTPServer(files) as server:
+            filename_a = utils.download_file(f'{server.url}/a/data.bin')
+            filename_b = utils.download_file(f'{server.url}/b/data.bin')
+            self.assertNotEqual(filename_a, filename_b)  # same name and size, different content
+            self.assertEqual(filename_a.read_bytes(), files['/a/data.bin'])
+            self.assertEqual(filename_a.name, 'data.bin')
+            self.assertEqual(len(server.requests), 2)
+
+            # cache hits do not perform any request:
+            self.assertEqual(utils.download_file(f'{server.url}/a/data.bin'), filename_a)
+            hash_b = hashlib.sha256(files['/b/data.bin']).hexdigest()
+            self.assertEqual(utils.download_file(f'{server.url}/other', known_hash=hash_b), filename_b)
+            self.assertEqual(len(server.requests), 2)
+
+            # identical content is stored once:
+            self.assertEqual(utils.download_file(f'{server.url}/copy/same.bin'), filename_a)
+            self.assertEqual(file_cache.size, 2000)
+
+            # b is the least recently used file and is evicted:
+            utils.download_file(f'{server.url}/a/data.bin')
+            filename_c = utils.download_file(f'{server.url}/c/data.bin')
+            self.assertTrue(filename_a.exists())
+            self.assertTrue(filename_c.exists())
+            self.assertFalse(filename_b.exists())
+            self.assertIsNone(file_cache.lookup(f'{server.url}/b/data.bin'))
+            self.assertEqual(file_cache.size, 2000)
+
+    def test_lookup_batches_access_times(self):
+        file_cache = cache.get_file_cache()
+        filename = pathlib.Path(self.tmp_dir.name) / 'data.bin'
+        filename.write_bytes(b'a' * 100)
+        content_hash = hashlib.sha256(b'a' * 100).hexdigest()
+        cached_filename = file_cache.add('https://example.org/a', filename, content_hash, name='data.bin')
+        index_stat = file_cache.index_filename.stat()
+        last_access = file_cache._read_index()['objects'][content_hash]['last_access']
+
+        # hits are answered from the index in memory and do not rewrite it:
+        for _ in range(10):
+            self.assertEqual(file_cache.lookup('https://example.org/a'), cached_filename)
+        self.assertEqual(file_cache.lookup('https://example.org/b', known_hash=content_hash), cached_filename)
+        self.assertEqual(file_cache.index_filename.stat().st_mtime_ns, index_stat.st_mtime_ns)
+        self.assertEqual(file_cache.lookup('https://example.org/b'), cached_filename)
+
+        file_cache.flush()
+        index = file_cache._read_index()
+        self.assertGreater(index['objects'][content_hash]['last_access'], last_access)
+        self.assertEqual(index['urls']['https://example.org/b'], content_hash)
+
+    def test_shared_between_processes(self):
+        directory = pathlib.Path(self.tmp_dir.name) / 'shared'
+        code = ("import pathlib, sys, hashlib\n"
+                "from pivmetalib import cache\n"
+                "file_cache = cache.FileCache(sys.argv[1])\n"
+                "for i in range(20):\n"
+                "    content = f'{sys.argv[2]}-{i}'.encode()\n"
+                "    filename = pathlib.Path(sys.argv[1]) / f'{sys.argv[2]}-{i}.tmp'\n"
+                "    filename.write_bytes(content)\n"
+                "    file_cache.add(f'https://example.org/{sys.argv[2]}/{i}', filename,\n"
+                "                   hashlib.sha256(content).hexdigest(), name='data.bin')\n")
+        directory.mkdir()
+        processes = [subprocess.Popen([sys.executable, '-c', code, str(directory), name]) for name in 'ab']
+        self.assertEqual([p.wait() for p in processes], [0, 0])
+        index = cache.FileCache(directory)._read_index()
+        self.assertEqual(len(index['objects']), 40)
+        self.assertEqual(len(index['urls']), 40)
+
+    def test_concurrent_downloads(self):
+        directory = pathlib.Path(self.tmp_dir.name) / 'shared'
+        content = os.urandom(200_000)
+        code = ("import sys, time\n"
+                "from pivmetalib import cache, utils\n"
+                "cache._file_cache = cache.FileCache(sys.argv[1])\n"
+                "filename = utils.download_file(sys.argv[2], block_size=10_000,\n"
+                "                               progress=lambda n, total: time.sleep(0.01))\n"
+                "print(filename)\n")
+        with LocalHTTPServer({'/data.bin': content}) as server:
+            processes = [subprocess.Popen([sys.executable, '-c', code, str(directory), f'{server.url}/data.bin'],
+                                          stdout=subprocess.PIPE, text=True) for _ in range(2)]
+            filenames = [p.communicate()[0].strip() for p in processes]
+            self.assertEqual([p.returncode for p in processes], [0, 0])
+            # the second process waits for the first one and takes the file from the cache:
+            self.assertEqual(len(server.requests), 1)
+        self.assertEqual(filenames[0], filenames[1])
+        self.assertEqual(pathlib.Path(filenames[0]).read_bytes(), content)
+
+    def test_max_size_from_environment(self):
+        with mock.patch.dict(os.environ, {cache.MAX_SIZE_ENV_VARIABLE: '1000'}):
+            self.assertEqual(cache.FileCache(self.tmp_dir.name).max_size, 1000)
+        with mock.patch.dict(os.environ, {cache.MAX_SIZE_ENV_VARIABLE: '10GB'}):
+            self.assertEqual(cache.FileCache(self.tmp_dir.name).max_size, cache.DEFAULT_MAX_SIZE)
+            # a malformed value does not break the import:
+            subprocess.run([sys.executable, '-c', 'import pivmetalib.cache'], check=True)
+
+
+class TestDownloadDistributions(unittest.TestCase):
+
+    def test_download_all(self):
+        files = {f'/{folder}/img_{i:04d}.tif': os.urandom(2000) for folder in ('a', 'b') for i in range(5)}
+        with LocalHTTPServer(files) as server, tempfile.TemporaryDirectory() as tmp_dir:
+            distributions = [pivmeta.ImageVelocimetryDistribution(downloadURL=f'{server.url}{path}')
+                             for path in files]
+            distributions.append(pivmeta.ImageVelocimetryDistribution(
+                downloadURL=f'{server.url}/a/img_0000.tif',
+                checksum=Checksum(algorithm='sha256', value=hashlib.sha256(files['/a/img_0000.tif']).hexdigest())
+            ))
+            distributions.append(pivmeta.ImageVelocimetryDistribution(
+                downloadURL=f'{server.url}/b/img_0001.tif',
+                checksum=Checksum(algorithm='md5', value='0' * 32)
+            ))
+            distributions.append(pivmeta.ImageVelocimetryDistribution(downloadURL=f'{server.url}/missing.tif'))
+            # a checksum without algorithm is not verified, one without value fails only its distribution:
+            distributions.append(pivmeta.ImageVelocimetryDistribution(
+                downloadURL=f'{server.url}/a/img_0002.tif', checksum=Checksum(value='0' * 64)
+            ))
+            distributions.append(pivmeta.ImageVelocimetryDistribution(
+                downloadURL=f'{server.url}/a/img_0003.tif', checksum=Checksum.model_construct(algorithm='sha256')
+            ))
+            ds = pivmeta.ImageVelocimetryDataset(distribution=distributions)
+
+            results = ds.download_all(target_folder=tmp_dir, max_workers=4)
+            self.assertEqual(len(results), len(distributions))
+            self.assertTrue(all(r.ok for r in results[:10]))
+            for (path, content), result in zip(files.items(), results):
+                self.assertEqual(result.filename.read_bytes(), content)
+            self.assertEqual(len({r.filename for r in results[:10]}), 10)  # no name clashes
+            self.assertTrue(results[10].ok)
+            self.assertEqual(results[10].filename, results[0].filename)
+            self.assertIsInstance(results[11].error, ValueError)  # wrong md5
+            self.assertIsInstance(results[12].error, requests.HTTPError)
+            self.assertTrue(results[13].ok)
+            self.assertEqual(results[13].filename, results[2].filename)
+            self.assertIsInstance(results[14].error, ValueError)
+            self.assertIsNone(results[14].filename)
+            self.assertTrue(results[3].ok)
+            self.assertEqual(len(server.requests), 11)  # one request per unique URL
+
+
+class TestLazyImport(unittest.TestCase):
+
+    def test_lazy_import(self):
+        code = ("import sys, pivmetalib; "
+                "assert 'ontolutils' not in sys.modules and 'requests' not in sys.modules; "
+                "pivmetalib.PIV.Flag; "
+                "import pivmetalib.pivmeta; "
+                "assert 'pivmetalib.pivmeta.tool' not in sys.modules; "
+                "from pivmetalib.pivmeta import FlagScheme; "
+                "assert 'pivmetalib.pivmeta.tool' not in sys.modules; "
+                "assert pivmetalib.pivmeta.PIVSoftware.__name__ == 'PIVSoftware'; "
+                "assert pivmetalib.prov.Person and pivmetalib.CACHE_DIR.exists()")
+        subprocess.run([sys.executable, '-c', code], check=True)
+        with self.assertRaises(AttributeError):
+            pivmeta.Unknown
+
+
+class TestUNManager(unittest.TestCase):
+
+    def test_closest_class_wins(self):
+        class A:
+            pass
+
+        class B(A):
+            pass
+
+        manager = utils.UNManager()
+        manager[A]['name'] = 'a:name'
+        manager[B]['name'] = 'b:name'
+        # the entry of the class itself overrides the one of its base class,
+        # also when the base class registers it later:
+        self.assertEqual(manager[B]['name'], 'b:name')
+        manager[A]['name'] = 'a:other'
+        self.assertEqual(manager[B]['name'], 'b:name')
+        self.assertEqual(manager[A]['name'], 'a:other')
+        self.assertEqual(manager.data[B], {'name': 'b:name'})
+
+    def test_inheritance(self):
+        class A:
+            pass
+
+        class B(A):
+            pass
+
+        class C(B):
+            pass
+
+        manager = utils.UNManager()
+        manager[A]['name'] = 'a:name'
+        manager[A]['label'] = 'a:label'
+        manager[B]['name'] = 'b:name'
+        self.assertEqual(manager[C], {'name': 'b:name', 'label': 'a:label'})
+        self.assertIs(manager[C], manager[C])
+        self.assertNotIn(C, manager.data)  # lookups do not register anything
+
+        # registering invalidates resolved entries of the class and its subclasses only:
+        entries_b, entries_c = manager[B], manager[C]
+        manager[A]['description'] = 'a:description'
+        self.assertEqual(entries_c['description'], 'a:description')
+        resolved_b = dict(entries_b)
+        manager.register(C, 'label', 'c:label')
+        self.assertEqual(entries_b._entries, resolved_b)  # B is not resolved again
+        self.assertEqual(manager[C], {'name': 'b:name', 'label': 'c:label', 'description': 'a:description'})
+        self.assertEqual(manager[A], {'name': 'a:name', 'label': 'a:label', 'description': 'a:description'})
+        self.assertEqual(entries_b['label'], 'a:label')
+
+        # all mutations of the entries register or unregister them for the class:
+        manager[B].update({'comment': 'b:comment'})
+        self.assertEqual(manager[B].setdefault('comment', 'other'), 'b:comment')
+        self.assertEqual(manager[B].setdefault('about', 'b:about'), 'b:about')
+        self.assertEqual(manager.data[B], {'name': 'b:name', 'comment': 'b:comment', 'about': 'b:about'})
+        self.assertEqual(manager[C]['comment'], 'b:comment')
+        del manager[B]['name']
+        self.assertEqual(manager[C]['name'], 'a:name')  # the inherited entry is visible again
+        with self.assertRaises(KeyError):
+            del manager[B]['name']  # not registered for B
+        self.assertEqual(manager[B].pop('about'), 'b:about')
+        self.assertNotIn('about', manager[C])
+
+
+class TestSplitURIRef(unittest.TestCase):
+
+    def test_split_URIRef(self):
+        self.assertEqual(utils.split_URIRef(URIRef('https://matthiasprobst.github.io/pivmeta#mask')),
+                         ('https://matthiasprobst.github.io/pivmeta', 'mask'))
+        self.assertEqual(utils.split_URIRef('http://purl.org/dc/terms/title'), ('http://purl.org/dc/terms/', 'title'))
+        self.assertEqual(utils.split_URIRef('piv:mask'), ('piv', 'mask'))
+        self.assertEqual(utils.split_URIRef('mask'), (None, 'mask'))
+        ns1, _ = utils.split_URIRef(URIRef('http://www.w3.org/ns/dcat#Dataset'))
+        ns2, _ = utils.split_URIRef('http://www.w3.org/ns/dcat#Distribution')
+        self.assertIs(ns1, ns2)
+        self.assertEqual(utils.split_URIRefs(['piv:mask', 'dcat:Dataset']), [('piv', 'mask'), ('dcat', 'Dataset')])
+
+
+FLAG_TTL = """
+@prefix piv: <https://matthiasprobst.github.io/pivmeta#> .
+@prefix skos: <http://www.w3.org/2004/02/skos/core#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+
+<https://example.org/scheme1> a piv:FlagScheme ;
+    piv:allowedFlag <https://example.org/valid>, <https://example.org/outlier> .
+
+<https://example.org/scheme2> a piv:FlagScheme ;
+    piv:allowedFlag <https://example.org/outlier>, <https://example.org/masked> .
+
+<https://example.org/valid> a piv:Flag ; skos:prefLabel "Valid" ; piv:mask "0"^^xsd:integer .
+<https://example.org/outlier> a piv:Flag ; piv:meaning "vector is an outlier" ; piv:mask 1 .
+<https://example.org/masked> a piv:Flag ; piv:mask 2 .
+<https://example.org/other#interpolated> a piv:Flag ; piv:mask 4 .
+"""
+
+
+class TestFlagTable(unittest.TestCase):
+
+    def test_get_flag_table(self):
+        table = utils.get_flag_table(FLAG_TTL)
+        self.assertEqual(table, [
+            {'uri': 'https://example.org/valid', 'label': 'Valid', 'mask': 0},
+            {'uri': 'https://example.org/outlier', 'label': 'vector is an outlier', 'mask': 1},
+            {'uri': 'https://example.org/masked', 'label': 'masked', 'mask': 2},
+            {'uri': 'https://example.org/other#interpolated', 'label': 'interpolated', 'mask': 4},
+        ])
+        self.assertEqual(utils.get_flag_dict(FLAG_TTL, 'https://example.org/scheme2'),
+                         {'vector is an outlier': 1, 'masked': 2})
+        self.assertEqual(utils.get_flag_table(FLAG_TTL, 'https://example.org/unknown'), [])
+
+    def test_get_flag_table_matches_sparql(self):
+        g = utils._ensure_graph(FLAG_TTL)
+        for scheme in (None, 'https://example.org/scheme1', 'https://example.org/scheme2'):
+            self.assertEqual(utils.get_flag_table(g, scheme), utils._get_flag_table_sparql(g, scheme))
+
+        # flags with equal masks keep the (graph) order, subjects not typed piv:Flag are skipped
+        g = utils._parse_graph(FLAG_TTL + """
+<https://example.org/also_masked> a piv:Flag ; piv:mask 2 .
+<https://example.org/no_flag> piv:mask 3 .
+""")
+        table = utils.get_flag_table(g)
+        self.assertEqual([r['mask'] for r in table], [0, 1, 2, 2, 4])
+        self.assertEqual(sorted(table, key=lambda r: r['uri']),
+                         sorted(utils._get_flag_table_sparql(g), key=lambda r: r['uri']))
+
+    def test_graph_cache(self):
+        self.assertIs(utils._ensure_graph(FLAG_TTL), utils._ensure_graph(FLAG_TTL))
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            graph_cache = cache.GraphCache(maxsize=1, persist=True, directory=tmp_dir)
+            g = utils._parse_graph(FLAG_TTL)
+            graph_cache.put('a', g)
+            self.assertIs(graph_cache.get('a'), g)
+            self.assertEqual(graph_cache.file_cache.lookup('graph:a').name, 'a.nt')
+
+            g_b = utils._parse_graph('<https://example.org/b> a <https://example.org/B> .')
+            graph_cache.put('b', g_b)  # evicts "a" from memory
+            g_restored = graph_cache.get('a')
+            self.assertIsNot(g_restored, g)
+            self.assertEqual(utils.get_flag_table(g_restored), utils.get_flag_table(g))
+            self.assertIsNone(graph_cache.get('c'))
+
+            # persisted graphs count against the size of the file cache and are evicted:
+            graph_cache.file_cache.max_size = graph_cache.file_cache.size - 1
+            self.assertIsNotNone(graph_cache.get('b'))  # restored from the file cache
+            graph_cache.file_cache.evict()
+            self.assertIsNone(graph_cache.file_cache.lookup('graph:a'))
+            self.assertIsNotNone(graph_cache.file_cache.lookup('graph:b'))
+
+    def test_graph_cache_bounded_by_triples(self):
+        graph_cache = cache.GraphCache(maxsize=10, max_triples=20)
+        graphs = {name: utils._parse_graph(FLAG_TTL) for name in 'abc'}  # 16 triples each
+        graph_cache.put('a', graphs['a'])
+        self.assertIs(graph_cache.get('a'), graphs['a'])
+        graph_cache.put('b', graphs['b'])  # evicts "a"
+        self.assertIsNone(graph_cache.get('a'))
+        self.assertIs(graph_cache.get('b'), graphs['b'])
+
+        big = utils._parse_graph(FLAG_TTL + '<https://example.org/x> a piv:Flag ; piv:mask 8, 16, 32, 64 .')
+        graph_cache.put('big', big)  # larger than max_triples, not kept at all
+        self.assertIsNone(graph_cache.get('big'))
+        self.assertIs(graph_cache.get('b'), graphs['b'])
+
+        graph_cache.clear()
+        self.assertIsNone(graph_cache.get('b'))
+        graph_cache.maxsize = 0  # disabled
+        graph_cache.put('c', graphs['c'])
+        self.assertIsNone(graph_cache.get('c'))
+
+    def test_graph_from_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ttl_filename = pathlib.Path(tmp_dir) / 'flags.ttl'
+            ttl_filename.write_text(FLAG_TTL, encoding='utf-8')
+            no_suffix_filename = pathlib.Path(tmp_dir) / 'flags'
+            no_suffix_filename.write_text(FLAG_TTL, encoding='utf-8')
+            expected = utils.get_flag_table(FLAG_TTL)
+
+            self.assertEqual(utils.get_flag_table(ttl_filename), expected)
+            self.assertEqual(utils.get_flag_table(str(ttl_filename)), expected)
+            self.assertEqual(utils.get_flag_table(no_suffix_filename), expected)
+            self.assertIs(utils._ensure_graph(ttl_filename), utils._ensure_graph(str(ttl_filename)))
+            with open(ttl_filename, 'rb') as f:
+                self.assertEqual(utils.get_flag_table(f), expected)
+            with open(no_suffix_filename, encoding='utf-8') as f:
+                self.assertEqual(utils.get_flag_table(f), expected)
+
+            # a modified file is parsed again
+            g = utils._ensure_graph(ttl_filename)
+            ttl_filename.write_text(FLAG_TTL.replace('piv:mask 4', 'piv:mask 8'), encoding='utf-8')
+            os.utime(ttl_filename, ns=(0, 0))
+            self.assertIsNot(utils._ensure_graph(ttl_filename), g)
+            self.assertEqual(utils.get_flag_table(ttl_filename)[-1]['mask'], 8)
+
+            jsonld_filename = pathlib.Path(tmp_dir) / 'flag.jsonld'
+            jsonld_filename.write_text('{"@id": "https://example.org/f", '
+                                       '"@type": "https://matthiasprobst.github.io/pivmeta#Flag", '
+                                       '"https://matthiasprobst.github.io/pivmeta#mask": 16}', encoding='utf-8')
+            self.assertEqual(utils.get_flag_dict(jsonld_filename), {'f': 16})
+
+    def test_get_flag_tables(self):
+        tables = utils.get_flag_tables(FLAG_TTL)
+        self.assertEqual(sorted(tables), ['https://example.org/scheme1', 'https://example.org/scheme2'])
+        for scheme, table in tables.items():
+            self.assertEqual(table, utils.get_flag_table(FLAG_TTL, scheme))
+
+        # flags with several labels and equal masks get the same rows in the same order:
+        g = utils._parse_graph(FLAG_TTL + """
+<https://example.org/scheme2> piv:allowedFlag <https://example.org/also_masked> .
+<https://example.org/also_masked> a piv:Flag ; skos:prefLabel "Masked", "Hidden", "Covered" ; piv:mask 2 .
+<https://example.org/masked> skos:prefLabel "Blanked", "Masked out" .
+""")
+        tables = utils.get_flag_tables(g)
+        for scheme in ('https://example.org/scheme1', 'https://example.org/scheme2'):
+            self.assertEqual(tables[scheme], utils.get_flag_table(g, scheme))
+        self.assertEqual([r['mask'] for r in tables['https://example.org/scheme2']], [1, 2, 2])
+        # of several labels, the smallest one is taken (independent of the graph order):
+        self.assertEqual({r['label'] for r in tables['https://example.org/scheme2']},
+                         {'vector is an outlier', 'Blanked', 'Covered'})
+
+        tables = utils.get_flag_tables(FLAG_TTL, ['https://example.org/scheme2', 'https://example.org/unknown'])
+        self.assertEqual(tables, {'https://example.org/scheme2': utils.get_flag_table(FLAG_TTL,
+                                                                                      'https://example.org/scheme2'),
+                                  'https://example.org/unknown': []})
@@ -1,4 +1,8 @@
+import hashlib
+import http.server
+import threading
 import unittest
+from typing import Dict
 
 import rdflib
 
@@ -19,3 +23,76 @@ class ClassTest(unittest.TestCase):
         self.assertTrue(len(g) > 0)
         for s, p, o in g:
             self.assertIsInstance(p, rdflib.URIRef)
+
+
+class LocalHTTPServer:
+    """Minimal threaded HTTP server serving in-memory files (stand-in for remote hosts).
+
+    Supports ETag/If-None-Match, single byte ranges (with If-Range) and logs all requests in `requests`.
+    With `unknown_size`, the total size in the Content-Range of partial responses is "*".
+    """
+
+    def __init__(self, files: Dict[str, bytes], accept_ranges: bool = True, content_types: Dict[str, str] = None,
+                 unknown_size: bool = False):
+        self.files = files
+        self.accept_ranges = accept_ranges
+        self.unknown_size = unknown_size
+        self.content_types = content_types or {}
+        self.requests = []
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                server.requests.append((self.path, dict(self.headers)))
+                content = server.files.get(self.path)
+                if content is None:
+                    self.send_error(404)
+                    return
+                etag = f'"{hashlib.sha256(content).hexdigest()}"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                byte_range = self.headers.get('Range')
+                if self.headers.get('If-Range', etag) != etag:
+                    byte_range = None  # changed content is sent in full
+                if byte_range and server.accept_ranges:
+                    start, end = byte_range.split('=', 1)[1].split('-')
+                    start = int(start)
+                    end = min(int(end), len(content) - 1) if end else len(content) - 1
+                    if start >= len(content):
+                        self.send_response(416)
+                        self.send_header('Content-Range', f'bytes */{len(content)}')
+                        self.send_header('Content-Length', '0')
+                        self.end_headers()
+                        return
+                    self.send_response(206)
+                    self.send_header('Content-Range',
+                                     f'bytes {start}-{end}/{"*" if server.unknown_size else len(content)}')
+                    content = content[start:end + 1]
+                else:
+                    self.send_response(200)
+                self.send_header('ETag', etag)
+                if self.path in server.content_types:
+                    self.send_header('Content-Type', server.content_types[self.path])
+                if server.accept_ranges:
+                    self.send_header('Accept-Ranges', 'bytes')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+        self._httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self._httpd.server_address[1]}'
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._httpd.shutdown()
+        self._httpd.server_close()